@@ -0,0 +1,99 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Text, Type, Union
+
+from mongotic.model import ModelField, MongoBaseModel, get_field_name
+
+if TYPE_CHECKING:
+    from mongotic.orm import BaseQuerySet
+
+
+class Aggregate(object):
+    def __init__(
+        self, operator: Text, field: Optional[Union["ModelField", Text]] = None
+    ):
+        self.operator = operator
+        self.field = field
+
+    def __repr__(self) -> Text:
+        field_name = (
+            self.field.field_name if isinstance(self.field, ModelField) else self.field
+        )
+        return f"<Aggregate(Operator={self.operator}, Field={field_name})>"
+
+    def to_mongo(self, model_class: Type["MongoBaseModel"]) -> Dict[Text, Any]:
+        if self.field is None:
+            return {self.operator: 1}
+        return {self.operator: f"${get_field_name(self.field, model_class)}"}
+
+
+class Func(object):
+    def count(self) -> Aggregate:
+        return Aggregate("$sum")
+
+    def sum(self, field: Union["ModelField", Text]) -> Aggregate:
+        return Aggregate("$sum", field)
+
+    def avg(self, field: Union["ModelField", Text]) -> Aggregate:
+        return Aggregate("$avg", field)
+
+    def min(self, field: Union["ModelField", Text]) -> Aggregate:
+        return Aggregate("$min", field)
+
+    def max(self, field: Union["ModelField", Text]) -> Aggregate:
+        return Aggregate("$max", field)
+
+
+func = Func()
+
+
+class GroupBy(object):
+    def __init__(self, query: "BaseQuerySet", field_names: List[Text]):
+        self.query = query
+        self.field_names = field_names
+
+    def __repr__(self) -> Text:
+        return (
+            f"<GroupBy(Model={self.query.orm_model.__name__}, "
+            + f"Fields={self.field_names})>"
+        )
+
+    def agg(self, **aggregates: Aggregate) -> Any:
+        for alias in aggregates:
+            if alias in self.field_names:
+                raise ValueError(f"Aggregate alias '{alias}' shadows a group field")
+        return self.query._group(self.field_names, aggregates)
+
+
+def build_group_stages(
+    model_class: Type["MongoBaseModel"],
+    field_names: List[Text],
+    aggregates: Dict[Text, Aggregate],
+) -> List[Dict[Text, Any]]:
+    group_id: Any
+    if not field_names:
+        group_id = None
+    elif len(field_names) == 1:
+        group_id = f"${field_names[0]}"
+    else:
+        group_id = {field_name: f"${field_name}" for field_name in field_names}
+
+    group_stage: Dict[Text, Any] = {"_id": group_id}
+    for alias, aggregate in aggregates.items():
+        group_stage[alias] = aggregate.to_mongo(model_class)
+    return [{"$group": group_stage}, {"$sort": {"_id": 1}}]
+
+
+def parse_group_rows(
+    docs_raw: List[Dict[Text, Any]], field_names: List[Text]
+) -> List[Dict[Text, Any]]:
+    rows: List[Dict[Text, Any]] = []
+    for doc_raw in docs_raw:
+        group_id = doc_raw["_id"]
+        if len(field_names) == 1:
+            row = {field_names[0]: group_id}
+        elif field_names:
+            row = {field_name: group_id.get(field_name) for field_name in field_names}
+        else:
+            row = {}
+        row.update((key, value) for key, value in doc_raw.items() if key != "_id")
+        rows.append(row)
+    return rows
@@ -0,0 +1,641 @@
+import contextlib
+import time
+import weakref
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Text,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from bson.objectid import ObjectId
+
+from mongotic.aggregate import Aggregate, build_group_stages, parse_group_rows
+from mongotic.bulk import ExportResult
+from mongotic.cache import Namespace, QueryCache
+from mongotic.events import ExecutionEvent, aiter_fetch, aiter_hydrate
+from mongotic.exceptions import DeferredFieldError, NotFound
+from mongotic.model import ModelField, MongoBaseModel
+from mongotic.orm import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_HYDRATION_BATCH_SIZE,
+    BaseQuerySet,
+    BaseSession,
+    DirtyState,
+    FlushBatch,
+    FlushRun,
+    Hydration,
+    MergeResult,
+    Page,
+    WriteResult,
+    apply_deferred_fields,
+    get_deferred_fields,
+)
+from mongotic.relationship import SELECTIN
+
+if TYPE_CHECKING:
+    from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorClientSession
+
+T = TypeVar("T")
+
+
+def create_async_engine(
+    host: Optional[Text] = None,
+    port: Optional[int] = None,
+    document_class: Optional[Text] = None,
+    tz_aware: Optional[bool] = None,
+    connect: Optional[bool] = None,
+    type_registry: Optional[Text] = None,
+    **kwargs: Any,
+) -> "AsyncIOMotorClient":
+    try:
+        from motor.motor_asyncio import AsyncIOMotorClient
+    except ImportError as e:
+        raise ImportError(
+            "The motor package is required by mongotic.asyncio, "
+            + "install it with `pip install mongotic[asyncio]`"
+        ) from e
+
+    engine = AsyncIOMotorClient(
+        host=host,
+        port=port,
+        document_class=document_class,
+        tz_aware=tz_aware,
+        connect=connect,
+        type_registry=type_registry,
+        **kwargs,
+    )
+    return engine
+
+
+async def _iter_async(items: Iterable[T]) -> AsyncIterator[T]:
+    for item in items:
+        yield item
+
+
+class AsyncQuerySet(BaseQuerySet):
+    async def __aiter__(self) -> AsyncIterator["MongoBaseModel"]:
+        collection = self.engine[self._db_name][self._col_name]
+        filter_dict = self._compile_filter()
+        event = self._before_execute("find", filter_dict, hydrates=True)
+
+        cursor: Any
+        if self._use_cache and self._batch_size is None:
+            start = time.perf_counter()
+            docs_raw = self._read_cache("all")
+            cached = docs_raw is not None
+            if docs_raw is None:
+                docs_raw = await self._build_cursor(collection, filter_dict).to_list(
+                    length=None
+                )
+                self._write_cache("all", docs_raw)
+            self._after_execute(event, docs_raw, time.perf_counter() - start, cached)
+            cursor = _iter_async(docs_raw)
+        else:
+            cursor = aiter_fetch(self._build_cursor(collection, filter_dict), event)
+
+        async for _doc_orm in aiter_hydrate(self._hydrate_cursor(cursor), event):
+            yield _doc_orm
+
+    async def _hydrate_cursor(
+        self, cursor: AsyncIterator[Dict[Text, Any]]
+    ) -> AsyncIterator["MongoBaseModel"]:
+        if self._relationship_loads:
+            page_size = self._batch_size or DEFAULT_HYDRATION_BATCH_SIZE
+            page: List[Dict[Text, Any]] = []
+            async for _doc in cursor:
+                page.append(_doc)
+                if len(page) >= page_size:
+                    for _doc_orm in await self._hydrate_related_page(page):
+                        yield _doc_orm
+                    page = []
+            for _doc_orm in await self._hydrate_related_page(page):
+                yield _doc_orm
+        elif self._hydration is Hydration.BATCH and self._projection_include is None:
+            page_size = self._batch_size or DEFAULT_HYDRATION_BATCH_SIZE
+            page: List[Dict[Text, Any]] = []
+            async for _doc in cursor:
+                page.append(_doc)
+                if len(page) >= page_size:
+                    for _doc_orm in self._hydrate_page(page):
+                        yield _doc_orm
+                    page = []
+            for _doc_orm in self._hydrate_page(page):
+                yield _doc_orm
+        else:
+            async for _doc in cursor:
+                yield self._hydrate(_doc)
+
+    async def _hydrate_related_page(
+        self, docs_raw: List[Dict[Text, Any]]
+    ) -> List["MongoBaseModel"]:
+        docs = self._hydrate_docs(docs_raw)
+        await self._load_relationships(docs, docs_raw)
+        return docs
+
+    async def first(self, *args: Any, **kwargs: Any) -> "MongoBaseModel":
+        if self._relationship_loads:
+            docs = await self._clone().limit(1).all()
+            if not docs:
+                raise NotFound
+            return docs[0]
+
+        execution = self._start_read("find_one", "first", hydrates=True)
+        docs_raw = execution.docs_raw
+        if docs_raw is None:
+            doc_raw = await self._find_collection(execution.collection).find_one(
+                **self._find_one_kwargs(execution.filter_dict)
+            )
+            docs_raw = [doc_raw] if doc_raw else []
+        return self._finish_first(execution, docs_raw)
+
+    async def all(self, *args: Any, **kwargs: Any) -> List["MongoBaseModel"]:
+        return [doc async for doc in self]
+
+    async def page(self, *args: Any, **kwargs: Any) -> Page:
+        if not self._sort:
+            return await self._clone().order_by("_id").page()
+
+        execution = self._start_read("find", "page", hydrates=True)
+        docs_raw = execution.docs_raw
+        if docs_raw is None:
+            docs_raw = await self._build_cursor(
+                execution.collection, execution.filter_dict
+            ).to_list(length=None)
+        page = self._build_page(self._finish_read(execution, docs_raw), execution.event)
+        await self._load_relationships(page.items, docs_raw)
+        return page
+
+    async def _load_relationships(
+        self, instances: List["MongoBaseModel"], docs_raw: List[Dict[Text, Any]]
+    ) -> None:
+        if not instances or not self._relationship_loads:
+            return
+        self._attach_joined(instances, docs_raw)
+        for name in self._relationship_names(SELECTIN):
+            await self._load_selectin(name, instances)
+
+    async def _load_selectin(
+        self, name: Text, instances: List["MongoBaseModel"]
+    ) -> None:
+        query = self._selectin_query(name, instances)
+        related = await query.all() if query is not None else []
+        self._attach_selectin(name, instances, related)
+
+    async def update(
+        self, values: Dict[Union["ModelField", Text], Any], *args: Any, **kwargs: Any
+    ) -> WriteResult:
+        update_doc = self._compile_update(values)
+        execution = self._start_write("update_many")
+
+        async with self._write_transaction():
+            identity_ids = await self._identity_ids(
+                execution.collection, execution.filter_dict
+            )
+            start = time.perf_counter()
+            result = await execution.collection.update_many(
+                execution.filter_dict,
+                {"$set": update_doc},
+                session=self.session.client_session,
+            )
+            self._after_write(
+                execution.event, time.perf_counter() - start, result.modified_count
+            )
+
+        return self._finish_update(identity_ids, update_doc, result)
+
+    async def delete(self, *args: Any, **kwargs: Any) -> WriteResult:
+        execution = self._start_write("delete_many")
+
+        async with self._write_transaction():
+            identity_ids = await self._identity_ids(
+                execution.collection, execution.filter_dict
+            )
+            start = time.perf_counter()
+            result = await execution.collection.delete_many(
+                execution.filter_dict, session=self.session.client_session
+            )
+            self._after_write(
+                execution.event, time.perf_counter() - start, result.deleted_count
+            )
+
+        return self._finish_delete(identity_ids, result)
+
+    @contextlib.asynccontextmanager
+    async def _write_transaction(self) -> AsyncIterator[None]:
+        client_session = self.session.client_session
+        if client_session is None or client_session.in_transaction:
+            yield
+            return
+        async with client_session.start_transaction():
+            yield
+
+    async def _identity_ids(
+        self, collection: Any, filter_dict: Dict[Text, Any]
+    ) -> List[Any]:
+        if not self.session._has_identity_instances(self.orm_model):
+            return []
+        return [
+            doc_raw["_id"]
+            async for doc_raw in collection.find(
+                filter_dict, projection={"_id": 1}, session=self.session.client_session
+            )
+        ]
+
+    async def export(
+        self,
+        fileobj: IO[Text],
+        format: Text = "ndjson",
+        fields: Optional[List[Union["ModelField", Text]]] = None,
+        chunk_size: int = DEFAULT_BATCH_SIZE,
+        progress: Optional[Callable[[ExportResult], None]] = None,
+        *args: Any,
+        **kwargs: Any,
+    ) -> ExportResult:
+        exporter, cursor, event = self._start_export(
+            fileobj, format, fields, chunk_size, progress
+        )
+        async for doc_raw in aiter_fetch(cursor, event):
+            exporter.write(doc_raw)
+        return exporter.close()
+
+    async def count(self, *args: Any, **kwargs: Any) -> int:
+        docs_raw = await self._aggregate([{"$count": "count"}])
+        return docs_raw[0]["count"] if docs_raw else 0
+
+    async def exists(self, *args: Any, **kwargs: Any) -> bool:
+        return bool(await self._aggregate([{"$limit": 1}, {"$project": {"_id": 1}}]))
+
+    async def distinct(
+        self, field: Union["ModelField", Text], *args: Any, **kwargs: Any
+    ) -> List[Any]:
+        docs_raw = await self._aggregate(self._distinct_stages(field))
+        return [doc_raw["_id"] for doc_raw in docs_raw]
+
+    async def _group(
+        self, field_names: List[Text], aggregates: Dict[Text, Aggregate]
+    ) -> List[Dict[Text, Any]]:
+        docs_raw = await self._aggregate(
+            build_group_stages(self.orm_model, field_names, aggregates)
+        )
+        return parse_group_rows(docs_raw, field_names)
+
+    async def _aggregate(self, stages: List[Dict[Text, Any]]) -> List[Dict[Text, Any]]:
+        execution = self._start_read("aggregate", f"aggregate:{stages!r}")
+        docs_raw = execution.docs_raw
+        if docs_raw is None:
+            docs_raw = await execution.collection.aggregate(
+                self._aggregate_pipeline(execution.filter_dict, stages)
+            ).to_list(length=None)
+        return self._finish_read(execution, docs_raw)
+
+
+class AsyncSession(Protocol):
+    engine: "AsyncIOMotorClient"
+    client_session: Optional["AsyncIOMotorClientSession"]
+    batch_size: int
+    ordered: bool
+    hydration: Hydration
+    query_cache: Optional[QueryCache]
+    _add_instances: List["MongoBaseModel"]
+    _update_instances: Dict[int, DirtyState]
+    _delete_instances: List["MongoBaseModel"]
+    _identity_map: weakref.WeakValueDictionary
+
+    def __init__(self, bind_engine: "AsyncIOMotorClient", **kwargs: Any):
+        ...
+
+    def query(
+        self, orm_model: Type["MongoBaseModel"], *args: Any, **kwargs: Any
+    ) -> AsyncQuerySet:
+        ...
+
+    async def get(
+        self, orm_model: Type["MongoBaseModel"], ident: Any, *args: Any, **kwargs: Any
+    ) -> Optional["MongoBaseModel"]:
+        ...
+
+    def add(self, instance: "MongoBaseModel", *args: Any, **kwargs: Any) -> None:
+        ...
+
+    def delete(self, instance: "MongoBaseModel", *args: Any, **kwargs: Any) -> None:
+        ...
+
+    async def flush(self, *args: Any, **kwargs: Any) -> None:
+        ...
+
+    async def merge(
+        self,
+        instance: "MongoBaseModel",
+        on: Iterable[Union["ModelField", Text]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> MergeResult:
+        ...
+
+    async def merge_all(
+        self,
+        instances: Iterable["MongoBaseModel"],
+        on: Iterable[Union["ModelField", Text]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> MergeResult:
+        ...
+
+    async def commit(
+        self, *args: Any, chunk_size: Optional[int] = None, **kwargs: Any
+    ) -> None:
+        ...
+
+    async def load_deferred_fields(self, instance: "MongoBaseModel") -> None:
+        ...
+
+    async def load_relationship(self, instance: "MongoBaseModel", name: Text) -> Any:
+        ...
+
+    def close(self, *args: Any, **kwargs: Any) -> None:
+        ...
+
+    def _check_scope(self, instance: "MongoBaseModel") -> None:
+        ...
+
+    def _track_update(
+        self, instance: "MongoBaseModel", field_name: Text, original_value: Any
+    ) -> None:
+        ...
+
+    def _load_deferred_fields(self, instance: "MongoBaseModel") -> None:
+        ...
+
+    def _load_relationship(self, instance: "MongoBaseModel", name: Text) -> None:
+        ...
+
+    def _register_instance(self, instance: "MongoBaseModel") -> None:
+        ...
+
+    def _get_identity_instance(
+        self, orm_model: Type["MongoBaseModel"], ident: Any
+    ) -> Optional["MongoBaseModel"]:
+        ...
+
+    def _has_identity_instances(self, orm_model: Type["MongoBaseModel"]) -> bool:
+        ...
+
+    def _synchronize_update(
+        self,
+        orm_model: Type["MongoBaseModel"],
+        idents: Iterable[Any],
+        update_doc: Dict[Text, Any],
+    ) -> None:
+        ...
+
+    def _synchronize_delete(
+        self, orm_model: Type["MongoBaseModel"], idents: Iterable[Any]
+    ) -> None:
+        ...
+
+    def _invalidate_cache(self, namespaces: Iterable[Namespace]) -> None:
+        ...
+
+    async def __aenter__(self):
+        ...
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        ...
+
+
+def async_sessionmaker(
+    bind: "AsyncIOMotorClient",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    ordered: bool = True,
+    hydration: Hydration = Hydration.VALIDATE,
+    query_cache: Optional[QueryCache] = None,
+) -> Type[AsyncSession]:
+    if batch_size <= 0:
+        raise ValueError("Batch size must be positive")
+
+    class _AsyncSession(BaseSession):
+        def __init__(self, *args, **kwargs: Any):
+            super().__init__(
+                engine=bind,
+                batch_size=batch_size,
+                ordered=ordered,
+                hydration=hydration,
+                query_cache=query_cache,
+            )
+
+            self.client_session: Optional["AsyncIOMotorClientSession"] = None
+
+        def query(
+            self, orm_model: Type["MongoBaseModel"], *args: Any, **kwargs: Any
+        ) -> AsyncQuerySet:
+            return AsyncQuerySet(
+                orm_model=orm_model, *args, engine=self.engine, session=self, **kwargs
+            )
+
+        async def get(
+            self,
+            orm_model: Type["MongoBaseModel"],
+            ident: Any,
+            *args: Any,
+            **kwargs: Any,
+        ) -> Optional["MongoBaseModel"]:
+            instance = self._get_identity_instance(orm_model, ident)
+            if instance is not None:
+                return instance
+
+            try:
+                return (
+                    await self.query(orm_model).filter_by(_id=ObjectId(ident)).first()
+                )
+            except NotFound:
+                return None
+
+        async def flush(self, *args: Any, **kwargs: Any) -> None:
+            await self._flush(self.batch_size)
+
+        async def merge(
+            self,
+            instance: "MongoBaseModel",
+            on: Iterable[Union["ModelField", Text]],
+            *args: Any,
+            **kwargs: Any,
+        ) -> MergeResult:
+            return await self.merge_all([instance], on)
+
+        async def merge_all(
+            self,
+            instances: Iterable["MongoBaseModel"],
+            on: Iterable[Union["ModelField", Text]],
+            *args: Any,
+            **kwargs: Any,
+        ) -> MergeResult:
+            batches = self._merge_batches(instances, on)
+            flush_events = self._flush_events()
+            merge_result = MergeResult()
+            try:
+                for batch in batches:
+                    _col = self.engine[batch.namespace[0]][batch.namespace[1]]
+                    _start = time.perf_counter()
+                    result = await _col.bulk_write(
+                        batch.requests,
+                        ordered=self.ordered,
+                        session=self.client_session,
+                    )
+                    self._record_flush(
+                        flush_events,
+                        batch.namespace,
+                        time.perf_counter() - _start,
+                        len(batch.requests),
+                    )
+                    self._complete_merge_batch(batch, result, merge_result)
+            finally:
+                self._invalidate_cache(batch.namespace for batch in batches)
+                self._dispatch_flush(flush_events)
+            return merge_result
+
+        async def commit(
+            self, *args: Any, chunk_size: Optional[int] = None, **kwargs: Any
+        ) -> None:
+            if chunk_size is not None:
+                await self._flush(chunk_size)
+                return
+
+            if self.client_session is None:
+                async with self:
+                    assert (
+                        self.client_session is not None
+                    ), "Client session should be created in AsyncSession.__aenter__"
+                    async with self.client_session.start_transaction():
+                        await self._commit(pymongo_client_session=self.client_session)
+
+            else:
+                async with self.client_session.start_transaction():
+                    await self._commit(pymongo_client_session=self.client_session)
+
+            self._invalidate_cache(self._pending_namespaces())
+            self._clear_pending()
+
+        async def load_deferred_fields(self, instance: "MongoBaseModel") -> None:
+            deferred_fields = get_deferred_fields(instance)
+            if not deferred_fields:
+                return
+
+            _col = self.engine[instance.__databasename__][instance.__tablename__]
+            doc_raw = await _col.find_one(
+                {"_id": ObjectId(instance._id)},
+                projection={name: 1 for name in deferred_fields},
+                session=self.client_session,
+            )
+            if doc_raw is None:
+                raise NotFound
+
+            apply_deferred_fields(instance, doc_raw, deferred_fields)
+
+        async def load_relationship(
+            self, instance: "MongoBaseModel", name: Text
+        ) -> Any:
+            await self.query(instance.__class__)._load_selectin(name, [instance])
+            return instance._related[name]  # type: ignore[index]
+
+        def _load_relationship(self, instance: "MongoBaseModel", name: Text) -> None:
+            raise DeferredFieldError(
+                f"Relationship '{name}' of {instance.__class__.__name__} cannot be "
+                + "loaded on attribute access in an AsyncSession, use "
+                + "`selectinload`, `joinedload` or "
+                + "`await session.load_relationship(instance, name)` first"
+            )
+
+        def _load_deferred_fields(self, instance: "MongoBaseModel") -> None:
+            raise DeferredFieldError(
+                f"{instance.__class__.__name__} has deferred fields that cannot be "
+                + "loaded on attribute access in an AsyncSession, "
+                + "use `await session.load_deferred_fields(instance)` first"
+            )
+
+        async def __aenter__(self):
+            self.client_session = await self.engine.start_session()
+            return self
+
+        async def __aexit__(self, exc_type, exc_value, traceback):
+            await self.client_session.end_session()
+            self.client_session = None
+
+        async def _flush(self, chunk_size: int) -> None:
+            run = FlushRun(self, chunk_size)
+            try:
+                for batch in run:
+                    try:
+                        await self._write_flush_batch(batch, run.flush_events)
+                    except Exception as e:
+                        raise run.fail(e) from e
+            finally:
+                run.close()
+
+        async def _write_flush_batch(
+            self,
+            batch: FlushBatch,
+            flush_events: Optional[Dict[Namespace, ExecutionEvent]],
+        ) -> None:
+            _col = self.engine[batch.namespace[0]][batch.namespace[1]]
+            _start = time.perf_counter()
+            if batch.kind == "insert":
+                await _col.insert_many(
+                    batch.requests, ordered=self.ordered, session=self.client_session
+                )
+            else:
+                await _col.bulk_write(
+                    batch.requests, ordered=self.ordered, session=self.client_session
+                )
+            self._record_flush_batch(flush_events, batch, time.perf_counter() - _start)
+
+        async def _commit(
+            self, pymongo_client_session: "AsyncIOMotorClientSession"
+        ) -> None:
+            flush_events = self._flush_events()
+
+            for _namespace, _batch, _docs in self._iter_commit_inserts(
+                self._add_instances
+            ):
+                _col = self.engine[_namespace[0]][_namespace[1]]
+                _start = time.perf_counter()
+                _insert_many_result = await _col.insert_many(
+                    _docs, ordered=self.ordered, session=pymongo_client_session
+                )
+                self._record_flush(
+                    flush_events,
+                    _namespace,
+                    time.perf_counter() - _start,
+                    len(_docs),
+                    _docs,
+                )
+                self._complete_inserts(_batch, _insert_many_result.inserted_ids)
+
+            for _namespace, _batch in self._iter_commit_operations(
+                self._update_instances, self._delete_instances
+            ):
+                _col = self.engine[_namespace[0]][_namespace[1]]
+                _start = time.perf_counter()
+                await _col.bulk_write(
+                    _batch, ordered=self.ordered, session=pymongo_client_session
+                )
+                self._record_flush(
+                    flush_events,
+                    _namespace,
+                    time.perf_counter() - _start,
+                    len(_batch),
+                )
+
+            self._dispatch_flush(flush_events)
+
+    return _AsyncSession
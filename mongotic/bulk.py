@@ -0,0 +1,356 @@
+import base64
+import collections
+import csv
+import datetime
+import functools
+import io
+import itertools
+import json
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from decimal import Decimal
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Text,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from bson.decimal128 import Decimal128
+from bson.objectid import ObjectId
+from pydantic import TypeAdapter, ValidationError
+from pymongo.errors import BulkWriteError
+
+if TYPE_CHECKING:
+    from pymongo import MongoClient
+    from pymongo.collection import Collection
+
+    from mongotic.model import MongoBaseModel
+
+T = TypeVar("T")
+
+EXPORT_FORMATS = ("ndjson", "csv")
+LOAD_FORMATS = EXPORT_FORMATS
+
+
+def iter_batches(items: Iterable[T], batch_size: int) -> Iterator[List[T]]:
+    if batch_size <= 0:
+        raise ValueError("Batch size must be positive")
+    iterator = iter(items)
+    batch = list(itertools.islice(iterator, batch_size))
+    while batch:
+        yield batch
+        batch = list(itertools.islice(iterator, batch_size))
+
+
+@functools.lru_cache(maxsize=None)
+def get_list_adapter(
+    orm_model: Type["MongoBaseModel"],
+) -> "TypeAdapter[List[MongoBaseModel]]":
+    return TypeAdapter(List[orm_model])  # type: ignore[valid-type]
+
+
+class ExportResult(object):
+    def __init__(self, rows: int = 0, elapsed: float = 0.0):
+        self.rows = rows
+        self.elapsed = elapsed
+
+    def __repr__(self) -> Text:
+        return (
+            f"<ExportResult(Rows={self.rows}, "
+            + f"RowsPerSecond={self.rows_per_second:.0f})>"
+        )
+
+    @property
+    def rows_per_second(self) -> float:
+        if self.elapsed <= 0:
+            return 0.0
+        return self.rows / self.elapsed
+
+
+def to_json_value(value: Any) -> Any:
+    if isinstance(value, (ObjectId, uuid.UUID, Decimal)):
+        return str(value)
+    if isinstance(value, Decimal128):
+        return str(value.to_decimal())
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def to_csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=to_json_value, ensure_ascii=False)
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    return to_json_value(value)
+
+
+class DocumentExporter(object):
+    def __init__(
+        self,
+        fileobj: IO[Text],
+        format: Text,
+        fields: List[Text],
+        chunk_size: int,
+        progress: Optional[Callable[[ExportResult], None]] = None,
+    ):
+        if format not in EXPORT_FORMATS:
+            raise ValueError(
+                f"Unknown export format '{format}', expected {EXPORT_FORMATS}"
+            )
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be positive")
+
+        self.fileobj = fileobj
+        self.format = format
+        self.fields = fields
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.result = ExportResult()
+
+        self._buffer = io.StringIO()
+        self._buffered_rows = 0
+        self._csv_writer: Optional[Any] = None
+        self._start = time.perf_counter()
+
+        if self.format == "csv":
+            self._csv_writer = csv.writer(self._buffer)
+            self._csv_writer.writerow(self.fields)
+
+    def write(self, doc_raw: Dict[Text, Any]) -> None:
+        if self._csv_writer is not None:
+            self._csv_writer.writerow(
+                [to_csv_value(doc_raw.get(field_name)) for field_name in self.fields]
+            )
+        else:
+            self._buffer.write(
+                json.dumps(
+                    {field_name: doc_raw.get(field_name) for field_name in self.fields},
+                    default=to_json_value,
+                    ensure_ascii=False,
+                )
+            )
+            self._buffer.write("\n")
+
+        self._buffered_rows += 1
+        if self._buffered_rows >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        self.fileobj.write(self._buffer.getvalue())
+        self._buffer.seek(0)
+        self._buffer.truncate()
+
+        self.result.rows += self._buffered_rows
+        self.result.elapsed = time.perf_counter() - self._start
+        self._buffered_rows = 0
+        if self.progress is not None:
+            self.progress(self.result)
+
+    def close(self) -> ExportResult:
+        self.flush()
+        return self.result
+
+
+class LoadError(object):
+    def __init__(self, row: int, message: Text):
+        self.row = row
+        self.message = message
+
+    def __repr__(self) -> Text:
+        return f"<LoadError(Row={self.row}, Message={self.message!r})>"
+
+
+class LoadResult(object):
+    def __init__(
+        self,
+        inserted: int = 0,
+        errors: Optional[List[LoadError]] = None,
+        elapsed: float = 0.0,
+    ):
+        self.inserted = inserted
+        self.errors = errors if errors is not None else []
+        self.elapsed = elapsed
+
+    def __repr__(self) -> Text:
+        return (
+            f"<LoadResult(Inserted={self.inserted}, Errors={len(self.errors)}, "
+            + f"RowsPerSecond={self.rows_per_second:.0f})>"
+        )
+
+    @property
+    def rows(self) -> int:
+        return self.inserted + len(self.errors)
+
+    @property
+    def rows_per_second(self) -> float:
+        if self.elapsed <= 0:
+            return 0.0
+        return self.rows / self.elapsed
+
+
+def iter_load_rows(
+    source: Union[IO[Text], Iterable[Dict[Text, Any]]], format: Text
+) -> Iterator[Tuple[int, Union[Dict[Text, Any], LoadError]]]:
+    if format not in LOAD_FORMATS:
+        raise ValueError(f"Unknown load format '{format}', expected {LOAD_FORMATS}")
+
+    # Rows are numbered from 1, by physical line for file sources so errors
+    # can be looked up in the file, and by position for iterables.
+    if not hasattr(source, "read"):
+        yield from enumerate(source, 1)  # type: ignore[arg-type]
+    elif format == "csv":
+        reader = csv.DictReader(source)  # type: ignore[arg-type]
+        for row in reader:
+            yield reader.line_num, {
+                key: value if value != "" else None for key, value in row.items()
+            }
+    else:
+        for line_number, line in enumerate(source, 1):  # type: ignore[arg-type]
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield line_number, LoadError(
+                    row=line_number, message=f"Invalid JSON: {e}"
+                )
+                continue
+            if not isinstance(row, dict):
+                yield line_number, LoadError(
+                    row=line_number, message="Row is not a JSON object"
+                )
+                continue
+            yield line_number, row
+
+
+def format_validation_error(errors: List[Dict[Text, Any]], skip: int = 0) -> Text:
+    return "; ".join(
+        ".".join(str(loc) for loc in error["loc"][skip:]) + f": {error['msg']}"
+        for error in errors
+    )
+
+
+def to_load_document(
+    instance: "MongoBaseModel", row: Dict[Text, Any]
+) -> Dict[Text, Any]:
+    doc = instance.model_dump()
+    _id = row.get("_id")
+    if _id is not None:
+        doc["_id"] = ObjectId(_id) if ObjectId.is_valid(_id) else _id
+    return doc
+
+
+def validate_batch(
+    model_class: Type["MongoBaseModel"],
+    batch: List[Tuple[int, Union[Dict[Text, Any], LoadError]]],
+) -> Tuple[List[int], List[Dict[Text, Any]], List[LoadError]]:
+    errors = [value for _, value in batch if isinstance(value, LoadError)]
+    rows = [(row, value) for row, value in batch if not isinstance(value, LoadError)]
+    if not rows:
+        return [], [], errors
+
+    adapter = get_list_adapter(model_class)
+    try:
+        instances = adapter.validate_python([value for _, value in rows])
+    except ValidationError as e:
+        row_errors: Dict[int, List[Dict[Text, Any]]] = {}
+        for error in e.errors():
+            row_errors.setdefault(error["loc"][0], []).append(error)
+        for i, (row, _) in enumerate(rows):
+            if i in row_errors:
+                errors.append(
+                    LoadError(
+                        row=row, message=format_validation_error(row_errors[i], 1)
+                    )
+                )
+        rows = [
+            (row, value) for i, (row, value) in enumerate(rows) if i not in row_errors
+        ]
+        instances = adapter.validate_python([value for _, value in rows])
+
+    return (
+        [row for row, _ in rows],
+        [
+            to_load_document(instance, value)
+            for instance, (_, value) in zip(instances, rows)
+        ],
+        errors,
+    )
+
+
+def insert_batch(
+    collection: "Collection", row_numbers: List[int], docs: List[Dict[Text, Any]]
+) -> Tuple[int, List[LoadError]]:
+    try:
+        return len(collection.insert_many(docs, ordered=False).inserted_ids), []
+    except BulkWriteError as e:
+        return e.details["nInserted"], [
+            LoadError(row=row_numbers[error["index"]], message=error["errmsg"])
+            for error in e.details["writeErrors"]
+        ]
+
+
+def bulk_load(
+    engine: "MongoClient",
+    model_class: Type["MongoBaseModel"],
+    source: Union[IO[Text], Iterable[Dict[Text, Any]]],
+    format: Text = "ndjson",
+    batch_size: int = 1000,
+    workers: int = 2,
+    progress: Optional[Callable[[LoadResult], None]] = None,
+) -> LoadResult:
+    if workers <= 0:
+        raise ValueError("Workers must be positive")
+
+    collection = engine[model_class.__databasename__][model_class.__tablename__]
+    result = LoadResult()
+    start = time.perf_counter()
+
+    def _merge(future: "Future[Tuple[int, List[LoadError]]]") -> None:
+        inserted, errors = future.result()
+        result.inserted += inserted
+        result.errors.extend(errors)
+        result.elapsed = time.perf_counter() - start
+        if progress is not None:
+            progress(result)
+
+    executor = ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="mongotic-load"
+    )
+    pending: Deque["Future[Tuple[int, List[LoadError]]]"] = collections.deque()
+    try:
+        for batch in iter_batches(iter_load_rows(source, format), batch_size):
+            row_numbers, docs, errors = validate_batch(model_class, batch)
+            result.errors.extend(errors)
+            while len(pending) >= workers:
+                _merge(pending.popleft())
+            if docs:
+                pending.append(
+                    executor.submit(insert_batch, collection, row_numbers, docs)
+                )
+        while pending:
+            _merge(pending.popleft())
+    finally:
+        executor.shutdown(wait=True)
+
+    result.errors.sort(key=lambda error: error.row)
+    result.elapsed = time.perf_counter() - start
+    return result
@@ -0,0 +1,140 @@
+import abc
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Set, Text, Tuple
+
+import bson
+
+CacheKey = Tuple[Hashable, ...]
+Namespace = Tuple[Text, Text]
+CacheEntry = Tuple[Namespace, float, List[bytes], int]
+
+
+class QueryCache(abc.ABC):
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @abc.abstractmethod
+    def get(self, key: CacheKey) -> Optional[List[Dict[Text, Any]]]:
+        pass
+
+    @abc.abstractmethod
+    def set(
+        self, key: CacheKey, namespace: Namespace, docs: List[Dict[Text, Any]]
+    ) -> None:
+        pass
+
+    @abc.abstractmethod
+    def invalidate(self, namespace: Namespace) -> None:
+        pass
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> Dict[Text, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class LRUQueryCache(QueryCache):
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+    ):
+        super().__init__()
+        if maxsize <= 0:
+            raise ValueError("Cache max size must be positive")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("Cache TTL must be positive")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("Cache max bytes must be positive")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._namespaces: Dict[Namespace, Set[CacheKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> Optional[List[Dict[Text, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            _, expires_at, docs_bson, _ = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.evictions += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return [bson.decode(doc_bson) for doc_bson in docs_bson]
+
+    def set(
+        self, key: CacheKey, namespace: Namespace, docs: List[Dict[Text, Any]]
+    ) -> None:
+        docs_bson = [bson.encode(doc) for doc in docs]
+        size = sum(len(doc_bson) for doc_bson in docs_bson)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        expires_at = float("inf") if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (namespace, expires_at, docs_bson, size)
+            self._namespaces.setdefault(namespace, set()).add(key)
+            self.current_bytes += size
+
+            while len(self._entries) > self.maxsize or (
+                self.max_bytes is not None and self.current_bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, namespace: Namespace) -> None:
+        with self._lock:
+            for key in list(self._namespaces.get(namespace, ())):
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._namespaces.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[Text, int]:
+        stats = super().stats()
+        stats.update({"size": len(self._entries), "bytes": self.current_bytes})
+        return stats
+
+    def _remove(self, key: CacheKey) -> None:
+        namespace, _, _, size = self._entries.pop(key)
+        self.current_bytes -= size
+        keys = self._namespaces.get(namespace)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._namespaces[namespace]
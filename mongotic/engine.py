@@ -0,0 +1,342 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, List, Optional, Text, Tuple
+
+from pymongo import MongoClient, monitoring, uri_parser
+
+from mongotic.events import percentile
+
+DEFAULT_HOST = "localhost"
+DEFAULT_PORT = 27017
+
+EngineKey = Tuple[Hashable, ...]
+
+
+def freeze_option(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze_option(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_option(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return ("id", id(value))
+    return value
+
+
+def normalize_host(host: Any, port: Optional[int]) -> Hashable:
+    if host is None:
+        host = DEFAULT_HOST
+    if isinstance(host, (list, tuple)):
+        return tuple(sorted(normalize_host(h, port) for h in host))
+
+    host = host.strip()
+    if host.lower().startswith("mongodb+srv://"):
+        return ("srv", host[len("mongodb+srv://") :].rstrip("/"))
+    if host.lower().startswith("mongodb://"):
+        parsed = uri_parser.parse_uri(host, port or DEFAULT_PORT)
+        return (
+            "uri",
+            tuple(sorted((h.lower(), p) for h, p in parsed["nodelist"])),
+            parsed["username"],
+            parsed["password"],
+            parsed["database"],
+            tuple(
+                sorted(
+                    (k.lower(), freeze_option(v)) for k, v in parsed["options"].items()
+                )
+            ),
+        )
+    if ":" in host and not host.startswith("["):
+        host, _, host_port = host.rpartition(":")
+        port = int(host_port)
+    return ("uri", ((host.lower(), port or DEFAULT_PORT),))
+
+
+def describe_host(host_key: Hashable) -> Text:
+    if isinstance(host_key, tuple) and host_key and host_key[0] == "srv":
+        return f"mongodb+srv://{host_key[1]}"
+    if isinstance(host_key, tuple) and host_key and host_key[0] == "uri":
+        name = ",".join(f"{h}:{p}" for h, p in host_key[1])
+        if len(host_key) > 4 and host_key[4]:
+            name += f"/{host_key[4]}"
+        return name
+    return ",".join(describe_host(h) for h in host_key)  # type: ignore[union-attr]
+
+
+def build_engine_key(
+    host: Any, port: Optional[int], options: Dict[Text, Any]
+) -> EngineKey:
+    return (
+        normalize_host(host, port),
+        tuple(
+            sorted(
+                (k.lower(), freeze_option(v))
+                for k, v in options.items()
+                if v is not None
+            )
+        ),
+    )
+
+
+class PoolStats(object):
+    def __init__(self, max_samples: int):
+        self.size = 0
+        self.checked_out = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.cleared = 0
+        self.wait_times: Deque[float] = deque(maxlen=max_samples)
+
+
+class EngineMonitor(monitoring.ConnectionPoolListener, monitoring.CommandListener):
+    def __init__(self, max_samples: int = 1000):
+        if max_samples <= 0:
+            raise ValueError("Max samples must be positive")
+        self.max_samples = max_samples
+        self.reset()
+
+    def reset(self) -> None:
+        self._lock = threading.Lock()
+        self._pools: Dict[Tuple[Text, int], PoolStats] = {}
+        self._checkout_starts: Dict[Tuple[Tuple[Text, int], int], float] = {}
+        self._command_times: Deque[float] = deque(maxlen=self.max_samples)
+        self._commands = 0
+        self._command_failures = 0
+
+    def __repr__(self) -> Text:
+        return f"<EngineMonitor(Pools={len(self._pools)}, Commands={self._commands})>"
+
+    def _pool(self, address: Tuple[Text, int]) -> PoolStats:
+        pool = self._pools.get(address)
+        if pool is None:
+            pool = PoolStats(self.max_samples)
+            self._pools[address] = pool
+        return pool
+
+    def pool_created(self, event: "monitoring.PoolCreatedEvent") -> None:
+        with self._lock:
+            self._pool(event.address)
+
+    def pool_ready(self, event: "monitoring.PoolReadyEvent") -> None:
+        pass
+
+    def pool_cleared(self, event: "monitoring.PoolClearedEvent") -> None:
+        with self._lock:
+            self._pool(event.address).cleared += 1
+
+    def pool_closed(self, event: "monitoring.PoolClosedEvent") -> None:
+        with self._lock:
+            self._pools.pop(event.address, None)
+
+    def connection_created(self, event: "monitoring.ConnectionCreatedEvent") -> None:
+        with self._lock:
+            self._pool(event.address).size += 1
+
+    def connection_ready(self, event: "monitoring.ConnectionReadyEvent") -> None:
+        pass
+
+    def connection_closed(self, event: "monitoring.ConnectionClosedEvent") -> None:
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.size = max(pool.size - 1, 0)
+
+    def connection_check_out_started(
+        self, event: "monitoring.ConnectionCheckOutStartedEvent"
+    ) -> None:
+        with self._lock:
+            self._checkout_starts[
+                (event.address, threading.get_ident())
+            ] = time.perf_counter()
+
+    def connection_check_out_failed(
+        self, event: "monitoring.ConnectionCheckOutFailedEvent"
+    ) -> None:
+        with self._lock:
+            self._checkout_starts.pop((event.address, threading.get_ident()), None)
+            self._pool(event.address).checkout_failures += 1
+
+    def connection_checked_out(
+        self, event: "monitoring.ConnectionCheckedOutEvent"
+    ) -> None:
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.checked_out += 1
+            pool.checkouts += 1
+            start = self._checkout_starts.pop(
+                (event.address, threading.get_ident()), None
+            )
+            if start is not None:
+                pool.wait_times.append(time.perf_counter() - start)
+
+    def connection_checked_in(
+        self, event: "monitoring.ConnectionCheckedInEvent"
+    ) -> None:
+        with self._lock:
+            pool = self._pool(event.address)
+            pool.checked_out = max(pool.checked_out - 1, 0)
+
+    def started(self, event: "monitoring.CommandStartedEvent") -> None:
+        pass
+
+    def succeeded(self, event: "monitoring.CommandSucceededEvent") -> None:
+        with self._lock:
+            self._commands += 1
+            self._command_times.append(event.duration_micros / 1e6)
+
+    def failed(self, event: "monitoring.CommandFailedEvent") -> None:
+        with self._lock:
+            self._commands += 1
+            self._command_failures += 1
+            self._command_times.append(event.duration_micros / 1e6)
+
+    def stats(self) -> Dict[Text, Any]:
+        with self._lock:
+            pools: Dict[Text, Dict[Text, float]] = {}
+            for (host, port), pool in self._pools.items():
+                wait_times = sorted(pool.wait_times)
+                pools[f"{host}:{port}"] = {
+                    "size": pool.size,
+                    "checked_out": pool.checked_out,
+                    "checkouts": pool.checkouts,
+                    "checkout_failures": pool.checkout_failures,
+                    "cleared": pool.cleared,
+                    "wait_p50": percentile(wait_times, 50) if wait_times else 0.0,
+                    "wait_p95": percentile(wait_times, 95) if wait_times else 0.0,
+                    "wait_max": wait_times[-1] if wait_times else 0.0,
+                }
+            command_times = sorted(self._command_times)
+            return {
+                "pools": pools,
+                "commands": {
+                    "count": self._commands,
+                    "failures": self._command_failures,
+                    "p50": percentile(command_times, 50) if command_times else 0.0,
+                    "p95": percentile(command_times, 95) if command_times else 0.0,
+                    "max": command_times[-1] if command_times else 0.0,
+                },
+            }
+
+
+class Engine(MongoClient):
+    def __init__(
+        self, *args: Any, engine_key: Optional[EngineKey] = None, **kwargs: Any
+    ):
+        self.engine_key = engine_key
+        self.handles = 0
+        self.monitor = EngineMonitor()
+        kwargs["event_listeners"] = list(kwargs.get("event_listeners") or []) + [
+            self.monitor
+        ]
+        super().__init__(*args, **kwargs)
+
+    def close(self) -> None:
+        # A cached engine is shared by every create_engine caller, closing
+        # it only releases the caller's handle until the last one is gone.
+        with _registry_lock:
+            if _registry.get(self.engine_key) is self:
+                self.handles -= 1
+                if self.handles > 0:
+                    return
+                del _registry[self.engine_key]
+        super().close()
+
+    def dispose(self) -> None:
+        unregister_engine(self)
+        super().close()
+
+
+_registry_lock = threading.Lock()
+_registry_pid = os.getpid()
+_registry: Dict[EngineKey, Engine] = {}
+
+
+def _check_fork() -> None:
+    global _registry_pid
+    pid = os.getpid()
+    if pid != _registry_pid:
+        # Clients inherited from the parent process are not fork-safe,
+        # drop them without closing their sockets.
+        _registry.clear()
+        _registry_pid = pid
+
+
+def _after_fork_child() -> None:
+    global _registry_lock, _registry_pid
+    # The lock may have been held by another thread at fork time. pymongo
+    # resets the topology of every client in the child, so engines already
+    # held keep working once their monitor state is reset as well.
+    _registry_lock = threading.Lock()
+    _registry_pid = os.getpid()
+    for engine in _registry.values():
+        engine.monitor.reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_child)
+
+
+def unregister_engine(engine: "MongoClient") -> None:
+    with _registry_lock:
+        engine_key = getattr(engine, "engine_key", None)
+        if _registry.get(engine_key) is engine:
+            del _registry[engine_key]
+
+
+def get_engines() -> List[Engine]:
+    with _registry_lock:
+        _check_fork()
+        return list(_registry.values())
+
+
+def dispose_engines() -> None:
+    for engine in get_engines():
+        engine.dispose()
+
+
+def engine_stats(engine: Optional["MongoClient"] = None) -> Dict[Text, Any]:
+    if engine is not None:
+        monitor = getattr(engine, "monitor", None)
+        if not isinstance(monitor, EngineMonitor):
+            raise ValueError("Engine is not created by mongotic.create_engine")
+        return monitor.stats()
+    stats: Dict[Text, Any] = {}
+    for engine in get_engines():
+        name = describe_host(engine.engine_key[0])  # type: ignore[index]
+        if name in stats:
+            name = f"{name} ({len(stats)})"
+        stats[name] = engine.monitor.stats()
+    return stats
+
+
+def create_engine(
+    host: Optional[Text] = None,
+    port: Optional[int] = None,
+    document_class: Optional[Text] = None,
+    tz_aware: Optional[bool] = None,
+    connect: Optional[bool] = None,
+    type_registry: Optional[Text] = None,
+    cache: bool = True,
+    **kwargs: Any,
+) -> MongoClient:
+    options = dict(
+        document_class=document_class,
+        tz_aware=tz_aware,
+        connect=connect,
+        type_registry=type_registry,
+        **kwargs,
+    )
+    if not cache:
+        return Engine(host=host, port=port, **options)
+
+    engine_key = build_engine_key(host, port, options)
+    with _registry_lock:
+        _check_fork()
+        engine = _registry.get(engine_key)
+        if engine is None:
+            engine = Engine(host=host, port=port, engine_key=engine_key, **options)
+            _registry[engine_key] = engine
+        engine.handles += 1
+        return engine
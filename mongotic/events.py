@@ -0,0 +1,332 @@
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Text,
+    Tuple,
+    TypeVar,
+)
+
+import bson
+
+BEFORE_EXECUTE = "before_execute"
+AFTER_EXECUTE = "after_execute"
+AFTER_HYDRATE = "after_hydrate"
+AFTER_FLUSH = "after_flush"
+EVENT_NAMES: Tuple[Text, ...] = (
+    BEFORE_EXECUTE,
+    AFTER_EXECUTE,
+    AFTER_HYDRATE,
+    AFTER_FLUSH,
+)
+
+logger = logging.getLogger("mongotic")
+
+
+class ExecutionEvent(object):
+    def __init__(
+        self,
+        operation: Text,
+        database: Text,
+        collection: Text,
+        filter: Optional[Dict[Text, Any]] = None,
+        projection: Optional[Dict[Text, int]] = None,
+    ):
+        self.operation = operation
+        self.database = database
+        self.collection = collection
+        self.filter = filter
+        self.projection = projection
+        self.round_trip_time = 0.0
+        self.hydration_time = 0.0
+        self.doc_count = 0
+        self.bytes = 0
+        self.cached = False
+        self.hydrates = False
+
+    def __repr__(self) -> Text:
+        return (
+            f"<ExecutionEvent(Shape={self.query_shape}, Docs={self.doc_count}, "
+            + f"RoundTrip={self.round_trip_time:.6f}, "
+            + f"Hydration={self.hydration_time:.6f})>"
+        )
+
+    @property
+    def duration(self) -> float:
+        return self.round_trip_time + self.hydration_time
+
+    @property
+    def query_shape(self) -> Text:
+        return (
+            f"{self.database}.{self.collection}.{self.operation}"
+            + f"({get_filter_shape(self.filter)})"
+        )
+
+    def record_documents(self, docs: Iterable[Dict[Text, Any]]) -> None:
+        for doc in docs:
+            self.doc_count += 1
+            self.bytes += len(bson.encode(doc))
+
+
+Listener = Callable[[ExecutionEvent], None]
+
+_listeners: Dict[Text, List[Listener]] = {name: [] for name in EVENT_NAMES}
+_listeners_lock = threading.Lock()
+
+
+def _check_event_name(event_name: Text) -> None:
+    if event_name not in _listeners:
+        raise ValueError(f"Unknown event '{event_name}', expected one of {EVENT_NAMES}")
+
+
+def listen(event_name: Text, fn: Listener) -> None:
+    _check_event_name(event_name)
+    with _listeners_lock:
+        _listeners[event_name] = _listeners[event_name] + [fn]
+
+
+def remove(event_name: Text, fn: Listener) -> None:
+    _check_event_name(event_name)
+    with _listeners_lock:
+        listeners = list(_listeners[event_name])
+        listeners.remove(fn)
+        _listeners[event_name] = listeners
+
+
+def has_listeners(*event_names: Text) -> bool:
+    return any(_listeners[name] for name in event_names or EVENT_NAMES)
+
+
+def dispatch(event_name: Text, event: ExecutionEvent) -> None:
+    for fn in _listeners[event_name]:
+        fn(event)
+
+
+def get_filter_shape(filter_dict: Optional[Dict[Text, Any]]) -> Text:
+    if not filter_dict:
+        return ""
+    return ", ".join(
+        f"{field_name}: {sorted(field_filter)}"
+        if isinstance(field_filter, dict)
+        else field_name
+        for field_name, field_filter in sorted(filter_dict.items())
+    )
+
+
+def iter_fetch(
+    cursor: Iterable[Dict[Text, Any]], event: Optional[ExecutionEvent]
+) -> Iterable[Dict[Text, Any]]:
+    if event is None:
+        return cursor
+    return _iter_fetch(cursor, event)
+
+
+def _iter_fetch(
+    cursor: Iterable[Dict[Text, Any]], event: ExecutionEvent
+) -> Iterator[Dict[Text, Any]]:
+    iterator = iter(cursor)
+    while True:
+        start = time.perf_counter()
+        try:
+            doc_raw = next(iterator)
+        except StopIteration:
+            event.round_trip_time += time.perf_counter() - start
+            dispatch(AFTER_EXECUTE, event)
+            return
+        event.round_trip_time += time.perf_counter() - start
+        event.record_documents((doc_raw,))
+        yield doc_raw
+
+
+def iter_hydrate(docs: Iterable[Any], event: Optional[ExecutionEvent]) -> Iterable[Any]:
+    if event is None:
+        return docs
+    return _iter_hydrate(docs, event)
+
+
+def _iter_hydrate(docs: Iterable[Any], event: ExecutionEvent) -> Iterator[Any]:
+    iterator = iter(docs)
+    round_trip_time = event.round_trip_time
+    elapsed = 0.0
+    while True:
+        start = time.perf_counter()
+        try:
+            doc = next(iterator)
+        except StopIteration:
+            elapsed += time.perf_counter() - start
+            event.hydration_time = elapsed - (event.round_trip_time - round_trip_time)
+            dispatch(AFTER_HYDRATE, event)
+            return
+        elapsed += time.perf_counter() - start
+        yield doc
+
+
+def aiter_fetch(
+    cursor: AsyncIterator[Dict[Text, Any]], event: Optional[ExecutionEvent]
+) -> AsyncIterator[Dict[Text, Any]]:
+    if event is None:
+        return cursor
+    return _aiter_fetch(cursor, event)
+
+
+async def _aiter_fetch(
+    cursor: AsyncIterator[Dict[Text, Any]], event: ExecutionEvent
+) -> AsyncIterator[Dict[Text, Any]]:
+    iterator = cursor.__aiter__()
+    while True:
+        start = time.perf_counter()
+        try:
+            doc_raw = await iterator.__anext__()
+        except StopAsyncIteration:
+            event.round_trip_time += time.perf_counter() - start
+            dispatch(AFTER_EXECUTE, event)
+            return
+        event.round_trip_time += time.perf_counter() - start
+        event.record_documents((doc_raw,))
+        yield doc_raw
+
+
+def aiter_hydrate(
+    docs: AsyncIterator[Any], event: Optional[ExecutionEvent]
+) -> AsyncIterator[Any]:
+    if event is None:
+        return docs
+    return _aiter_hydrate(docs, event)
+
+
+async def _aiter_hydrate(
+    docs: AsyncIterator[Any], event: ExecutionEvent
+) -> AsyncIterator[Any]:
+    iterator = docs.__aiter__()
+    round_trip_time = event.round_trip_time
+    elapsed = 0.0
+    while True:
+        start = time.perf_counter()
+        try:
+            doc = await iterator.__anext__()
+        except StopAsyncIteration:
+            elapsed += time.perf_counter() - start
+            event.hydration_time = elapsed - (event.round_trip_time - round_trip_time)
+            dispatch(AFTER_HYDRATE, event)
+            return
+        elapsed += time.perf_counter() - start
+        yield doc
+
+
+class CompletedQueryListener(object):
+    # Receives each operation once: hydrating reads after hydration, other
+    # reads and set-based writes after execution, and flushes.
+    def __call__(self, event: ExecutionEvent) -> None:
+        raise NotImplementedError
+
+    def after_execute(self, event: ExecutionEvent) -> None:
+        if not event.hydrates:
+            self(event)
+
+    def attach(self: "ListenerType") -> "ListenerType":
+        listen(AFTER_EXECUTE, self.after_execute)
+        listen(AFTER_HYDRATE, self)
+        listen(AFTER_FLUSH, self)
+        return self
+
+    def detach(self) -> None:
+        remove(AFTER_EXECUTE, self.after_execute)
+        remove(AFTER_HYDRATE, self)
+        remove(AFTER_FLUSH, self)
+
+
+ListenerType = TypeVar("ListenerType", bound=CompletedQueryListener)
+
+
+class SlowQueryLogger(CompletedQueryListener):
+    def __init__(
+        self,
+        threshold: float = 0.1,
+        logger: logging.Logger = logger,
+        level: int = logging.WARNING,
+    ):
+        if threshold < 0:
+            raise ValueError("Slow query threshold must not be negative")
+        self.threshold = threshold
+        self.logger = logger
+        self.level = level
+
+    def __call__(self, event: ExecutionEvent) -> None:
+        if event.duration < self.threshold:
+            return
+        self.logger.log(
+            self.level,
+            f"Slow {event.operation} on {event.database}.{event.collection}: "
+            + f"{event.duration * 1000:.1f} ms "
+            + f"(round trip {event.round_trip_time * 1000:.1f} ms, "
+            + f"hydration {event.hydration_time * 1000:.1f} ms), "
+            + f"{event.doc_count} docs, {event.bytes} bytes, filter={event.filter}",
+        )
+
+
+class QueryStatsCollector(CompletedQueryListener):
+    def __init__(self, max_samples: int = 1000):
+        if max_samples <= 0:
+            raise ValueError("Max samples must be positive")
+        self.max_samples = max_samples
+
+        self._lock = threading.Lock()
+        self._samples: Dict[Text, Deque[float]] = {}
+        self._counts: Dict[Text, int] = {}
+        self._docs: Dict[Text, int] = {}
+        self._bytes: Dict[Text, int] = {}
+
+    def __call__(self, event: ExecutionEvent) -> None:
+        query_shape = event.query_shape
+        with self._lock:
+            samples = self._samples.get(query_shape)
+            if samples is None:
+                samples = deque(maxlen=self.max_samples)
+                self._samples[query_shape] = samples
+            samples.append(event.duration)
+            self._counts[query_shape] = self._counts.get(query_shape, 0) + 1
+            self._docs[query_shape] = self._docs.get(query_shape, 0) + event.doc_count
+            self._bytes[query_shape] = self._bytes.get(query_shape, 0) + event.bytes
+
+    def stats(self) -> Dict[Text, Dict[Text, float]]:
+        with self._lock:
+            snapshot = {
+                query_shape: sorted(samples)
+                for query_shape, samples in self._samples.items()
+            }
+            return {
+                query_shape: {
+                    "count": self._counts[query_shape],
+                    "docs": self._docs[query_shape],
+                    "bytes": self._bytes[query_shape],
+                    "p50": percentile(samples, 50),
+                    "p95": percentile(samples, 95),
+                    "max": samples[-1],
+                }
+                for query_shape, samples in snapshot.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+            self._docs.clear()
+            self._bytes.clear()
+
+
+def percentile(sorted_samples: List[float], percent: float) -> float:
+    if not sorted_samples:
+        raise ValueError("No sample is provided")
+    rank = math.ceil(percent / 100 * len(sorted_samples))
+    return sorted_samples[min(max(rank, 1), len(sorted_samples)) - 1]
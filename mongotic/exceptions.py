@@ -1,2 +1,29 @@
+from typing import Any, List, Text
+
+
 class NotFound(Exception):
     pass
+
+
+class DeferredFieldError(AttributeError):
+    pass
+
+
+class UnindexedQueryWarning(UserWarning):
+    pass
+
+
+class IndexOptionsWarning(UserWarning):
+    pass
+
+
+class FlushError(Exception):
+    def __init__(self, message: Text, flushed: int, pending: int, failed: List[Any]):
+        super().__init__(message)
+        self.flushed = flushed
+        self.pending = pending
+        self.failed = failed
+
+
+class SessionScopeError(RuntimeError):
+    pass
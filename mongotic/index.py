@@ -0,0 +1,210 @@
+import sys
+import warnings
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Text,
+    Tuple,
+    Type,
+    Union,
+)
+
+from pymongo import ASCENDING, IndexModel
+
+from mongotic.exceptions import IndexOptionsWarning, UnindexedQueryWarning
+from mongotic.model import (
+    NOT_SET_SENTINEL,
+    ModelField,
+    ModelFieldOperation,
+    MongoBaseModel,
+    get_field_name,
+)
+
+if TYPE_CHECKING:
+    from pymongo import MongoClient
+
+IndexKeySpec = Union["ModelField", Text, Tuple[Union["ModelField", Text], Any]]
+
+COMPARED_INDEX_OPTIONS = (
+    "unique",
+    "sparse",
+    "expireAfterSeconds",
+    "partialFilterExpression",
+)
+
+
+class Index(object):
+    def __init__(
+        self,
+        *keys: IndexKeySpec,
+        name: Optional[Text] = None,
+        unique: bool = False,
+        sparse: bool = False,
+        expire_after_seconds: Optional[int] = None,
+        partial_filter: Optional[
+            Union["ModelFieldOperation", List["ModelFieldOperation"], Dict]
+        ] = None,
+        **kwargs: Any,
+    ):
+        if not keys:
+            raise ValueError("No index key is provided")
+        if expire_after_seconds is not None and expire_after_seconds < 0:
+            raise ValueError("Expire after seconds must not be negative")
+
+        self.keys: List[Tuple[Union["ModelField", Text], Any]] = [
+            key if isinstance(key, tuple) else (key, ASCENDING) for key in keys
+        ]
+        self.name = name
+        self.unique = unique
+        self.sparse = sparse
+        self.expire_after_seconds = expire_after_seconds
+        self.partial_filter = partial_filter
+        self.extra_options = kwargs
+
+    def __repr__(self) -> Text:
+        return f"<Index(Keys={self.keys}, Unique={self.unique})>"
+
+    def key_spec(self, model_class: Type["MongoBaseModel"]) -> List[Tuple[Text, Any]]:
+        return [
+            (get_field_name(field, model_class), direction)
+            for field, direction in self.keys
+        ]
+
+    def options(self, model_class: Type["MongoBaseModel"]) -> Dict[Text, Any]:
+        options: Dict[Text, Any] = dict(self.extra_options)
+        options["name"] = self.name or "_".join(
+            f"{field_name}_{direction}"
+            for field_name, direction in self.key_spec(model_class)
+        )
+        if self.unique:
+            options["unique"] = True
+        if self.sparse:
+            options["sparse"] = True
+        if self.expire_after_seconds is not None:
+            options["expireAfterSeconds"] = self.expire_after_seconds
+        if self.partial_filter is not None:
+            options["partialFilterExpression"] = self._compile_partial_filter()
+        return options
+
+    def compared_options(self, model_class: Type["MongoBaseModel"]) -> Dict[Text, Any]:
+        options = self.options(model_class)
+        return {k: options[k] for k in COMPARED_INDEX_OPTIONS if k in options}
+
+    def to_index_model(self, model_class: Type["MongoBaseModel"]) -> IndexModel:
+        return IndexModel(self.key_spec(model_class), **self.options(model_class))
+
+    def _compile_partial_filter(self) -> Dict[Text, Any]:
+        if isinstance(self.partial_filter, dict):
+            return self.partial_filter
+        if isinstance(self.partial_filter, ModelFieldOperation):
+            return ModelFieldOperation.to_mongo_filter(filters=[self.partial_filter])
+        return ModelFieldOperation.to_mongo_filter(filters=list(self.partial_filter))
+
+
+def get_model_indexes(model_class: Type["MongoBaseModel"]) -> List[Index]:
+    return list(getattr(model_class, "__indexes__", None) or [])
+
+
+def iter_models(
+    model_class: Type["MongoBaseModel"] = MongoBaseModel,
+) -> Iterable[Type["MongoBaseModel"]]:
+    for subclass in model_class.__subclasses__():
+        yield subclass
+        yield from iter_models(subclass)
+
+
+def external_stacklevel() -> int:
+    # Point warnings at the first frame outside mongotic, however deep the
+    # query method that issued them is nested.
+    frame = sys._getframe(1)
+    stacklevel = 1
+    while frame.f_back is not None and frame.f_globals.get("__name__", "").startswith(
+        "mongotic."
+    ):
+        frame = frame.f_back
+        stacklevel += 1
+    return stacklevel
+
+
+def sync_indexes(
+    engine: "MongoClient",
+    model_class: Type["MongoBaseModel"],
+    *args: Any,
+    **kwargs: Any,
+) -> List[Text]:
+    if model_class.__databasename__ is NOT_SET_SENTINEL:
+        raise ValueError("Database name is not set")
+    if model_class.__tablename__ is NOT_SET_SENTINEL:
+        raise ValueError("Table name is not set")
+
+    collection = engine[model_class.__databasename__][model_class.__tablename__]
+    existing_indexes = [
+        (list(index_info["key"].items()), index_info)
+        for index_info in collection.list_indexes()
+    ]
+    missing_indexes: List[IndexModel] = []
+    for index in get_model_indexes(model_class):
+        key_spec = index.key_spec(model_class)
+        index_infos = [info for keys, info in existing_indexes if keys == key_spec]
+        if not index_infos:
+            missing_indexes.append(index.to_index_model(model_class))
+            continue
+        declared_options = index.compared_options(model_class)
+        existing_options = [
+            {k: info[k] for k in COMPARED_INDEX_OPTIONS if k in info}
+            for info in index_infos
+        ]
+        if declared_options not in existing_options:
+            warnings.warn(
+                f"Index {key_spec} on {model_class.__name__} exists with options "
+                + f"{existing_options[0]}, which differ from the declared "
+                + f"{declared_options}; drop the index to recreate it",
+                IndexOptionsWarning,
+                stacklevel=external_stacklevel(),
+            )
+    if not missing_indexes:
+        return []
+    return collection.create_indexes(missing_indexes)
+
+
+def create_all(
+    engine: "MongoClient",
+    models: Optional[Iterable[Type["MongoBaseModel"]]] = None,
+    *args: Any,
+    **kwargs: Any,
+) -> Dict[Type["MongoBaseModel"], List[Text]]:
+    created_indexes: Dict[Type["MongoBaseModel"], List[Text]] = {}
+    for model_class in iter_models() if models is None else models:
+        if model_class.__databasename__ is NOT_SET_SENTINEL:
+            continue
+        if model_class.__tablename__ is NOT_SET_SENTINEL:
+            continue
+        if not get_model_indexes(model_class):
+            continue
+        created_indexes[model_class] = sync_indexes(engine, model_class)
+    return created_indexes
+
+
+def check_query_indexes(
+    model_class: Type["MongoBaseModel"], filter_dict: Dict[Text, Any]
+) -> None:
+    indexes = get_model_indexes(model_class)
+    if not indexes or not filter_dict or "_id" in filter_dict:
+        return
+
+    field_names = sorted(name for name in filter_dict if not name.startswith("$"))
+    if not field_names:
+        return
+
+    index_prefixes = {index.key_spec(model_class)[0][0] for index in indexes}
+    if index_prefixes.isdisjoint(field_names):
+        warnings.warn(
+            f"Query on {model_class.__name__} filters by {field_names}, "
+            + "which is not covered by any declared index",
+            UnindexedQueryWarning,
+            stacklevel=external_stacklevel(),
+        )
@@ -0,0 +1,132 @@
+import struct
+from typing import Any, Dict, Iterator, Mapping, Optional, Text, Tuple, Union
+
+import bson
+from bson.codec_options import DEFAULT_CODEC_OPTIONS, CodecOptions
+from bson.raw_bson import RawBSONDocument
+
+_INT32 = struct.Struct("<i")
+
+_FIXED_SIZES: Dict[int, int] = {
+    0x01: 8,  # double
+    0x06: 0,  # undefined
+    0x07: 12,  # ObjectId
+    0x08: 1,  # boolean
+    0x09: 8,  # UTC datetime
+    0x0A: 0,  # null
+    0x10: 4,  # int32
+    0x11: 8,  # timestamp
+    0x12: 8,  # int64
+    0x13: 16,  # decimal128
+    0x7F: 0,  # max key
+    0xFF: 0,  # min key
+}
+_STRING_TYPES = frozenset((0x02, 0x0D, 0x0E))  # string, JavaScript code, symbol
+_DOCUMENT_TYPES = frozenset((0x03, 0x04, 0x0F))  # document, array, code with scope
+
+
+def check_document(raw: bytes) -> None:
+    if len(raw) < 5 or _INT32.unpack_from(raw, 0)[0] != len(raw) or raw[-1] != 0:
+        raise ValueError("Invalid BSON document")
+
+
+def scan_element(raw: bytes, position: int) -> Tuple[Text, int]:
+    element_type = raw[position]
+    name_end = raw.index(0, position + 1)
+    name = raw[position + 1 : name_end].decode("utf-8")
+    position = name_end + 1
+
+    size = _FIXED_SIZES.get(element_type)
+    if size is not None:
+        position += size
+    elif element_type in _STRING_TYPES:
+        position += 4 + _INT32.unpack_from(raw, position)[0]
+    elif element_type in _DOCUMENT_TYPES:
+        position += _INT32.unpack_from(raw, position)[0]
+    elif element_type == 0x05:  # binary
+        position += 5 + _INT32.unpack_from(raw, position)[0]
+    elif element_type == 0x0B:  # regular expression
+        position = raw.index(0, raw.index(0, position) + 1) + 1
+    elif element_type == 0x0C:  # DBPointer
+        position += 4 + _INT32.unpack_from(raw, position)[0] + 12
+    else:
+        raise ValueError(f"Unknown BSON element type: {element_type:#04x}")
+
+    if position > len(raw) - 1:
+        raise ValueError("Invalid BSON document")
+    return name, position
+
+
+def scan_elements(raw: bytes) -> Dict[Text, Tuple[int, int]]:
+    check_document(raw)
+    elements: Dict[Text, Tuple[int, int]] = {}
+    position = 4
+    while position < len(raw) - 1:
+        name, end = scan_element(raw, position)
+        elements[name] = (position, end)
+        position = end
+    return elements
+
+
+class LazyDocument(Mapping[Text, Any]):
+    def __init__(
+        self,
+        raw: bytes,
+        codec_options: Optional[CodecOptions] = None,
+    ):
+        check_document(raw)
+        self.raw = raw
+        self.codec_options = codec_options or DEFAULT_CODEC_OPTIONS
+        self._elements: Dict[Text, Tuple[int, int]] = {}
+        self._position = 4
+
+    def __repr__(self) -> Text:
+        return f"<LazyDocument(Size={len(self.raw)})>"
+
+    @classmethod
+    def from_document(
+        cls,
+        document: Union[RawBSONDocument, Dict[Text, Any]],
+        codec_options: Optional[CodecOptions] = None,
+    ) -> "LazyDocument":
+        if isinstance(document, RawBSONDocument):
+            return cls(document.raw, codec_options)
+        return cls(bson.encode(document), codec_options)
+
+    def __getitem__(self, name: Text) -> Any:
+        element = self._find_element(name)
+        if element is None:
+            raise KeyError(name)
+        start, end = element
+        element_doc = _INT32.pack(end - start + 5) + self.raw[start:end] + b"\x00"
+        return bson.decode(element_doc, codec_options=self.codec_options)[name]
+
+    def __contains__(self, name: Any) -> bool:
+        return self._find_element(name) is not None
+
+    def __iter__(self) -> Iterator[Text]:
+        self._find_element(None)
+        return iter(self._elements)
+
+    def __len__(self) -> int:
+        self._find_element(None)
+        return len(self._elements)
+
+    def _find_element(self, name: Optional[Text]) -> Optional[Tuple[int, int]]:
+        element = self._elements.get(name) if name is not None else None
+        if element is not None:
+            return element
+
+        raw = self.raw
+        end = len(raw) - 1
+        position = self._position
+        while position < end:
+            element_name, element_end = scan_element(raw, position)
+            element = (position, element_end)
+            self._elements[element_name] = element
+            position = element_end
+            if element_name == name:
+                self._position = position
+                return element
+        self._position = position
+        return None
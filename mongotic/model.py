@@ -1,14 +1,34 @@
+import threading
 from enum import Enum, auto
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Text, Type
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Collection,
+    Dict,
+    List,
+    Optional,
+    Text,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from pydantic import BaseModel, PrivateAttr
 from pydantic._internal import _model_construction
+from pydantic_core import PydanticUndefined
+
+from mongotic.exceptions import DeferredFieldError
 
 if TYPE_CHECKING:
+    from mongotic.index import Index
+    from mongotic.lazy import LazyDocument
     from mongotic.orm import Session
+    from mongotic.relationship import Relationship
 
 NOT_SET_SENTINEL = object()
 
+MongoBaseModelType = TypeVar("MongoBaseModelType", bound="MongoBaseModel")
+
 
 class Operator(Enum):
     EQUAL = auto()
@@ -21,27 +41,50 @@ class Operator(Enum):
     NOT_IN = auto()
 
     def __str__(self):
-        if self == Operator.EQUAL:
-            return "=="
-        elif self == Operator.NOT_EQUAL:
-            return "!="
-        elif self == Operator.GREATER_THAN:
-            return ">"
-        elif self == Operator.GREATER_THAN_EQUAL:
-            return ">="
-        elif self == Operator.LESS_THAN:
-            return "<"
-        elif self == Operator.LESS_THAN_EQUAL:
-            return "<="
-        elif self == Operator.IN:
-            return "in"
-        elif self == Operator.NOT_IN:
-            return "not in"
-        else:
+        try:
+            return OPERATOR_SYMBOLS[self]
+        except KeyError:
             raise NotImplementedError
 
 
+OPERATOR_SYMBOLS: Dict[Operator, Text] = {
+    Operator.EQUAL: "==",
+    Operator.NOT_EQUAL: "!=",
+    Operator.GREATER_THAN: ">",
+    Operator.GREATER_THAN_EQUAL: ">=",
+    Operator.LESS_THAN: "<",
+    Operator.LESS_THAN_EQUAL: "<=",
+    Operator.IN: "in",
+    Operator.NOT_IN: "not in",
+}
+
+MONGO_OPERATORS: Dict[Operator, Text] = {
+    Operator.EQUAL: "$eq",
+    Operator.NOT_EQUAL: "$ne",
+    Operator.GREATER_THAN: "$gt",
+    Operator.GREATER_THAN_EQUAL: "$gte",
+    Operator.LESS_THAN: "$lt",
+    Operator.LESS_THAN_EQUAL: "$lte",
+    Operator.IN: "$in",
+    Operator.NOT_IN: "$nin",
+}
+
+
+class BindParam(object):
+    def __init__(self, name: Text):
+        self.name = name
+
+    def __repr__(self) -> Text:
+        return f"<BindParam(Name={self.name})>"
+
+
+def bindparam(name: Text) -> BindParam:
+    return BindParam(name=name)
+
+
 class ModelFieldOperation(object):
+    __slots__ = ("model_field", "operation", "value")
+
     def __init__(self, model_field: "ModelField", operation: Operator, value: Any):
         self.model_field = model_field
         self.operation = operation
@@ -61,34 +104,22 @@ class ModelFieldOperation(object):
         filter_dict: Dict[Text, Any] = {}
 
         for _filter in filters:
-            if _filter.model_field.field_name not in filter_dict:
-                filter_dict[_filter.model_field.field_name] = {}
-
-            field_filter: Dict = filter_dict[_filter.model_field.field_name]
-
-            if _filter.operation == Operator.EQUAL:
-                field_filter.update({"$eq": _filter.value})
-            elif _filter.operation == Operator.NOT_EQUAL:
-                field_filter.update({"$ne": _filter.value})
-            elif _filter.operation == Operator.GREATER_THAN:
-                field_filter.update({"$gt": _filter.value})
-            elif _filter.operation == Operator.GREATER_THAN_EQUAL:
-                field_filter.update({"$gte": _filter.value})
-            elif _filter.operation == Operator.LESS_THAN:
-                field_filter.update({"$lt": _filter.value})
-            elif _filter.operation == Operator.LESS_THAN_EQUAL:
-                field_filter.update({"$lte": _filter.value})
-            elif _filter.operation == Operator.IN:
-                field_filter.update({"$in": _filter.value})
-            elif _filter.operation == Operator.NOT_IN:
-                field_filter.update({"$nin": _filter.value})
-            else:
+            mongo_operator = MONGO_OPERATORS.get(_filter.operation)
+            if mongo_operator is None:
                 raise NotImplementedError
 
+            field_name = _filter.model_field.field_name
+            field_filter = filter_dict.get(field_name)
+            if field_filter is None:
+                field_filter = filter_dict[field_name] = {}
+            field_filter[mongo_operator] = _filter.value
+
         return filter_dict
 
 
 class ModelField(object):
+    __slots__ = ("field_name", "model_class")
+
     def __init__(self, field_name: Text, model_class: Type["MongoBaseModel"]):
         self.field_name = field_name
         self.model_class = model_class
@@ -96,6 +127,9 @@ class ModelField(object):
     def __repr__(self) -> Text:
         return f"<ModelField(FieldName={self.field_name}, Bind={self.model_class.__name__})>"
 
+    def __hash__(self) -> int:
+        return hash((self.field_name, self.model_class))
+
     def __eq__(self, other: Any):
         return ModelFieldOperation(
             model_field=self, operation=Operator.EQUAL, value=other
@@ -135,25 +169,182 @@ class ModelField(object):
         )
 
 
+def get_field_name(
+    field: Union["ModelField", Text], model_class: Type["MongoBaseModel"]
+) -> Text:
+    field_name = field.field_name if isinstance(field, ModelField) else field
+    if field_name not in model_class.model_fields:
+        raise ValueError(
+            f"Field '{field_name}' is not defined in {model_class.__name__}"
+        )
+    return field_name
+
+
+_model_construction_state = threading.local()
+
+
 class MongoBaseModelMeta(_model_construction.ModelMetaclass):
-    def __getattr__(cls, item: Text):
+    def __new__(mcs, *args: Any, **kwargs: Any):
+        # Field handles must not be visible while pydantic collects fields,
+        # or they would be taken for defaults and shadowed parent attributes.
+        depth = getattr(_model_construction_state, "depth", 0)
+        _model_construction_state.depth = depth + 1
         try:
-            return super().__getattr__(item)
-        except AttributeError as e:
-            if item in cls.__dict__["__annotations__"]:
-                return ModelField(field_name=item, model_class=cls)
-            else:
-                raise e
+            cls = super().__new__(mcs, *args, **kwargs)
+        finally:
+            _model_construction_state.depth = depth
+
+        cls.__field_handles__ = {
+            field_name: ModelField(field_name=field_name, model_class=cls)
+            for field_name in cls.model_fields
+        }
+        return cls
+
+    def __getattr__(cls, item: Text):
+        field_handles = cls.__dict__.get("__field_handles__")
+        if field_handles is not None and not getattr(
+            _model_construction_state, "depth", 0
+        ):
+            field_handle = field_handles.get(item)
+            if field_handle is not None:
+                return field_handle
+            if item in cls.model_fields:
+                field_handle = ModelField(field_name=item, model_class=cls)
+                field_handles[item] = field_handle
+                return field_handle
+        return super().__getattr__(item)
 
 
 class MongoBaseModel(BaseModel, metaclass=MongoBaseModelMeta):
     __databasename__: Text = NOT_SET_SENTINEL
     __tablename__: Text = NOT_SET_SENTINEL
+    __indexes__: List["Index"] = []
+    __relationships__: Dict[Text, "Relationship"] = {}
 
     _id: Optional[Text] = PrivateAttr(None)
     _session: Optional["Session"] = PrivateAttr(None)
+    _lazy_document: Optional["LazyDocument"] = PrivateAttr(None)
+    _lazy_fields: Optional[Collection[Text]] = PrivateAttr(None)
+    _related: Optional[Dict[Text, Any]] = PrivateAttr(None)
+
+    @classmethod
+    def construct_trusted(
+        cls: Type[MongoBaseModelType],
+        data: Dict[Text, Any],
+        loaded_fields: Optional[Collection[Text]] = None,
+    ) -> MongoBaseModelType:
+        if loaded_fields is None:
+            values = {name: data[name] for name in cls.model_fields if name in data}
+            return cls.model_construct(_fields_set=set(values), **values)
+
+        fields_values: Dict[Text, Any] = {}
+        fields_set = set()
+        for name in loaded_fields:
+            if name in data:
+                fields_values[name] = data[name]
+                fields_set.add(name)
+            elif not cls.model_fields[name].is_required():
+                fields_values[name] = cls.model_fields[name].get_default(
+                    call_default_factory=True
+                )
+
+        instance = cls.__new__(cls)
+        object.__setattr__(instance, "__dict__", fields_values)
+        object.__setattr__(instance, "__pydantic_fields_set__", fields_set)
+        object.__setattr__(instance, "__pydantic_extra__", None)
+        instance.model_post_init(None)
+        return instance
+
+    @classmethod
+    def validate_partial(
+        cls: Type[MongoBaseModelType],
+        data: Dict[Text, Any],
+        loaded_fields: Collection[Text],
+    ) -> MongoBaseModelType:
+        instance = cls.construct_trusted(data, loaded_fields)
+        for name in loaded_fields:
+            if name in data:
+                cls.__pydantic_validator__.validate_assignment(
+                    instance, name, data[name]
+                )
+        return instance
+
+    def __getattr__(self, item: Text) -> Any:
+        if item in self.__class__.__relationships__:
+            return self._get_related(item)
+        if item.startswith("_") or item not in self.__class__.model_fields:
+            return super().__getattr__(item)
+
+        private = self.__pydantic_private__ or {}
+        lazy_document = private.get("_lazy_document")
+        if lazy_document is not None:
+            lazy_fields = private.get("_lazy_fields")
+            if lazy_fields is None or item in lazy_fields:
+                self._load_lazy_field(item, lazy_document)
+                return self.__dict__[item]
+
+        if self._session is None or self._id is None:
+            raise DeferredFieldError(
+                f"Field '{item}' of {self.__class__.__name__} is not loaded, "
+                + "and the instance is not bound to a session to load it"
+            )
+        self._session._load_deferred_fields(self)
+        return self.__dict__[item]
+
+    def _get_related(self, name: Text) -> Any:
+        related = (self.__pydantic_private__ or {}).get("_related")
+        if related is not None and name in related:
+            return related[name]
+
+        if self._session is None or self._id is None:
+            raise DeferredFieldError(
+                f"Relationship '{name}' of {self.__class__.__name__} is not loaded, "
+                + "and the instance is not bound to a session to load it"
+            )
+        self._session._load_relationship(self, name)
+        return self._related[name]  # type: ignore[index]
+
+    def model_dump(self, *args: Any, **kwargs: Any) -> Dict[Text, Any]:
+        if self._lazy_document is not None:
+            self._load_lazy_fields(kwargs.get("include"))
+        return super().model_dump(*args, **kwargs)
+
+    def model_dump_json(self, *args: Any, **kwargs: Any) -> Text:
+        if self._lazy_document is not None:
+            self._load_lazy_fields(kwargs.get("include"))
+        return super().model_dump_json(*args, **kwargs)
+
+    def _load_lazy_field(self, name: Text, lazy_document: "LazyDocument") -> None:
+        try:
+            value = lazy_document[name]
+        except KeyError:
+            value = self.__class__.model_fields[name].get_default(
+                call_default_factory=True
+            )
+            if value is PydanticUndefined:
+                raise DeferredFieldError(
+                    f"Field '{name}' is missing from the stored document"
+                )
+        self.__pydantic_validator__.validate_assignment(self, name, value)
+
+        if len(self.__dict__) == len(self.__class__.model_fields):
+            self.__pydantic_private__["_lazy_document"] = None
+
+    def _load_lazy_fields(self, include: Optional[Collection[Text]] = None) -> None:
+        for name in self.__class__.model_fields if include is None else include:
+            if self._lazy_document is None:
+                return
+            if name in self.__dict__ or name not in self.__class__.model_fields:
+                continue
+            if self._lazy_fields is None or name in self._lazy_fields:
+                self._load_lazy_field(name, self._lazy_document)
 
     def __setattr__(self, name: Text, value: Any) -> None:
+        if name.startswith("_") or self._session is None:
+            super().__setattr__(name, value)
+            return
+
+        original_value = self.__dict__.get(name, NOT_SET_SENTINEL)
+        self._session._check_scope(self)
         super().__setattr__(name, value)
-        if self._session is not None and name not in ["_id", "_session"]:
-            self._session._update_instances.append(tuple([self, name, value]))
+        self._session._track_update(self, name, original_value)
@@ -1,29 +1,422 @@
-from typing import Any, List, Optional, Protocol, Text, Tuple, Type
+import base64
+import contextlib
+import copy
+import itertools
+import time
+import weakref
+from enum import Enum, auto
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Set,
+    Text,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
+import bson
+from bson.codec_options import CodecOptions
 from bson.objectid import ObjectId
-from pymongo import MongoClient
+from bson.raw_bson import RawBSONDocument
+from pydantic_core import PydanticUndefined
+from pymongo import ASCENDING, DeleteOne, MongoClient, UpdateOne
 from pymongo.client_session import ClientSession
+from pymongo.errors import BulkWriteError
+from pymongo.results import BulkWriteResult
 from typing_extensions import ParamSpec
 
-from mongotic.exceptions import NotFound
+from mongotic.aggregate import Aggregate, GroupBy, build_group_stages, parse_group_rows
+from mongotic.bulk import DocumentExporter, ExportResult, get_list_adapter, iter_batches
+from mongotic.cache import CacheKey, Namespace, QueryCache
+from mongotic.events import (
+    AFTER_EXECUTE,
+    AFTER_FLUSH,
+    AFTER_HYDRATE,
+    BEFORE_EXECUTE,
+    ExecutionEvent,
+    dispatch,
+    has_listeners,
+    iter_fetch,
+    iter_hydrate,
+)
+from mongotic.exceptions import (
+    DeferredFieldError,
+    FlushError,
+    NotFound,
+    SessionScopeError,
+)
+from mongotic.index import check_query_indexes
+from mongotic.lazy import LazyDocument
 from mongotic.model import (
     NOT_SET_SENTINEL,
+    BindParam,
     ModelField,
     ModelFieldOperation,
     MongoBaseModel,
+    get_field_name,
+)
+from mongotic.parallel import build_partition_bounds, iter_parallel
+from mongotic.relationship import (
+    JOINED,
+    SELECTIN,
+    collect_keys,
+    get_joined_field,
+    get_relationship,
+    group_related,
+    set_related,
 )
 
+if TYPE_CHECKING:
+    from mongotic.scoping import ScopedSession
+
 P = ParamSpec("P")
+QuerySetType = TypeVar("QuerySetType", bound="BaseQuerySet")
+IdentityKey = Tuple[Text, Text, Text, Type["MongoBaseModel"]]
+SortKey = Union["ModelField", Text, Tuple[Union["ModelField", Text], int]]
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_HYDRATION_BATCH_SIZE = 100
+
+
+class Hydration(Enum):
+    VALIDATE = auto()
+    BATCH = auto()
+    TRUSTED = auto()
+    LAZY = auto()
+
+
+def group_by_collection(
+    instances: Iterable["MongoBaseModel"],
+) -> Dict[Tuple[Text, Text], List["MongoBaseModel"]]:
+    groups: Dict[Tuple[Text, Text], List["MongoBaseModel"]] = {}
+    for instance in instances:
+        key = (instance.__databasename__, instance.__tablename__)
+        groups.setdefault(key, []).append(instance)
+    return groups
+
+
+class DirtyState(object):
+    def __init__(self, instance: "MongoBaseModel"):
+        self.instance = instance
+        self.original_values: Dict[Text, Any] = {}
+
+    def __repr__(self) -> Text:
+        return (
+            f"<DirtyState(Instance={self.instance.__class__.__name__}, "
+            + f"Fields={list(self.original_values)})>"
+        )
+
+    def track(self, field_name: Text, original_value: Any) -> None:
+        self.original_values.setdefault(field_name, original_value)
+
+    def changed_fields(self) -> List[Text]:
+        return [
+            field_name
+            for field_name, original_value in self.original_values.items()
+            if self.instance.__dict__.get(field_name, NOT_SET_SENTINEL)
+            != original_value
+        ]
+
+    def to_mongo_update(self) -> Optional[Dict[Text, Any]]:
+        changed_fields = self.changed_fields()
+        if not changed_fields:
+            return None
+        return {"$set": self.instance.model_dump(include=set(changed_fields))}
+
+
+class Page(object):
+    def __init__(self, items: List["MongoBaseModel"], next_token: Optional[Text]):
+        self.items = items
+        self.next_token = next_token
+
+    def __repr__(self) -> Text:
+        return f"<Page(Items={len(self.items)}, HasNext={self.has_next})>"
+
+    def __iter__(self) -> Iterator["MongoBaseModel"]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_token is not None
+
+
+class WriteResult(object):
+    def __init__(
+        self, matched_count: int = 0, modified_count: int = 0, deleted_count: int = 0
+    ):
+        self.matched_count = matched_count
+        self.modified_count = modified_count
+        self.deleted_count = deleted_count
+
+    def __repr__(self) -> Text:
+        return (
+            f"<WriteResult(Matched={self.matched_count}, "
+            + f"Modified={self.modified_count}, Deleted={self.deleted_count})>"
+        )
+
+
+class MergeResult(object):
+    def __init__(
+        self, inserted_count: int = 0, matched_count: int = 0, updated_count: int = 0
+    ):
+        self.inserted_count = inserted_count
+        self.matched_count = matched_count
+        self.updated_count = updated_count
+
+    def __repr__(self) -> Text:
+        return (
+            f"<MergeResult(Inserted={self.inserted_count}, "
+            + f"Matched={self.matched_count}, Updated={self.updated_count})>"
+        )
 
 
-class QuerySet:
+class FlushBatch(object):
+    def __init__(
+        self,
+        kind: Text,
+        namespace: Namespace,
+        items: List[Any],
+        requests: List[Any],
+    ):
+        self.kind = kind
+        self.namespace = namespace
+        self.items = items
+        self.requests = requests
+
+    def __repr__(self) -> Text:
+        return (
+            f"<FlushBatch(Kind={self.kind}, Namespace={self.namespace}, "
+            + f"Size={len(self.items)})>"
+        )
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def subset(self, indexes: Iterable[int]) -> "FlushBatch":
+        indexes = list(indexes)
+        return FlushBatch(
+            kind=self.kind,
+            namespace=self.namespace,
+            items=[self.items[i] for i in indexes],
+            requests=[self.requests[i] for i in indexes],
+        )
+
+    def instances(self) -> List["MongoBaseModel"]:
+        if self.kind == "update":
+            return [dirty_state.instance for dirty_state in self.items]
+        return list(self.items)
+
+
+class QueryExecution(object):
+    def __init__(
+        self,
+        collection: Any,
+        filter_dict: Dict[Text, Any],
+        event: Optional[ExecutionEvent],
+        cache_kind: Optional[Text] = None,
+        docs_raw: Optional[List[Dict[Text, Any]]] = None,
+    ):
+        self.collection = collection
+        self.filter_dict = filter_dict
+        self.event = event
+        self.cache_kind = cache_kind
+        self.docs_raw = docs_raw
+        self.start = time.perf_counter()
+
+    def __repr__(self) -> Text:
+        return (
+            f"<QueryExecution(Collection={self.collection.name}, "
+            + f"Cached={self.cached})>"
+        )
+
+    @property
+    def cached(self) -> bool:
+        return self.docs_raw is not None
+
+
+class FlushRun(object):
+    def __init__(self, session: "BaseSession", chunk_size: int):
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be positive")
+
+        self.session = session
+        self.chunk_size = chunk_size
+        self.flush_events = session._flush_events()
+        self.namespaces: Set[Namespace] = set()
+        self.flushed = 0
+        self._batches: List[FlushBatch] = []
+        self._index = 0
+
+    def __repr__(self) -> Text:
+        return f"<FlushRun(ChunkSize={self.chunk_size}, Flushed={self.flushed})>"
+
+    def __iter__(self) -> Iterator[FlushBatch]:
+        self._batches = self.session._next_flush_chunk(self.chunk_size)
+        while self._batches:
+            for i, batch in enumerate(self._batches):
+                self._index = i
+                self.namespaces.add(batch.namespace)
+                yield batch
+                # Only reached once the caller has written the batch.
+                self.session._complete_flush_batch(batch)
+                self.flushed += len(batch)
+            self._batches = self.session._next_flush_chunk(self.chunk_size)
+        self.session._pending_bytes = 0
+
+    def fail(self, error: Exception) -> FlushError:
+        return self.session._fail_flush(self._batches, self._index, error, self.flushed)
+
+    def close(self) -> None:
+        self.session._invalidate_cache(self.namespaces)
+        self.session._dispatch_flush(self.flush_events)
+
+
+def get_flushed_indexes(
+    batch: FlushBatch, error: Exception, ordered: bool
+) -> List[int]:
+    if not isinstance(error, BulkWriteError):
+        return []
+    failed_indexes = {
+        write_error["index"] for write_error in error.details["writeErrors"]
+    }
+    if ordered:
+        return list(range(min(failed_indexes, default=len(batch))))
+    return [i for i in range(len(batch)) if i not in failed_indexes]
+
+
+def encode_keyset_token(sort: List[Tuple[Text, int]], values: List[Any]) -> Text:
+    token_bson = bson.encode({"sort": [list(key) for key in sort], "values": values})
+    return base64.urlsafe_b64encode(token_bson).decode("ascii")
+
+
+def decode_keyset_token(token: Text) -> Tuple[List[Tuple[Text, int]], List[Any]]:
+    try:
+        token_doc = bson.decode(base64.urlsafe_b64decode(token.encode("ascii")))
+        sort = [(field_name, direction) for field_name, direction in token_doc["sort"]]
+        values = list(token_doc["values"])
+    except Exception as e:
+        raise ValueError("Invalid pagination token") from e
+    if len(sort) != len(values):
+        raise ValueError("Invalid pagination token")
+    return sort, values
+
+
+def build_keyset_filter(
+    sort: List[Tuple[Text, int]], values: List[Any]
+) -> List[Dict[Text, Any]]:
+    clauses: List[Dict[Text, Any]] = []
+    for i, (field_name, direction) in enumerate(sort):
+        clause: Dict[Text, Any] = {
+            prev_field_name: {"$eq": prev_value}
+            for (prev_field_name, _), prev_value in zip(sort[:i], values[:i])
+        }
+        operator = "$gt" if direction == ASCENDING else "$lt"
+        clause[field_name] = {operator: values[i]}
+        clauses.append(clause)
+    return clauses
+
+
+def identity_key(orm_model: Type["MongoBaseModel"], _id: Any) -> IdentityKey:
+    return (orm_model.__databasename__, orm_model.__tablename__, str(_id), orm_model)
+
+
+def get_deferred_fields(instance: "MongoBaseModel") -> List[Text]:
+    return [name for name in instance.model_fields if name not in instance.__dict__]
+
+
+def apply_deferred_fields(
+    instance: "MongoBaseModel", doc_raw: Dict[Text, Any], field_names: List[Text]
+) -> None:
+    model_fields = instance.__class__.model_fields
+    for name in field_names:
+        if name in doc_raw:
+            value = doc_raw[name]
+        else:
+            value = model_fields[name].get_default(call_default_factory=True)
+            if value is PydanticUndefined:
+                raise DeferredFieldError(
+                    f"Field '{name}' is missing from the stored document"
+                )
+        instance.__pydantic_validator__.validate_assignment(instance, name, value)
+
+
+def build_update_operation(dirty_state: "DirtyState") -> Optional[UpdateOne]:
+    instance = dirty_state.instance
+    if instance._id is None:
+        return None
+    update = dirty_state.to_mongo_update()
+    if update is None:
+        return None
+    return UpdateOne({"_id": ObjectId(instance._id)}, update)
+
+
+def build_update_operations(
+    dirty_states: Iterable["DirtyState"],
+) -> Dict[Tuple[Text, Text], List[UpdateOne]]:
+    operations: Dict[Tuple[Text, Text], List[UpdateOne]] = {}
+    for dirty_state in dirty_states:
+        operation = build_update_operation(dirty_state)
+        if operation is None:
+            continue
+        instance = dirty_state.instance
+        key = (instance.__databasename__, instance.__tablename__)
+        operations.setdefault(key, []).append(operation)
+    return operations
+
+
+def build_merge_operation(
+    instance: "MongoBaseModel", on_fields: List[Text]
+) -> UpdateOne:
+    doc = instance.model_dump()
+    return UpdateOne(
+        {field_name: doc[field_name] for field_name in on_fields},
+        {"$set": doc},
+        upsert=True,
+    )
+
+
+def build_delete_operation(instance: "MongoBaseModel") -> Optional[DeleteOne]:
+    if instance._id is None:
+        return None
+    return DeleteOne({"_id": ObjectId(instance._id)})
+
+
+def build_delete_operations(
+    instances: Iterable["MongoBaseModel"],
+) -> Dict[Tuple[Text, Text], List[DeleteOne]]:
+    operations: Dict[Tuple[Text, Text], List[DeleteOne]] = {}
+    for instance in instances:
+        operation = build_delete_operation(instance)
+        if operation is None:
+            continue
+        key = (instance.__databasename__, instance.__tablename__)
+        operations.setdefault(key, []).append(operation)
+    return operations
+
+
+class BaseQuerySet:
     def __init__(
         self,
         orm_model: Type["MongoBaseModel"],
         *args: Any,
-        engine: "MongoClient",
-        session: "Session",
-        **kwargs: Any
+        engine: Any,
+        session: Any,
+        **kwargs: Any,
     ):
         self.orm_model = orm_model
         self.engine = engine
@@ -37,12 +430,26 @@ class QuerySet:
         self._db_name: Text = self.orm_model.__databasename__
         self._col_name: Text = self.orm_model.__tablename__
         self._limit = 5
+        self._limit_set = False
         self._offset = 0
+        self._batch_size: Optional[int] = None
+        self._hydration: Hydration = session.hydration
+        self._projection_include: Optional[bool] = None
+        self._projection_fields: List[Text] = []
+        self._loaded_fields_cache: Optional[FrozenSet[Text]] = None
+        self._use_cache: bool = session.query_cache is not None
+        self._lazy_codec_options: Optional[CodecOptions] = None
+        self._compiled_filter: Optional[Dict[Text, Any]] = None
         self._filters: List["ModelFieldOperation"] = []
+        self._sort: List[Tuple[Text, int]] = []
+        self._after_token: Optional[Text] = None
+        self._relationship_loads: Dict[Text, Text] = {}
 
     def filter(
-        self, *model_field_operations: "ModelFieldOperation", **kwargs: Any
-    ) -> "QuerySet":
+        self: QuerySetType,
+        *model_field_operations: "ModelFieldOperation",
+        **kwargs: Any,
+    ) -> QuerySetType:
         if not model_field_operations and not kwargs:
             raise ValueError("No filter is provided")
 
@@ -55,59 +462,1382 @@ class QuerySet:
 
         return self
 
-    def filter_by(self, **kwargs: Any) -> "QuerySet":
+    def filter_by(self: QuerySetType, **kwargs: Any) -> QuerySetType:
         for k, v in kwargs.items():
             self._filters.append(
                 ModelField(field_name=k, model_class=self.orm_model) == v
             )
         return self
 
-    def limit(self, value: int, *args: Any, **kwargs: Any) -> "QuerySet":
+    def limit(
+        self: QuerySetType, value: int, *args: Any, **kwargs: Any
+    ) -> QuerySetType:
         if value < 0:
             raise ValueError("Limit value must be positive")
         self._limit = value
+        self._limit_set = True
         return self
 
-    def offset(self, value: int, *args: Any, **kwargs: Any) -> "QuerySet":
+    def offset(
+        self: QuerySetType, value: int, *args: Any, **kwargs: Any
+    ) -> QuerySetType:
         if value < 0:
             raise ValueError("Offset value must be positive")
         self._offset = value
         return self
 
-    def first(self, *args: Any, **kwargs: Any) -> "MongoBaseModel":
-        collection = self.engine[self._db_name][self._col_name]
+    def order_by(self: QuerySetType, *keys: SortKey, **kwargs: Any) -> QuerySetType:
+        if not keys:
+            raise ValueError("No sort key is provided")
+
+        for key in keys:
+            field, direction = key if isinstance(key, tuple) else (key, ASCENDING)
+            if isinstance(field, str) and field.startswith("-"):
+                field, direction = field[1:], -direction
+            if direction not in (1, -1):
+                raise ValueError(f"Invalid sort direction: {direction}")
+
+            field_name = (
+                field
+                if isinstance(field, str) and field == "_id"
+                else get_field_name(field, self.orm_model)
+            )
+            if field_name in (name for name, _ in self._sort):
+                raise ValueError(f"Field '{field_name}' is already sorted")
+            self._sort.append((field_name, direction))
+        return self
+
+    def after(
+        self: QuerySetType, token: Text, *args: Any, **kwargs: Any
+    ) -> QuerySetType:
+        decode_keyset_token(token)
+        self._after_token = token
+        return self
+
+    def yield_per(
+        self: QuerySetType, count: int, *args: Any, **kwargs: Any
+    ) -> QuerySetType:
+        if count <= 0:
+            raise ValueError("Yield per value must be positive")
+        self._batch_size = count
+        return self
+
+    def hydration(
+        self: QuerySetType, mode: Hydration, *args: Any, **kwargs: Any
+    ) -> QuerySetType:
+        self._hydration = mode
+        return self
+
+    def trusted(self: QuerySetType, *args: Any, **kwargs: Any) -> QuerySetType:
+        return self.hydration(Hydration.TRUSTED)
+
+    def lazy(self: QuerySetType, *args: Any, **kwargs: Any) -> QuerySetType:
+        return self.hydration(Hydration.LAZY)
+
+    def cache(
+        self: QuerySetType, enabled: bool = True, *args: Any, **kwargs: Any
+    ) -> QuerySetType:
+        if enabled and self.session.query_cache is None:
+            raise ValueError("Query cache is not configured on the session")
+        self._use_cache = enabled
+        return self
+
+    def selectinload(self: QuerySetType, *names: Text, **kwargs: Any) -> QuerySetType:
+        return self._set_relationship_loads(names, SELECTIN)
+
+    def joinedload(self: QuerySetType, *names: Text, **kwargs: Any) -> QuerySetType:
+        return self._set_relationship_loads(names, JOINED)
 
-        filter_body = ModelFieldOperation.to_mongo_filter(filters=self._filters)
-        doc_raw = collection.find_one(filter=filter_body)
-        if not doc_raw:
+    def _set_relationship_loads(
+        self: QuerySetType, names: Iterable[Text], strategy: Text
+    ) -> QuerySetType:
+        if not names:
+            raise ValueError("No relationship is provided")
+        for name in names:
+            get_relationship(self.orm_model, name)
+            self._relationship_loads[name] = strategy
+        if strategy == JOINED:
+            # Joined documents come from other collections, whose writes do
+            # not invalidate this query's cache entries.
+            self._use_cache = False
+        return self
+
+    def load_only(
+        self: QuerySetType, *fields: Union["ModelField", Text], **kwargs: Any
+    ) -> QuerySetType:
+        return self._set_projection(fields, True)
+
+    def defer(
+        self: QuerySetType, *fields: Union["ModelField", Text], **kwargs: Any
+    ) -> QuerySetType:
+        return self._set_projection(fields, False)
+
+    def _set_projection(
+        self: QuerySetType, fields: Iterable[Union["ModelField", Text]], include: bool
+    ) -> QuerySetType:
+        if not fields:
+            raise ValueError("No field is provided")
+        if self._projection_include is not None and self._projection_include != include:
+            raise ValueError("Cannot combine load_only and defer in one query")
+
+        self._projection_include = include
+        self._loaded_fields_cache = None
+        for field in fields:
+            field_name = get_field_name(field, self.orm_model)
+            if field_name not in self._projection_fields:
+                self._projection_fields.append(field_name)
+        return self
+
+    def _compile_filter(self) -> Dict[Text, Any]:
+        filter_dict = self._compile_field_filter()
+        if self._after_token is None:
+            return filter_dict
+
+        sort, values = decode_keyset_token(self._after_token)
+        if sort != self._sort_spec():
+            raise ValueError("Pagination token does not match the query sort order")
+        return {**filter_dict, "$or": build_keyset_filter(sort, values)}
+
+    def _compile_field_filter(self) -> Dict[Text, Any]:
+        if self._compiled_filter is None:
+            return ModelFieldOperation.to_mongo_filter(filters=self._filters)
+        if not self._filters:
+            return self._compiled_filter
+
+        filter_dict = dict(self._compiled_filter)
+        for field_name, field_filter in ModelFieldOperation.to_mongo_filter(
+            filters=self._filters
+        ).items():
+            filter_dict[field_name] = {
+                **filter_dict.get(field_name, {}),
+                **field_filter,
+            }
+        return filter_dict
+
+    def group_by(self, *fields: Union["ModelField", Text], **kwargs: Any) -> GroupBy:
+        return GroupBy(
+            query=self,
+            field_names=[get_field_name(field, self.orm_model) for field in fields],
+        )
+
+    def _clone(self: QuerySetType) -> QuerySetType:
+        clone = copy.copy(self)
+        clone._filters = list(self._filters)
+        clone._sort = list(self._sort)
+        clone._projection_fields = list(self._projection_fields)
+        clone._relationship_loads = dict(self._relationship_loads)
+        return clone
+
+    def _export_query(
+        self: QuerySetType, field_names: List[Text], chunk_size: int
+    ) -> QuerySetType:
+        query = self._clone()
+        if not query._limit_set:
+            query._limit = 0
+        query._batch_size = chunk_size
+        query._hydration = Hydration.TRUSTED
+        query._projection_include = True
+        query._projection_fields = [name for name in field_names if name != "_id"]
+        return query
+
+    def _export_fields(
+        self, fields: Optional[List[Union["ModelField", Text]]]
+    ) -> List[Text]:
+        if fields is None:
+            return list(self.orm_model.model_fields)
+        return [
+            field
+            if isinstance(field, str) and field == "_id"
+            else get_field_name(field, self.orm_model)
+            for field in fields
+        ]
+
+    def _compile_write_filter(self) -> Dict[Text, Any]:
+        if self._limit_set or self._offset:
+            raise ValueError("Set-based writes do not support limit or offset")
+        return self._compile_filter()
+
+    def _compile_update(
+        self, values: Dict[Union["ModelField", Text], Any]
+    ) -> Dict[Text, Any]:
+        if not values:
+            raise ValueError("No value is provided")
+
+        staging = self.orm_model.model_construct()
+        field_names = set()
+        for field, value in values.items():
+            field_name = get_field_name(field, self.orm_model)
+            self.orm_model.__pydantic_validator__.validate_assignment(
+                staging, field_name, value
+            )
+            field_names.add(field_name)
+        return staging.model_dump(include=field_names)
+
+    def _after_write(
+        self, event: Optional[ExecutionEvent], round_trip_time: float, doc_count: int
+    ) -> None:
+        if event is None:
+            return
+        event.round_trip_time += round_trip_time
+        event.doc_count = doc_count
+        dispatch(AFTER_EXECUTE, event)
+
+    def _build_pipeline(
+        self, filter_dict: Dict[Text, Any], stages: List[Dict[Text, Any]]
+    ) -> List[Dict[Text, Any]]:
+        pipeline: List[Dict[Text, Any]] = [{"$match": filter_dict}]
+        sort = self._sort_spec()
+        if sort:
+            pipeline.append({"$sort": dict(sort)})
+        if self._offset:
+            pipeline.append({"$skip": self._offset})
+        if self._limit_set and self._limit:
+            pipeline.append({"$limit": self._limit})
+        pipeline.extend(stages)
+        return pipeline
+
+    def _distinct_stages(
+        self, field: Union["ModelField", Text]
+    ) -> List[Dict[Text, Any]]:
+        field_name = get_field_name(field, self.orm_model)
+        return [{"$group": {"_id": f"${field_name}"}}, {"$sort": {"_id": 1}}]
+
+    def _build_cursor(self, collection: Any, filter_dict: Dict[Text, Any]) -> Any:
+        check_query_indexes(self.orm_model, filter_dict)
+        joined_names = self._relationship_names(JOINED)
+        if joined_names:
+            if self._batch_size is not None:
+                return collection.aggregate(
+                    self._joined_pipeline(filter_dict, joined_names),
+                    batchSize=self._batch_size,
+                )
+            return collection.aggregate(
+                self._joined_pipeline(filter_dict, joined_names)
+            )
+
+        cursor = (
+            self._find_collection(collection)
+            .find(filter_dict, projection=self._compile_projection())
+            .skip(self._offset)
+            .limit(self._limit)
+        )
+        sort = self._sort_spec()
+        if sort:
+            cursor = cursor.sort(sort)
+        if self._batch_size is not None:
+            cursor = cursor.batch_size(self._batch_size)
+        return cursor
+
+    def _joined_pipeline(
+        self, filter_dict: Dict[Text, Any], names: List[Text]
+    ) -> List[Dict[Text, Any]]:
+        if self._hydration is Hydration.LAZY:
+            raise ValueError(
+                "Joined relationship loading does not support lazy hydration"
+            )
+
+        pipeline: List[Dict[Text, Any]] = [{"$match": filter_dict}]
+        sort = self._sort_spec()
+        if sort:
+            pipeline.append({"$sort": dict(sort)})
+        if self._offset:
+            pipeline.append({"$skip": self._offset})
+        if self._limit:
+            pipeline.append({"$limit": self._limit})
+        for name in names:
+            pipeline.extend(
+                get_relationship(self.orm_model, name).lookup_stages(
+                    name, self.orm_model
+                )
+            )
+
+        projection = self._compile_projection()
+        if projection:
+            if self._projection_include:
+                projection.update((get_joined_field(name), 1) for name in names)
+            pipeline.append({"$project": projection})
+        return pipeline
+
+    def _relationship_names(self, strategy: Text) -> List[Text]:
+        return [
+            name
+            for name, name_strategy in self._relationship_loads.items()
+            if name_strategy == strategy
+        ]
+
+    def _attach_joined(
+        self, instances: List["MongoBaseModel"], docs_raw: List[Dict[Text, Any]]
+    ) -> None:
+        for name in self._relationship_names(JOINED):
+            relationship = get_relationship(self.orm_model, name)
+            related_query = self.session.query(relationship.target_model)
+            joined_field = get_joined_field(name)
+            for instance, doc_raw in zip(instances, docs_raw):
+                related = [
+                    related_query._hydrate(related_doc_raw)
+                    for related_doc_raw in doc_raw.get(joined_field) or []
+                ]
+                set_related(instance, name, relationship.build_value(related))
+
+    def _selectin_query(
+        self, name: Text, instances: List["MongoBaseModel"]
+    ) -> Optional["BaseQuerySet"]:
+        relationship = get_relationship(self.orm_model, name)
+        keys = collect_keys(relationship, instances)
+        if not keys:
+            return None
+
+        target_model = relationship.target_model
+        remote_field = ModelField(
+            field_name=relationship.remote_field, model_class=target_model
+        )
+        return (
+            self.session.query(target_model)
+            .filter(remote_field.in_(relationship.query_values(keys)))
+            .limit(0)
+        )
+
+    def _attach_selectin(
+        self,
+        name: Text,
+        instances: List["MongoBaseModel"],
+        related: List["MongoBaseModel"],
+    ) -> None:
+        relationship = get_relationship(self.orm_model, name)
+        groups = group_related(relationship, related)
+        for instance in instances:
+            set_related(
+                instance,
+                name,
+                relationship.build_value(
+                    list(groups.get(relationship.local_key(instance), []))
+                ),
+            )
+
+    def _find_collection(self, collection: Any) -> Any:
+        if self._hydration is not Hydration.LAZY:
+            return collection
+        return collection.with_options(
+            codec_options=collection.codec_options.with_options(
+                document_class=RawBSONDocument
+            )
+        )
+
+    def _cache_key(self, kind: Text) -> CacheKey:
+        return (
+            self._db_name,
+            self._col_name,
+            kind,
+            repr(self._compile_filter()),
+            repr(self._compile_projection()),
+            repr(self._sort_spec()),
+            self._limit,
+            self._offset,
+        )
+
+    def _read_cache(self, kind: Text) -> Optional[List[Dict[Text, Any]]]:
+        if not self._use_cache:
+            return None
+        return self.session.query_cache.get(self._cache_key(kind))
+
+    def _write_cache(self, kind: Text, docs_raw: List[Dict[Text, Any]]) -> None:
+        if not self._use_cache:
+            return
+        self.session.query_cache.set(
+            self._cache_key(kind), (self._db_name, self._col_name), docs_raw
+        )
+
+    def _sort_spec(self) -> List[Tuple[Text, int]]:
+        if not self._sort and self._after_token is None:
+            return []
+        if any(field_name == "_id" for field_name, _ in self._sort):
+            return list(self._sort)
+        return self._sort + [("_id", ASCENDING)]
+
+    def _compile_projection(self) -> Optional[Dict[Text, int]]:
+        if self._projection_include is None:
+            return None
+        sort_fields = [field_name for field_name, _ in self._sort]
+        if self._projection_include:
+            return {
+                field_name: 1
+                for field_name in itertools.chain(self._projection_fields, sort_fields)
+            }
+        return {
+            field_name: 0
+            for field_name in self._projection_fields
+            if field_name not in sort_fields
+        }
+
+    def _loaded_fields(self) -> Optional[FrozenSet[Text]]:
+        if self._projection_include is None:
+            return None
+        if self._loaded_fields_cache is None:
+            self._loaded_fields_cache = frozenset(
+                field_name
+                for field_name in self.orm_model.model_fields
+                if (field_name in self._projection_fields) == self._projection_include
+            )
+        return self._loaded_fields_cache
+
+    def _before_execute(
+        self, operation: Text, filter_dict: Dict[Text, Any], hydrates: bool = False
+    ) -> Optional[ExecutionEvent]:
+        if not has_listeners():
+            return None
+        event = ExecutionEvent(
+            operation=operation,
+            database=self._db_name,
+            collection=self._col_name,
+            filter=filter_dict,
+            projection=self._compile_projection(),
+        )
+        event.hydrates = hydrates
+        dispatch(BEFORE_EXECUTE, event)
+        return event
+
+    def _after_execute(
+        self,
+        event: Optional[ExecutionEvent],
+        docs_raw: List[Dict[Text, Any]],
+        round_trip_time: float,
+        cached: bool,
+    ) -> None:
+        if event is None:
+            return
+        event.round_trip_time += round_trip_time
+        event.cached = cached
+        event.record_documents(docs_raw)
+        dispatch(AFTER_EXECUTE, event)
+
+    def _after_hydrate(
+        self, event: Optional[ExecutionEvent], hydration_time: float
+    ) -> None:
+        if event is None:
+            return
+        event.hydration_time = hydration_time
+        dispatch(AFTER_HYDRATE, event)
+
+    def _start_read(
+        self, operation: Text, cache_kind: Text, hydrates: bool = False
+    ) -> QueryExecution:
+        filter_dict = self._compile_filter()
+        execution = QueryExecution(
+            collection=self.engine[self._db_name][self._col_name],
+            filter_dict=filter_dict,
+            event=self._before_execute(operation, filter_dict, hydrates=hydrates),
+            cache_kind=cache_kind,
+        )
+        execution.docs_raw = self._read_cache(cache_kind)
+        return execution
+
+    def _finish_read(
+        self, execution: QueryExecution, docs_raw: List[Dict[Text, Any]]
+    ) -> List[Dict[Text, Any]]:
+        if not execution.cached and execution.cache_kind is not None:
+            self._write_cache(execution.cache_kind, docs_raw)
+        self._after_execute(
+            execution.event,
+            docs_raw,
+            time.perf_counter() - execution.start,
+            execution.cached,
+        )
+        return docs_raw
+
+    def _find_one_kwargs(self, filter_dict: Dict[Text, Any]) -> Dict[Text, Any]:
+        check_query_indexes(self.orm_model, filter_dict)
+        return {
+            "filter": filter_dict,
+            "projection": self._compile_projection(),
+            "sort": self._sort_spec() or None,
+        }
+
+    def _finish_first(
+        self, execution: QueryExecution, docs_raw: List[Dict[Text, Any]]
+    ) -> "MongoBaseModel":
+        if execution.event is not None:
+            execution.event.hydrates = bool(docs_raw)
+        self._finish_read(execution, docs_raw)
+        if not docs_raw:
             raise NotFound
 
-        doc = self.orm_model(**doc_raw)
+        start = time.perf_counter()
+        doc = self._hydrate(docs_raw[0])
+        self._after_hydrate(execution.event, time.perf_counter() - start)
+        return doc
+
+    def _aggregate_pipeline(
+        self, filter_dict: Dict[Text, Any], stages: List[Dict[Text, Any]]
+    ) -> List[Dict[Text, Any]]:
+        check_query_indexes(self.orm_model, filter_dict)
+        return self._build_pipeline(filter_dict, stages)
+
+    def _start_write(self, operation: Text) -> QueryExecution:
+        filter_dict = self._compile_write_filter()
+        return QueryExecution(
+            collection=self.engine[self._db_name][self._col_name],
+            filter_dict=filter_dict,
+            event=self._before_execute(operation, filter_dict),
+        )
+
+    def _finish_update(
+        self, identity_ids: List[Any], update_doc: Dict[Text, Any], result: Any
+    ) -> WriteResult:
+        self.session._synchronize_update(self.orm_model, identity_ids, update_doc)
+        self.session._invalidate_cache([(self._db_name, self._col_name)])
+        return WriteResult(
+            matched_count=result.matched_count, modified_count=result.modified_count
+        )
+
+    def _finish_delete(self, identity_ids: List[Any], result: Any) -> WriteResult:
+        self.session._synchronize_delete(self.orm_model, identity_ids)
+        self.session._invalidate_cache([(self._db_name, self._col_name)])
+        return WriteResult(deleted_count=result.deleted_count)
+
+    def _start_export(
+        self,
+        fileobj: IO[Text],
+        format: Text,
+        fields: Optional[List[Union["ModelField", Text]]],
+        chunk_size: int,
+        progress: Optional[Callable[[ExportResult], None]],
+    ) -> Tuple[DocumentExporter, Any, Optional[ExecutionEvent]]:
+        field_names = self._export_fields(fields)
+        exporter = DocumentExporter(
+            fileobj=fileobj,
+            format=format,
+            fields=field_names,
+            chunk_size=chunk_size,
+            progress=progress,
+        )
+
+        query = self._export_query(field_names, chunk_size)
+        collection = self.engine[self._db_name][self._col_name]
+        filter_dict = query._compile_filter()
+        event = query._before_execute("export", filter_dict)
+        return exporter, query._build_cursor(collection, filter_dict), event
+
+    def _build_page(
+        self, docs_raw: List[Dict[Text, Any]], event: Optional[ExecutionEvent]
+    ) -> Page:
+        start = time.perf_counter()
+        items = self._hydrate_docs(docs_raw)
+        self._after_hydrate(event, time.perf_counter() - start)
+
+        next_token: Optional[Text] = None
+        if docs_raw and self._limit and len(docs_raw) >= self._limit:
+            sort = self._sort_spec()
+            next_token = encode_keyset_token(
+                sort, [docs_raw[-1].get(field_name) for field_name, _ in sort]
+            )
+        return Page(items=items, next_token=next_token)
+
+    def _hydrate_docs(self, docs_raw: List[Dict[Text, Any]]) -> List["MongoBaseModel"]:
+        if self._hydration is Hydration.BATCH and self._projection_include is None:
+            return self._hydrate_page(docs_raw)
+        return [self._hydrate(doc_raw) for doc_raw in docs_raw]
+
+    def _hydrate(self, doc_raw: Dict[Text, Any]) -> "MongoBaseModel":
+        if self._hydration is Hydration.LAZY:
+            return self._hydrate_lazy(doc_raw)
+
+        identity_instance = self._get_identity_instance(doc_raw)
+        if identity_instance is not None:
+            return identity_instance
+
+        loaded_fields = self._loaded_fields()
+        if self._hydration is Hydration.TRUSTED:
+            doc = self.orm_model.construct_trusted(doc_raw, loaded_fields)
+        elif loaded_fields is not None:
+            doc = self.orm_model.validate_partial(doc_raw, loaded_fields)
+        else:
+            doc = self.orm_model(**doc_raw)
+        return self._bind(doc, doc_raw)
+
+    def _hydrate_lazy(self, doc_raw: Dict[Text, Any]) -> "MongoBaseModel":
+        if self._lazy_codec_options is None:
+            self._lazy_codec_options = self.engine.codec_options.with_options(
+                document_class=dict
+            )
+        lazy_document = LazyDocument.from_document(doc_raw, self._lazy_codec_options)
+
+        _id = lazy_document["_id"]
+        identity_instance = self.session._get_identity_instance(self.orm_model, _id)
+        if identity_instance is not None:
+            return identity_instance
+
+        doc = self.orm_model.construct_trusted({}, loaded_fields=())
+        doc._lazy_document = lazy_document
+        doc._lazy_fields = self._loaded_fields()
+        return self._bind(doc, {"_id": _id})
+
+    def _hydrate_page(self, docs_raw: List[Dict[Text, Any]]) -> List["MongoBaseModel"]:
+        docs: List[Optional["MongoBaseModel"]] = [
+            self._get_identity_instance(doc_raw) for doc_raw in docs_raw
+        ]
+        new_docs_raw = [doc_raw for doc, doc_raw in zip(docs, docs_raw) if doc is None]
+        if new_docs_raw:
+            new_docs = iter(
+                get_list_adapter(self.orm_model).validate_python(new_docs_raw)
+            )
+            docs = [
+                self._bind(next(new_docs), doc_raw) if doc is None else doc
+                for doc, doc_raw in zip(docs, docs_raw)
+            ]
+        return docs  # type: ignore[return-value]
+
+    def _get_identity_instance(
+        self, doc_raw: Dict[Text, Any]
+    ) -> Optional["MongoBaseModel"]:
+        instance = self.session._get_identity_instance(self.orm_model, doc_raw["_id"])
+        if instance is None:
+            return None
+
+        deferred_fields = [
+            name for name in get_deferred_fields(instance) if name in doc_raw
+        ]
+        if deferred_fields:
+            apply_deferred_fields(instance, doc_raw, deferred_fields)
+        return instance
+
+    def _bind(
+        self, doc: "MongoBaseModel", doc_raw: Dict[Text, Any]
+    ) -> "MongoBaseModel":
         doc._id = str(doc_raw["_id"])
         doc._session = self.session
+        self.session._register_instance(doc)
         return doc
 
+
+class QuerySet(BaseQuerySet):
+    def __iter__(self) -> Iterator["MongoBaseModel"]:
+        collection = self.engine[self._db_name][self._col_name]
+        filter_dict = self._compile_filter()
+        event = self._before_execute("find", filter_dict, hydrates=True)
+
+        cursor: Iterable[Dict[Text, Any]]
+        if self._use_cache and self._batch_size is None:
+            start = time.perf_counter()
+            docs_raw = self._read_cache("all")
+            cached = docs_raw is not None
+            if docs_raw is None:
+                docs_raw = list(self._build_cursor(collection, filter_dict))
+                self._write_cache("all", docs_raw)
+            self._after_execute(event, docs_raw, time.perf_counter() - start, cached)
+            cursor = docs_raw
+        else:
+            cursor = iter_fetch(self._build_cursor(collection, filter_dict), event)
+
+        yield from iter_hydrate(self._hydrate_cursor(cursor), event)
+
+    def _hydrate_cursor(
+        self, cursor: Iterable[Dict[Text, Any]]
+    ) -> Iterator["MongoBaseModel"]:
+        if self._relationship_loads:
+            page_size = self._batch_size or DEFAULT_HYDRATION_BATCH_SIZE
+            for _page in iter_batches(cursor, page_size):
+                _docs = self._hydrate_docs(_page)
+                self._load_relationships(_docs, _page)
+                yield from _docs
+        elif self._hydration is Hydration.BATCH and self._projection_include is None:
+            page_size = self._batch_size or DEFAULT_HYDRATION_BATCH_SIZE
+            for _page in iter_batches(cursor, page_size):
+                yield from self._hydrate_page(_page)
+        else:
+            for _doc in cursor:
+                yield self._hydrate(_doc)
+
+    def first(self, *args: Any, **kwargs: Any) -> "MongoBaseModel":
+        if self._relationship_loads:
+            docs = self._clone().limit(1).all()
+            if not docs:
+                raise NotFound
+            return docs[0]
+
+        execution = self._start_read("find_one", "first", hydrates=True)
+        docs_raw = execution.docs_raw
+        if docs_raw is None:
+            doc_raw = self._find_collection(execution.collection).find_one(
+                **self._find_one_kwargs(execution.filter_dict)
+            )
+            docs_raw = [doc_raw] if doc_raw else []
+        return self._finish_first(execution, docs_raw)
+
     def all(self, *args: Any, **kwargs: Any) -> List["MongoBaseModel"]:
-        docs: List["MongoBaseModel"] = []
+        return list(self)
+
+    def page(self, *args: Any, **kwargs: Any) -> Page:
+        if not self._sort:
+            return self._clone().order_by("_id").page()
+
+        execution = self._start_read("find", "page", hydrates=True)
+        docs_raw = execution.docs_raw
+        if docs_raw is None:
+            docs_raw = list(
+                self._build_cursor(execution.collection, execution.filter_dict)
+            )
+        page = self._build_page(self._finish_read(execution, docs_raw), execution.event)
+        self._load_relationships(page.items, docs_raw)
+        return page
+
+    def _load_relationships(
+        self, instances: List["MongoBaseModel"], docs_raw: List[Dict[Text, Any]]
+    ) -> None:
+        if not instances or not self._relationship_loads:
+            return
+        self._attach_joined(instances, docs_raw)
+        for name in self._relationship_names(SELECTIN):
+            self._load_selectin(name, instances)
+
+    def _load_selectin(self, name: Text, instances: List["MongoBaseModel"]) -> None:
+        query = self._selectin_query(name, instances)
+        related = query.all() if query is not None else []
+        self._attach_selectin(name, instances, related)
+
+    def update(
+        self, values: Dict[Union["ModelField", Text], Any], *args: Any, **kwargs: Any
+    ) -> WriteResult:
+        update_doc = self._compile_update(values)
+        execution = self._start_write("update_many")
+
+        with self._write_transaction():
+            identity_ids = self._identity_ids(
+                execution.collection, execution.filter_dict
+            )
+            start = time.perf_counter()
+            result = execution.collection.update_many(
+                execution.filter_dict,
+                {"$set": update_doc},
+                session=self.session.client_session,
+            )
+            self._after_write(
+                execution.event, time.perf_counter() - start, result.modified_count
+            )
+
+        return self._finish_update(identity_ids, update_doc, result)
+
+    def delete(self, *args: Any, **kwargs: Any) -> WriteResult:
+        execution = self._start_write("delete_many")
 
+        with self._write_transaction():
+            identity_ids = self._identity_ids(
+                execution.collection, execution.filter_dict
+            )
+            start = time.perf_counter()
+            result = execution.collection.delete_many(
+                execution.filter_dict, session=self.session.client_session
+            )
+            self._after_write(
+                execution.event, time.perf_counter() - start, result.deleted_count
+            )
+
+        return self._finish_delete(identity_ids, result)
+
+    def _write_transaction(self) -> ContextManager[Any]:
+        client_session = self.session.client_session
+        if client_session is None or client_session.in_transaction:
+            return contextlib.nullcontext()
+        return client_session.start_transaction()
+
+    def _identity_ids(self, collection: Any, filter_dict: Dict[Text, Any]) -> List[Any]:
+        if not self.session._has_identity_instances(self.orm_model):
+            return []
+        return [
+            doc_raw["_id"]
+            for doc_raw in collection.find(
+                filter_dict, projection={"_id": 1}, session=self.session.client_session
+            )
+        ]
+
+    def export(
+        self,
+        fileobj: IO[Text],
+        format: Text = "ndjson",
+        fields: Optional[List[Union["ModelField", Text]]] = None,
+        chunk_size: int = DEFAULT_BATCH_SIZE,
+        progress: Optional[Callable[[ExportResult], None]] = None,
+        *args: Any,
+        **kwargs: Any,
+    ) -> ExportResult:
+        exporter, cursor, event = self._start_export(
+            fileobj, format, fields, chunk_size, progress
+        )
+        for doc_raw in iter_fetch(cursor, event):
+            exporter.write(doc_raw)
+        return exporter.close()
+
+    def partitions(
+        self,
+        count: int,
+        field: Union["ModelField", Text] = "_id",
+        *args: Any,
+        **kwargs: Any,
+    ) -> List["QuerySet"]:
+        if count <= 0:
+            raise ValueError("Partition count must be positive")
+        if self._limit_set or self._offset or self._after_token is not None:
+            raise ValueError("Partitioned scans do not support limit, offset or after")
+
+        field_name = (
+            field
+            if isinstance(field, str) and field == "_id"
+            else get_field_name(field, self.orm_model)
+        )
         collection = self.engine[self._db_name][self._col_name]
+        buckets = list(
+            collection.aggregate(
+                [
+                    {"$match": self._compile_filter()},
+                    {
+                        "$bucketAuto": {
+                            "groupBy": f"${field_name}",
+                            "buckets": count,
+                        }
+                    },
+                ]
+            )
+        )
+        bounds = build_partition_bounds(buckets)
+
+        partition_field = ModelField(field_name=field_name, model_class=self.orm_model)
+        partitions: List["QuerySet"] = []
+        for i, lower_bound in enumerate(bounds):
+            partition = (
+                self._clone().limit(0).yield_per(self._batch_size or DEFAULT_BATCH_SIZE)
+            )
+            partition._sort = [(field_name, ASCENDING)]
+            partition.filter(partition_field >= lower_bound)
+            if i + 1 < len(bounds):
+                partition.filter(partition_field < bounds[i + 1])
+            partitions.append(partition)
+        return partitions
+
+    def parallel_scan(
+        self,
+        workers: int = 4,
+        field: Union["ModelField", Text] = "_id",
+        partitions: Optional[int] = None,
+        prefetch: int = DEFAULT_BATCH_SIZE,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Iterator["MongoBaseModel"]:
+        if workers <= 0:
+            raise ValueError("Workers must be positive")
+        if prefetch <= 0:
+            raise ValueError("Prefetch size must be positive")
+        return iter_parallel(
+            self.partitions(partitions or workers, field),
+            workers=workers,
+            prefetch=prefetch,
+        )
+
+    def count(self, *args: Any, **kwargs: Any) -> int:
+        docs_raw = self._aggregate([{"$count": "count"}])
+        return docs_raw[0]["count"] if docs_raw else 0
 
-        filter_body = ModelFieldOperation.to_mongo_filter(filters=self._filters)
+    def exists(self, *args: Any, **kwargs: Any) -> bool:
+        return bool(self._aggregate([{"$limit": 1}, {"$project": {"_id": 1}}]))
 
-        for _doc in collection.find(filter_body).skip(self._offset).limit(self._limit):
-            _doc_orm = self.orm_model(**_doc)
-            _doc_orm._id = str(_doc["_id"])
-            _doc_orm._session = self.session
-            docs.append(_doc_orm)
+    def distinct(
+        self, field: Union["ModelField", Text], *args: Any, **kwargs: Any
+    ) -> List[Any]:
+        docs_raw = self._aggregate(self._distinct_stages(field))
+        return [doc_raw["_id"] for doc_raw in docs_raw]
 
-        return docs
+    def _group(
+        self, field_names: List[Text], aggregates: Dict[Text, Aggregate]
+    ) -> List[Dict[Text, Any]]:
+        docs_raw = self._aggregate(
+            build_group_stages(self.orm_model, field_names, aggregates)
+        )
+        return parse_group_rows(docs_raw, field_names)
+
+    def _aggregate(self, stages: List[Dict[Text, Any]]) -> List[Dict[Text, Any]]:
+        execution = self._start_read("aggregate", f"aggregate:{stages!r}")
+        docs_raw = execution.docs_raw
+        if docs_raw is None:
+            docs_raw = list(
+                execution.collection.aggregate(
+                    self._aggregate_pipeline(execution.filter_dict, stages)
+                )
+            )
+        return self._finish_read(execution, docs_raw)
+
+
+class CompiledQuery(object):
+    def __init__(
+        self,
+        orm_model: Type["MongoBaseModel"],
+        *model_field_operations: "ModelFieldOperation",
+        **kwargs: Any,
+    ):
+        self.orm_model = orm_model
+
+        filter_dict = ModelFieldOperation.to_mongo_filter(
+            filters=list(model_field_operations)
+        )
+        self._static_filter: Dict[Text, Any] = {}
+        self._bound_filter: Dict[
+            Text, Tuple[Dict[Text, Any], List[Tuple[Text, Text]]]
+        ] = {}
+        for field_name, field_filter in filter_dict.items():
+            bound_operators = [
+                (operator, value.name)
+                for operator, value in field_filter.items()
+                if isinstance(value, BindParam)
+            ]
+            if bound_operators:
+                self._bound_filter[field_name] = (field_filter, bound_operators)
+            else:
+                self._static_filter[field_name] = field_filter
+
+        self.params: FrozenSet[Text] = frozenset(
+            param_name
+            for _, bound_operators in self._bound_filter.values()
+            for _, param_name in bound_operators
+        )
+
+    def __repr__(self) -> Text:
+        return (
+            f"<CompiledQuery(Model={self.orm_model.__name__}, "
+            + f"Params={sorted(self.params)})>"
+        )
+
+    def compile_filter(self, **params: Any) -> Dict[Text, Any]:
+        missing_params = self.params.difference(params)
+        if missing_params:
+            raise ValueError(f"Missing bind parameters: {sorted(missing_params)}")
+
+        filter_dict = dict(self._static_filter)
+        for field_name, (field_filter, bound_operators) in self._bound_filter.items():
+            field_filter = dict(field_filter)
+            for operator, param_name in bound_operators:
+                field_filter[operator] = params[param_name]
+            filter_dict[field_name] = field_filter
+        return filter_dict
+
+    def query(self, session: "Session", **params: Any) -> "QuerySet":
+        query = session.query(self.orm_model)
+        query._compiled_filter = self.compile_filter(**params)
+        return query
+
+    def first(self, session: "Session", **params: Any) -> "MongoBaseModel":
+        return self.query(session, **params).first()
+
+    def all(self, session: "Session", **params: Any) -> List["MongoBaseModel"]:
+        return self.query(session, **params).all()
+
+
+def compile_query(
+    orm_model: Type["MongoBaseModel"],
+    *model_field_operations: "ModelFieldOperation",
+    **kwargs: Any,
+) -> CompiledQuery:
+    return CompiledQuery(orm_model, *model_field_operations, **kwargs)
+
+
+class BaseSession:
+    def __init__(
+        self,
+        engine: Any,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        ordered: bool = True,
+        hydration: Hydration = Hydration.VALIDATE,
+        query_cache: Optional[QueryCache] = None,
+        autoflush_threshold: Optional[int] = None,
+        autoflush_bytes: Optional[int] = None,
+    ):
+        self.engine = engine
+        self.batch_size: int = batch_size
+        self.ordered: bool = ordered
+        self.hydration: Hydration = hydration
+        self.query_cache: Optional[QueryCache] = query_cache
+        self.autoflush_threshold: Optional[int] = autoflush_threshold
+        self.autoflush_bytes: Optional[int] = autoflush_bytes
+
+        self._add_instances: List["MongoBaseModel"] = []
+        self._update_instances: Dict[int, DirtyState] = {}
+        self._delete_instances: List["MongoBaseModel"] = []
+        self._pending_bytes: int = 0
+        self._identity_map: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        self._scope: Optional["ScopedSession"] = None
+
+    def add(self, instance: "MongoBaseModel", *args: Any, **kwargs: Any) -> None:
+        if instance.__databasename__ is NOT_SET_SENTINEL:
+            raise ValueError("Database name is not set")
+        if instance.__tablename__ is NOT_SET_SENTINEL:
+            raise ValueError("Table name is not set")
+
+        self._add_instances.append(instance)
+
+    def delete(self, instance: "MongoBaseModel", *args: Any, **kwargs: Any) -> None:
+        if instance.__databasename__ is NOT_SET_SENTINEL:
+            raise ValueError("Database name is not set")
+        if instance.__tablename__ is NOT_SET_SENTINEL:
+            raise ValueError("Table name is not set")
+
+        self._delete_instances.append(instance)
+
+    def close(self, *args: Any, **kwargs: Any) -> None:
+        for instance in list(self._identity_map.values()):
+            instance._session = None
+        self._identity_map = weakref.WeakValueDictionary()
+        self._add_instances = []
+        self._update_instances = {}
+        self._delete_instances = []
+        self._pending_bytes = 0
+
+    def _check_scope(self, instance: "MongoBaseModel") -> None:
+        if self._scope is not None and not self._scope.owns(self):
+            raise SessionScopeError(
+                f"{instance.__class__.__name__} is bound to a scoped session of "
+                + "another thread or context, merge it into the current session "
+                + "instead of modifying it"
+            )
+
+    def _track_update(
+        self, instance: "MongoBaseModel", field_name: Text, original_value: Any
+    ) -> None:
+        dirty_state = self._update_instances.get(id(instance))
+        if dirty_state is None:
+            dirty_state = DirtyState(instance)
+            self._update_instances[id(instance)] = dirty_state
+        dirty_state.track(field_name, original_value)
+
+    def _register_instance(self, instance: "MongoBaseModel") -> None:
+        self._identity_map[identity_key(instance.__class__, instance._id)] = instance
+
+    def _get_identity_instance(
+        self, orm_model: Type["MongoBaseModel"], ident: Any
+    ) -> Optional["MongoBaseModel"]:
+        return self._identity_map.get(identity_key(orm_model, ident))
+
+    def _has_identity_instances(self, orm_model: Type["MongoBaseModel"]) -> bool:
+        namespace = (orm_model.__databasename__, orm_model.__tablename__)
+        return any(key[:2] == namespace for key in list(self._identity_map.keys()))
+
+    def _identity_models(
+        self, orm_model: Type["MongoBaseModel"]
+    ) -> List[Type["MongoBaseModel"]]:
+        # Models mapped to the same collection keep separate instances.
+        namespace = (orm_model.__databasename__, orm_model.__tablename__)
+        return list(
+            {key[3] for key in list(self._identity_map.keys()) if key[:2] == namespace}
+        )
+
+    def _synchronize_update(
+        self,
+        orm_model: Type["MongoBaseModel"],
+        idents: Iterable[Any],
+        update_doc: Dict[Text, Any],
+    ) -> None:
+        models = self._identity_models(orm_model)
+        for ident in idents:
+            for model in models:
+                instance = self._get_identity_instance(model, ident)
+                if instance is None:
+                    continue
+                model_update_doc = {
+                    field_name: value
+                    for field_name, value in update_doc.items()
+                    if field_name in model.model_fields
+                }
+                for field_name, value in model_update_doc.items():
+                    instance.__pydantic_validator__.validate_assignment(
+                        instance, field_name, value
+                    )
+                dirty_state = self._update_instances.get(id(instance))
+                if dirty_state is not None:
+                    for field_name in model_update_doc:
+                        if field_name in dirty_state.original_values:
+                            dirty_state.original_values[field_name] = instance.__dict__[
+                                field_name
+                            ]
+
+    def _synchronize_delete(
+        self, orm_model: Type["MongoBaseModel"], idents: Iterable[Any]
+    ) -> None:
+        models = self._identity_models(orm_model)
+        for ident in idents:
+            for model in models:
+                instance = self._identity_map.pop(identity_key(model, ident), None)
+                if instance is None:
+                    continue
+                self._update_instances.pop(id(instance), None)
+                instance._session = None
+
+    def _pending_namespaces(self) -> Set[Namespace]:
+        return {
+            (instance.__databasename__, instance.__tablename__)
+            for instance in itertools.chain(
+                self._add_instances,
+                (
+                    dirty_state.instance
+                    for dirty_state in self._update_instances.values()
+                ),
+                self._delete_instances,
+            )
+        }
+
+    def _invalidate_cache(self, namespaces: Iterable[Namespace]) -> None:
+        if self.query_cache is None:
+            return
+        for namespace in namespaces:
+            self.query_cache.invalidate(namespace)
+
+    def _record_flush(
+        self,
+        flush_events: Optional[Dict[Namespace, ExecutionEvent]],
+        namespace: Namespace,
+        round_trip_time: float,
+        operation_count: int,
+        docs: Iterable[Dict[Text, Any]] = (),
+    ) -> None:
+        if flush_events is None:
+            return
+        event = flush_events.get(namespace)
+        if event is None:
+            event = ExecutionEvent(
+                operation="flush", database=namespace[0], collection=namespace[1]
+            )
+            flush_events[namespace] = event
+        event.round_trip_time += round_trip_time
+        event.doc_count += operation_count
+        event.bytes += sum(len(bson.encode(doc)) for doc in docs)
+
+    def _record_flush_batch(
+        self,
+        flush_events: Optional[Dict[Namespace, ExecutionEvent]],
+        batch: FlushBatch,
+        round_trip_time: float,
+    ) -> None:
+        self._record_flush(
+            flush_events,
+            batch.namespace,
+            round_trip_time,
+            len(batch.requests),
+            batch.requests if batch.kind == "insert" else (),
+        )
+
+    def _flush_events(self) -> Optional[Dict[Namespace, ExecutionEvent]]:
+        return {} if has_listeners(AFTER_FLUSH) else None
+
+    def _dispatch_flush(
+        self, flush_events: Optional[Dict[Namespace, ExecutionEvent]]
+    ) -> None:
+        if flush_events is None:
+            return
+        for event in flush_events.values():
+            dispatch(AFTER_FLUSH, event)
+
+    def _clear_pending(self) -> None:
+        for instance in self._delete_instances:
+            self._identity_map.pop(identity_key(instance.__class__, instance._id), None)
+        self._add_instances = []
+        self._update_instances = {}
+        self._delete_instances = []
+        self._pending_bytes = 0
+
+    def _pending_count(self) -> int:
+        return (
+            len(self._add_instances)
+            + len(self._update_instances)
+            + len(self._delete_instances)
+        )
+
+    def _track_pending_bytes(self, instance: "MongoBaseModel") -> None:
+        if self.autoflush_bytes is not None:
+            self._pending_bytes += len(bson.encode(instance.model_dump()))
+
+    def _track_update_bytes(self, instance: "MongoBaseModel", field_name: Text) -> None:
+        if self.autoflush_bytes is not None:
+            self._pending_bytes += len(
+                bson.encode(instance.model_dump(include={field_name}))
+            )
+
+    def _should_autoflush(self) -> bool:
+        if (
+            self.autoflush_threshold is not None
+            and self._pending_count() >= self.autoflush_threshold
+        ):
+            return True
+        return (
+            self.autoflush_bytes is not None
+            and self._pending_bytes >= self.autoflush_bytes
+        )
+
+    def _next_flush_chunk(self, chunk_size: int) -> List[FlushBatch]:
+        batches: Dict[Namespace, FlushBatch] = {}
+
+        def _append(kind: Text, instance: "MongoBaseModel", item: Any, request: Any):
+            namespace = (instance.__databasename__, instance.__tablename__)
+            batch = batches.get(namespace)
+            if batch is None:
+                batch = FlushBatch(
+                    kind=kind, namespace=namespace, items=[], requests=[]
+                )
+                batches[namespace] = batch
+            batch.items.append(item)
+            batch.requests.append(request)
+
+        while not batches:
+            if self._add_instances:
+                instances = self._add_instances[:chunk_size]
+                del self._add_instances[:chunk_size]
+                for instance in instances:
+                    _append("insert", instance, instance, instance.model_dump())
+            elif self._update_instances:
+                for key in list(itertools.islice(self._update_instances, chunk_size)):
+                    dirty_state = self._update_instances.pop(key)
+                    operation = build_update_operation(dirty_state)
+                    if operation is not None:
+                        _append("update", dirty_state.instance, dirty_state, operation)
+            elif self._delete_instances:
+                instances = self._delete_instances[:chunk_size]
+                del self._delete_instances[:chunk_size]
+                for instance in instances:
+                    operation = build_delete_operation(instance)
+                    if operation is not None:
+                        _append("delete", instance, instance, operation)
+            else:
+                break
+        return list(batches.values())
+
+    def _merge_batches(
+        self,
+        instances: Iterable["MongoBaseModel"],
+        on: Iterable[Union["ModelField", Text]],
+    ) -> List[FlushBatch]:
+        on = list(on)
+        if not on:
+            raise ValueError("Merge keys must not be empty")
+
+        batches: Dict[Namespace, FlushBatch] = {}
+        for instance in instances:
+            if instance.__databasename__ is NOT_SET_SENTINEL:
+                raise ValueError("Database name is not set")
+            if instance.__tablename__ is NOT_SET_SENTINEL:
+                raise ValueError("Table name is not set")
+
+            namespace = (instance.__databasename__, instance.__tablename__)
+            batch = batches.get(namespace)
+            if batch is None:
+                batch = FlushBatch(
+                    kind="merge", namespace=namespace, items=[], requests=[]
+                )
+                batches[namespace] = batch
+            on_fields = [get_field_name(field, instance.__class__) for field in on]
+            batch.items.append(instance)
+            batch.requests.append(build_merge_operation(instance, on_fields))
+        return list(batches.values())
+
+    def _complete_merge_batch(
+        self, batch: FlushBatch, result: BulkWriteResult, merge_result: MergeResult
+    ) -> None:
+        merge_result.inserted_count += result.upserted_count
+        merge_result.matched_count += result.matched_count
+        merge_result.updated_count += result.modified_count
+        for index, upserted_id in result.upserted_ids.items():
+            instance = batch.items[index]
+            instance._id = str(upserted_id)
+            instance._session = self
+            self._register_instance(instance)
+
+    def _iter_commit_inserts(
+        self, add_instances: List["MongoBaseModel"]
+    ) -> Iterator[Tuple[Namespace, List["MongoBaseModel"], List[Dict[Text, Any]]]]:
+        for namespace, instances in group_by_collection(add_instances).items():
+            for batch in iter_batches(instances, self.batch_size):
+                yield namespace, batch, [instance.model_dump() for instance in batch]
+
+    def _iter_commit_operations(
+        self,
+        update_instances: Dict[int, DirtyState],
+        delete_instances: List["MongoBaseModel"],
+    ) -> Iterator[Tuple[Namespace, List[Any]]]:
+        for namespace, operations in itertools.chain(
+            build_update_operations(update_instances.values()).items(),
+            build_delete_operations(delete_instances).items(),
+        ):
+            for batch in iter_batches(operations, self.batch_size):
+                yield namespace, batch
+
+    def _complete_inserts(
+        self, instances: List["MongoBaseModel"], inserted_ids: Iterable[Any]
+    ) -> None:
+        for instance, inserted_id in zip(instances, inserted_ids):
+            instance._id = str(inserted_id)
+            instance._session = self
+            self._register_instance(instance)
+
+    def _complete_flush_batch(self, batch: FlushBatch) -> None:
+        if batch.kind == "insert":
+            self._complete_inserts(batch.items, [doc["_id"] for doc in batch.requests])
+        elif batch.kind == "delete":
+            for instance in batch.items:
+                self._identity_map.pop(
+                    identity_key(instance.__class__, instance._id), None
+                )
+
+    def _requeue_flush_batches(self, batches: List[FlushBatch]) -> None:
+        for batch in reversed(batches):
+            if batch.kind == "insert":
+                self._add_instances[:0] = batch.items
+            elif batch.kind == "update":
+                update_instances = {
+                    id(dirty_state.instance): dirty_state for dirty_state in batch.items
+                }
+                update_instances.update(self._update_instances)
+                self._update_instances = update_instances
+            else:
+                self._delete_instances[:0] = batch.items
+
+    def _fail_flush(
+        self,
+        batches: List[FlushBatch],
+        index: int,
+        error: Exception,
+        flushed: int,
+    ) -> FlushError:
+        batch = batches[index]
+        flushed_indexes = get_flushed_indexes(batch, error, self.ordered)
+        self._complete_flush_batch(batch.subset(flushed_indexes))
+        flushed_index_set = set(flushed_indexes)
+        pending_batch = batch.subset(
+            i for i in range(len(batch)) if i not in flushed_index_set
+        )
+        self._requeue_flush_batches([pending_batch] + batches[index + 1 :])
+
+        failed_batch = pending_batch
+        if isinstance(error, BulkWriteError):
+            failed_batch = batch.subset(
+                sorted(
+                    write_error["index"] for write_error in error.details["writeErrors"]
+                )
+            )
+        flushed += len(flushed_indexes)
+        return FlushError(
+            f"Flush failed after {flushed} operations, "
+            + f"{self._pending_count()} operations are still pending",
+            flushed=flushed,
+            pending=self._pending_count(),
+            failed=failed_batch.instances(),
+        )
 
 
 class Session(Protocol):
     engine: "MongoClient"
     client_session: Optional["ClientSession"]
+    batch_size: int
+    ordered: bool
+    hydration: Hydration
+    query_cache: Optional[QueryCache]
+    autoflush_threshold: Optional[int]
+    autoflush_bytes: Optional[int]
     _add_instances: List["MongoBaseModel"]
-    _update_instances: List[Tuple["MongoBaseModel", Text, Any]]
+    _update_instances: Dict[int, DirtyState]
+    _delete_instances: List["MongoBaseModel"]
+    _identity_map: weakref.WeakValueDictionary
 
     def __init__(self, bind_engine: MongoClient, **kwargs: Any):
         ...
@@ -117,13 +1847,85 @@ class Session(Protocol):
     ) -> QuerySet:
         ...
 
+    def get(
+        self, orm_model: Type["MongoBaseModel"], ident: Any, *args: Any, **kwargs: Any
+    ) -> Optional["MongoBaseModel"]:
+        ...
+
     def add(self, instance: "MongoBaseModel", *args: Any, **kwargs: Any) -> None:
         ...
 
     def delete(self, instance: "MongoBaseModel", *args: Any, **kwargs: Any) -> None:
         ...
 
-    def commit(self, *args: Any, **kwargs: Any) -> None:
+    def flush(self, *args: Any, **kwargs: Any) -> None:
+        ...
+
+    def merge(
+        self,
+        instance: "MongoBaseModel",
+        on: Iterable[Union["ModelField", Text]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> MergeResult:
+        ...
+
+    def merge_all(
+        self,
+        instances: Iterable["MongoBaseModel"],
+        on: Iterable[Union["ModelField", Text]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> MergeResult:
+        ...
+
+    def commit(
+        self, *args: Any, chunk_size: Optional[int] = None, **kwargs: Any
+    ) -> None:
+        ...
+
+    def close(self, *args: Any, **kwargs: Any) -> None:
+        ...
+
+    def _check_scope(self, instance: "MongoBaseModel") -> None:
+        ...
+
+    def _track_update(
+        self, instance: "MongoBaseModel", field_name: Text, original_value: Any
+    ) -> None:
+        ...
+
+    def _load_deferred_fields(self, instance: "MongoBaseModel") -> None:
+        ...
+
+    def _load_relationship(self, instance: "MongoBaseModel", name: Text) -> None:
+        ...
+
+    def _register_instance(self, instance: "MongoBaseModel") -> None:
+        ...
+
+    def _get_identity_instance(
+        self, orm_model: Type["MongoBaseModel"], ident: Any
+    ) -> Optional["MongoBaseModel"]:
+        ...
+
+    def _has_identity_instances(self, orm_model: Type["MongoBaseModel"]) -> bool:
+        ...
+
+    def _synchronize_update(
+        self,
+        orm_model: Type["MongoBaseModel"],
+        idents: Iterable[Any],
+        update_doc: Dict[Text, Any],
+    ) -> None:
+        ...
+
+    def _synchronize_delete(
+        self, orm_model: Type["MongoBaseModel"], idents: Iterable[Any]
+    ) -> None:
+        ...
+
+    def _invalidate_cache(self, namespaces: Iterable[Namespace]) -> None:
         ...
 
     def __enter__(self):
@@ -133,16 +1935,54 @@ class Session(Protocol):
         ...
 
 
-def sessionmaker(bind: "MongoClient") -> Type[Session]:
-    class _Session:
+def sessionmaker(
+    bind: "MongoClient",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    ordered: bool = True,
+    hydration: Hydration = Hydration.VALIDATE,
+    query_cache: Optional[QueryCache] = None,
+    autoflush_threshold: Optional[int] = None,
+    autoflush_bytes: Optional[int] = None,
+) -> Type[Session]:
+    if batch_size <= 0:
+        raise ValueError("Batch size must be positive")
+    if autoflush_threshold is not None and autoflush_threshold <= 0:
+        raise ValueError("Autoflush threshold must be positive")
+    if autoflush_bytes is not None and autoflush_bytes <= 0:
+        raise ValueError("Autoflush bytes must be positive")
+
+    class _Session(BaseSession):
         def __init__(self, *args, **kwargs: Any):
-            self.engine = bind
+            super().__init__(
+                engine=bind,
+                batch_size=batch_size,
+                ordered=ordered,
+                hydration=hydration,
+                query_cache=query_cache,
+                autoflush_threshold=autoflush_threshold,
+                autoflush_bytes=autoflush_bytes,
+            )
 
             self.client_session: Optional["ClientSession"] = None
 
-            self._add_instances: List["MongoBaseModel"] = []
-            self._update_instances: List[Tuple["MongoBaseModel", Text, Any]] = []
-            self._delete_instances: List["MongoBaseModel"] = []
+        def add(self, instance: "MongoBaseModel", *args: Any, **kwargs: Any) -> None:
+            super().add(instance, *args, **kwargs)
+            self._track_pending_bytes(instance)
+            if self._should_autoflush():
+                self.flush()
+
+        def delete(self, instance: "MongoBaseModel", *args: Any, **kwargs: Any) -> None:
+            super().delete(instance, *args, **kwargs)
+            if self._should_autoflush():
+                self.flush()
+
+        def _track_update(
+            self, instance: "MongoBaseModel", field_name: Text, original_value: Any
+        ) -> None:
+            super()._track_update(instance, field_name, original_value)
+            self._track_update_bytes(instance, field_name)
+            if self._should_autoflush():
+                self.flush()
 
         def query(
             self, orm_model: Type["MongoBaseModel"], *args: Any, **kwargs: Any
@@ -151,23 +1991,72 @@ def sessionmaker(bind: "MongoClient") -> Type[Session]:
                 orm_model=orm_model, *args, engine=self.engine, session=self, **kwargs
             )
 
-        def add(self, instance: "MongoBaseModel", *args: Any, **kwargs: Any) -> None:
-            if instance.__databasename__ is NOT_SET_SENTINEL:
-                raise ValueError("Database name is not set")
-            if instance.__tablename__ is NOT_SET_SENTINEL:
-                raise ValueError("Table name is not set")
+        def get(
+            self,
+            orm_model: Type["MongoBaseModel"],
+            ident: Any,
+            *args: Any,
+            **kwargs: Any,
+        ) -> Optional["MongoBaseModel"]:
+            instance = self._get_identity_instance(orm_model, ident)
+            if instance is not None:
+                return instance
 
-            self._add_instances.append(instance)
+            try:
+                return self.query(orm_model).filter_by(_id=ObjectId(ident)).first()
+            except NotFound:
+                return None
 
-        def delete(self, instance: "MongoBaseModel", *args: Any, **kwargs: Any) -> None:
-            if instance.__databasename__ is NOT_SET_SENTINEL:
-                raise ValueError("Database name is not set")
-            if instance.__tablename__ is NOT_SET_SENTINEL:
-                raise ValueError("Table name is not set")
+        def flush(self, *args: Any, **kwargs: Any) -> None:
+            self._flush(self.batch_size)
+
+        def merge(
+            self,
+            instance: "MongoBaseModel",
+            on: Iterable[Union["ModelField", Text]],
+            *args: Any,
+            **kwargs: Any,
+        ) -> MergeResult:
+            return self.merge_all([instance], on)
+
+        def merge_all(
+            self,
+            instances: Iterable["MongoBaseModel"],
+            on: Iterable[Union["ModelField", Text]],
+            *args: Any,
+            **kwargs: Any,
+        ) -> MergeResult:
+            batches = self._merge_batches(instances, on)
+            flush_events = self._flush_events()
+            merge_result = MergeResult()
+            try:
+                for batch in batches:
+                    _col = self.engine[batch.namespace[0]][batch.namespace[1]]
+                    _start = time.perf_counter()
+                    result = _col.bulk_write(
+                        batch.requests,
+                        ordered=self.ordered,
+                        session=self.client_session,
+                    )
+                    self._record_flush(
+                        flush_events,
+                        batch.namespace,
+                        time.perf_counter() - _start,
+                        len(batch.requests),
+                    )
+                    self._complete_merge_batch(batch, result, merge_result)
+            finally:
+                self._invalidate_cache(batch.namespace for batch in batches)
+                self._dispatch_flush(flush_events)
+            return merge_result
 
-            self._delete_instances.append(instance)
+        def commit(
+            self, *args: Any, chunk_size: Optional[int] = None, **kwargs: Any
+        ) -> None:
+            if chunk_size is not None:
+                self._flush(chunk_size)
+                return
 
-        def commit(self, *args: Any, **kwargs: Any) -> None:
             if self.client_session is None:
                 with self:
                     assert (
@@ -179,6 +2068,7 @@ def sessionmaker(bind: "MongoClient") -> Type[Session]:
                             engine=self.engine,
                             add_instances=self._add_instances,
                             update_instances=self._update_instances,
+                            delete_instances=self._delete_instances,
                         )
 
             else:
@@ -188,11 +2078,30 @@ def sessionmaker(bind: "MongoClient") -> Type[Session]:
                         engine=self.engine,
                         add_instances=self._add_instances,
                         update_instances=self._update_instances,
+                        delete_instances=self._delete_instances,
                     )
 
-            self._add_instances = []
-            self._update_instances = []
-            self._delete_instances = []
+            self._invalidate_cache(self._pending_namespaces())
+            self._clear_pending()
+
+        def _load_relationship(self, instance: "MongoBaseModel", name: Text) -> None:
+            self.query(instance.__class__)._load_selectin(name, [instance])
+
+        def _load_deferred_fields(self, instance: "MongoBaseModel") -> None:
+            deferred_fields = get_deferred_fields(instance)
+            if not deferred_fields:
+                return
+
+            _col = self.engine[instance.__databasename__][instance.__tablename__]
+            doc_raw = _col.find_one(
+                {"_id": ObjectId(instance._id)},
+                projection={name: 1 for name in deferred_fields},
+                session=self.client_session,
+            )
+            if doc_raw is None:
+                raise NotFound
+
+            apply_deferred_fields(instance, doc_raw, deferred_fields)
 
         def __enter__(self):
             self.client_session = self.engine.start_session()
@@ -202,33 +2111,74 @@ def sessionmaker(bind: "MongoClient") -> Type[Session]:
             self.client_session.end_session()
             self.client_session = None
 
+        def _flush(self, chunk_size: int) -> None:
+            run = FlushRun(self, chunk_size)
+            try:
+                for batch in run:
+                    try:
+                        self._write_flush_batch(batch, run.flush_events)
+                    except Exception as e:
+                        raise run.fail(e) from e
+            finally:
+                run.close()
+
+        def _write_flush_batch(
+            self,
+            batch: FlushBatch,
+            flush_events: Optional[Dict[Namespace, ExecutionEvent]],
+        ) -> None:
+            _col = self.engine[batch.namespace[0]][batch.namespace[1]]
+            _start = time.perf_counter()
+            if batch.kind == "insert":
+                _col.insert_many(
+                    batch.requests, ordered=self.ordered, session=self.client_session
+                )
+            else:
+                _col.bulk_write(
+                    batch.requests, ordered=self.ordered, session=self.client_session
+                )
+            self._record_flush_batch(flush_events, batch, time.perf_counter() - _start)
+
         def _commit(
             self,
             pymongo_client_session: "ClientSession",
             engine: "MongoClient",
             add_instances: List["MongoBaseModel"],
-            update_instances: List[Tuple["MongoBaseModel", Text, Any]],
+            update_instances: Dict[int, DirtyState],
+            delete_instances: List["MongoBaseModel"],
         ) -> None:
-            for _add_instance in add_instances:
-                _db = engine[_add_instance.__databasename__]
-                _col = _db[_add_instance.__tablename__]
-                _insert_one_result = _col.insert_one(
-                    _add_instance.model_dump(), session=pymongo_client_session
+            flush_events = self._flush_events()
+
+            for _namespace, _batch, _docs in self._iter_commit_inserts(add_instances):
+                _col = engine[_namespace[0]][_namespace[1]]
+                _start = time.perf_counter()
+                _insert_many_result = _col.insert_many(
+                    _docs, ordered=self.ordered, session=pymongo_client_session
+                )
+                self._record_flush(
+                    flush_events,
+                    _namespace,
+                    time.perf_counter() - _start,
+                    len(_docs),
+                    _docs,
+                )
+                self._complete_inserts(_batch, _insert_many_result.inserted_ids)
+
+            for _namespace, _batch in self._iter_commit_operations(
+                update_instances, delete_instances
+            ):
+                _col = engine[_namespace[0]][_namespace[1]]
+                _start = time.perf_counter()
+                _col.bulk_write(
+                    _batch, ordered=self.ordered, session=pymongo_client_session
                 )
-                _add_instance._id = str(_insert_one_result.inserted_id)
-                _add_instance._session = self
-
-            for _update_instance in self._update_instances:
-                _instance, _field_to_update, _new_value = _update_instance
-                _db = engine[_instance.__databasename__]
-                _col = _db[_instance.__tablename__]
-                _col.update_one(
-                    {"_id": _instance._id}, {"$set": {_field_to_update: _new_value}}
+                self._record_flush(
+                    flush_events,
+                    _namespace,
+                    time.perf_counter() - _start,
+                    len(_batch),
                 )
 
-            for _delete_instance in self._delete_instances:
-                _db = engine[_delete_instance.__databasename__]
-                _col = _db[_delete_instance.__tablename__]
-                _col.delete_one({"_id": ObjectId(_delete_instance._id)})
+            self._dispatch_flush(flush_events)
 
     return _Session
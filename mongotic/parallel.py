@@ -0,0 +1,67 @@
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Iterable, Iterator, List, Text
+
+_PARTITION_DONE = object()
+
+
+class PartitionError(object):
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def build_partition_bounds(buckets: List[Any]) -> List[Any]:
+    return [bucket["_id"]["min"] for bucket in buckets]
+
+
+def iter_parallel(
+    partitions: List[Iterable[Any]],
+    workers: int,
+    prefetch: int,
+    thread_name_prefix: Text = "mongotic-scan",
+) -> Iterator[Any]:
+    results: "queue.Queue[Any]" = queue.Queue(maxsize=prefetch)
+    stopped = threading.Event()
+
+    def _put(item: Any) -> bool:
+        while not stopped.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _consume(partition: Iterable[Any]) -> None:
+        try:
+            for item in partition:
+                if not _put(item):
+                    return
+        except BaseException as e:
+            _put(PartitionError(e))
+        finally:
+            _put(_PARTITION_DONE)
+
+    executor = ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix=thread_name_prefix
+    )
+    futures: List[Future] = []
+    try:
+        for partition in partitions:
+            futures.append(executor.submit(_consume, partition))
+
+        remaining = len(futures)
+        while remaining:
+            item = results.get()
+            if item is _PARTITION_DONE:
+                remaining -= 1
+            elif isinstance(item, PartitionError):
+                raise item.error
+            else:
+                yield item
+    finally:
+        stopped.set()
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
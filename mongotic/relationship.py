@@ -0,0 +1,155 @@
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Text, Type, Union
+
+from bson.objectid import ObjectId
+
+if TYPE_CHECKING:
+    from mongotic.model import MongoBaseModel
+
+SELECTIN = "selectin"
+JOINED = "joined"
+LOADING_STRATEGIES = (SELECTIN, JOINED)
+
+JOINED_FIELD_PREFIX = "__mongotic_joined_"
+
+
+class Relationship(object):
+    def __init__(
+        self,
+        target: Union[Type["MongoBaseModel"], Callable[[], Type["MongoBaseModel"]]],
+        local_field: Text,
+        remote_field: Text = "_id",
+        many: bool = False,
+    ):
+        self.target = target
+        self.local_field = local_field
+        self.remote_field = remote_field
+        self.many = many
+
+    def __repr__(self) -> Text:
+        return (
+            f"<Relationship(Target={self.target_model.__name__}, "
+            + f"Local={self.local_field}, Remote={self.remote_field}, "
+            + f"Many={self.many})>"
+        )
+
+    @property
+    def target_model(self) -> Type["MongoBaseModel"]:
+        if isinstance(self.target, type):
+            return self.target
+        return self.target()
+
+    def local_key(self, instance: "MongoBaseModel") -> Any:
+        return get_instance_key(instance, self.local_field)
+
+    def remote_key(self, instance: "MongoBaseModel") -> Any:
+        return get_instance_key(instance, self.remote_field)
+
+    def query_values(self, keys: List[Any]) -> List[Any]:
+        if self.remote_field != "_id":
+            return keys
+        return [ObjectId(key) if ObjectId.is_valid(key) else key for key in keys]
+
+    def build_value(self, related: List["MongoBaseModel"]) -> Any:
+        if self.many:
+            return related
+        return related[0] if related else None
+
+    def lookup_stages(
+        self, name: Text, model_class: Type["MongoBaseModel"]
+    ) -> List[Dict[Text, Any]]:
+        target_model = self.target_model
+        if target_model.__databasename__ != model_class.__databasename__:
+            raise ValueError(
+                f"Relationship '{name}' spans databases and cannot be joined, "
+                + "use selectinload instead"
+            )
+
+        key_field = f"{JOINED_FIELD_PREFIX}{name}_key"
+        stages: List[Dict[Text, Any]] = []
+        local_field = self.local_field
+        if self.remote_field == "_id" and self.local_field != "_id":
+            stages.append(
+                {
+                    "$addFields": {
+                        key_field: {
+                            "$convert": {
+                                "input": f"${local_field}",
+                                "to": "objectId",
+                                "onError": None,
+                                "onNull": None,
+                            }
+                        }
+                    }
+                }
+            )
+            local_field = key_field
+        elif self.local_field == "_id" and self.remote_field != "_id":
+            stages.append({"$addFields": {key_field: {"$toString": "$_id"}}})
+            local_field = key_field
+
+        stages.append(
+            {
+                "$lookup": {
+                    "from": target_model.__tablename__,
+                    "localField": local_field,
+                    "foreignField": self.remote_field,
+                    "as": get_joined_field(name),
+                }
+            }
+        )
+        if local_field == key_field:
+            stages.append({"$project": {key_field: 0}})
+        return stages
+
+
+def get_joined_field(name: Text) -> Text:
+    return f"{JOINED_FIELD_PREFIX}{name}"
+
+
+def normalize_key(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    return value
+
+
+def get_instance_key(instance: "MongoBaseModel", field_name: Text) -> Any:
+    if field_name == "_id":
+        return instance._id
+    return normalize_key(getattr(instance, field_name))
+
+
+def get_relationship(model_class: Type["MongoBaseModel"], name: Text) -> Relationship:
+    relationship = model_class.__relationships__.get(name)
+    if relationship is None:
+        raise ValueError(
+            f"Relationship '{name}' is not defined in {model_class.__name__}"
+        )
+    return relationship
+
+
+def group_related(
+    relationship: Relationship, related: List["MongoBaseModel"]
+) -> Dict[Any, List["MongoBaseModel"]]:
+    groups: Dict[Any, List["MongoBaseModel"]] = {}
+    for instance in related:
+        groups.setdefault(relationship.remote_key(instance), []).append(instance)
+    return groups
+
+
+def collect_keys(
+    relationship: Relationship, instances: List["MongoBaseModel"]
+) -> List[Any]:
+    keys: Dict[Any, None] = {}
+    for instance in instances:
+        key = relationship.local_key(instance)
+        if key is not None:
+            keys[key] = None
+    return list(keys)
+
+
+def set_related(instance: "MongoBaseModel", name: Text, value: Any) -> None:
+    related = instance._related
+    if related is None:
+        related = {}
+        instance._related = related
+    related[name] = value
@@ -0,0 +1,95 @@
+import contextvars
+import threading
+from typing import Any, Callable, List, Optional, Text
+
+from mongotic.events import logger
+
+SCOPE_THREAD = "thread"
+SCOPE_CONTEXT = "context"
+SCOPES = (SCOPE_THREAD, SCOPE_CONTEXT)
+
+SessionFactory = Callable[[], Any]
+RemoveHook = Callable[[Any], None]
+
+
+class ThreadLocalRegistry(object):
+    def __init__(self):
+        self._local = threading.local()
+
+    def get(self) -> Optional[Any]:
+        return getattr(self._local, "session", None)
+
+    def set(self, session: Optional[Any]) -> None:
+        self._local.session = session
+
+
+class ContextVarRegistry(object):
+    def __init__(self, name: Text):
+        self._var: "contextvars.ContextVar[Optional[Any]]" = contextvars.ContextVar(
+            name, default=None
+        )
+
+    def get(self) -> Optional[Any]:
+        return self._var.get()
+
+    def set(self, session: Optional[Any]) -> None:
+        self._var.set(session)
+
+
+class ScopedSession(object):
+    def __init__(self, session_factory: SessionFactory, scope: Text = SCOPE_THREAD):
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown scope '{scope}', expected one of {SCOPES}")
+        self.session_factory = session_factory
+        self.scope = scope
+        self.registry = (
+            ThreadLocalRegistry()
+            if scope == SCOPE_THREAD
+            else ContextVarRegistry(f"mongotic_scoped_session_{id(self)}")
+        )
+        self._remove_hooks: List[RemoveHook] = []
+
+    def __repr__(self) -> Text:
+        return f"<ScopedSession(Scope={self.scope}, Active={self.has()})>"
+
+    def __call__(self) -> Any:
+        session = self.registry.get()
+        if session is None:
+            session = self.session_factory()
+            session._scope = self
+            self.registry.set(session)
+        return session
+
+    def __getattr__(self, name: Text) -> Any:
+        return getattr(self(), name)
+
+    def has(self) -> bool:
+        return self.registry.get() is not None
+
+    def owns(self, session: Any) -> bool:
+        return self.registry.get() is session
+
+    def on_remove(self, hook: RemoveHook) -> RemoveHook:
+        self._remove_hooks.append(hook)
+        return hook
+
+    def remove(self) -> None:
+        session = self.registry.get()
+        if session is None:
+            return
+        self.registry.set(None)
+        try:
+            for hook in self._remove_hooks:
+                try:
+                    hook(session)
+                except Exception:
+                    logger.exception("Scoped session remove hook failed")
+        finally:
+            session.close()
+            session._scope = None
+
+
+def scoped_session(
+    session_factory: SessionFactory, scope: Text = SCOPE_THREAD
+) -> ScopedSession:
+    return ScopedSession(session_factory, scope=scope)
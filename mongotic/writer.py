@@ -0,0 +1,329 @@
+import atexit
+import queue
+import threading
+import time
+import weakref
+from collections import deque
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Text,
+    Union,
+)
+
+from pymongo.errors import BulkWriteError
+
+from mongotic.events import (
+    AFTER_FLUSH,
+    ExecutionEvent,
+    dispatch,
+    has_listeners,
+    logger,
+    percentile,
+)
+from mongotic.model import NOT_SET_SENTINEL
+from mongotic.orm import group_by_collection
+
+if TYPE_CHECKING:
+    from pymongo import MongoClient
+
+    from mongotic.model import MongoBaseModel
+
+_WRITER_STOP = object()
+_PUT_POLL_INTERVAL = 0.1
+
+_live_writers: "weakref.WeakSet[WriteBehindWriter]" = weakref.WeakSet()
+
+
+def close_writers() -> None:
+    for writer in list(_live_writers):
+        writer.close()
+
+
+atexit.register(close_writers)
+
+
+class FlushRequest(object):
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class WriterError(object):
+    def __init__(self, error: Exception, failed: List["MongoBaseModel"]):
+        self.error = error
+        self.failed = failed
+
+    def __repr__(self) -> Text:
+        return (
+            f"<WriterError(Error={self.error.__class__.__name__}, "
+            + f"Failed={len(self.failed)})>"
+        )
+
+
+class WriteBehindWriter(object):
+    def __init__(
+        self,
+        engine: "MongoClient",
+        batch_size: int = 1000,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 10000,
+        ordered: bool = False,
+        on_error: Optional[Callable[[WriterError], None]] = None,
+        max_samples: int = 1000,
+    ):
+        if batch_size <= 0:
+            raise ValueError("Batch size must be positive")
+        if flush_interval <= 0:
+            raise ValueError("Flush interval must be positive")
+        if max_queue_size <= 0:
+            raise ValueError("Max queue size must be positive")
+        if max_samples <= 0:
+            raise ValueError("Max samples must be positive")
+
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue_size = max_queue_size
+        self.ordered = ordered
+        self.on_error = on_error
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue_size)
+        self._lock = threading.Lock()
+        self._put_lock = threading.Lock()
+        self._closed = False
+        self._enqueued = 0
+        self._written = 0
+        self._failed = 0
+        self._batches = 0
+        self._flush_times: Deque[float] = deque(maxlen=max_samples)
+        self._thread = threading.Thread(
+            target=self._run, name="mongotic-write-behind", daemon=True
+        )
+        self._thread.start()
+        _live_writers.add(self)
+
+    def __repr__(self) -> Text:
+        return (
+            f"<WriteBehindWriter(Queued={self._queue.qsize()}, "
+            + f"Written={self._written}, Failed={self._failed})>"
+        )
+
+    def __enter__(self) -> "WriteBehindWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def add(
+        self,
+        instance: "MongoBaseModel",
+        block: bool = True,
+        timeout: Optional[float] = None,
+    ) -> None:
+        if instance.__databasename__ is NOT_SET_SENTINEL:
+            raise ValueError("Database name is not set")
+        if instance.__tablename__ is NOT_SET_SENTINEL:
+            raise ValueError("Table name is not set")
+        with self._put_lock:
+            if self._closed:
+                raise ValueError("Writer is closed")
+            self._put(instance, block=block, timeout=timeout)
+        with self._lock:
+            self._enqueued += 1
+
+    def add_all(
+        self,
+        instances: Iterable["MongoBaseModel"],
+        block: bool = True,
+        timeout: Optional[float] = None,
+    ) -> None:
+        for instance in instances:
+            self.add(instance, block=block, timeout=timeout)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        request = FlushRequest()
+        with self._put_lock:
+            if self._closed:
+                raise ValueError("Writer is closed")
+            self._put(request)
+        while not request.done.wait(_PUT_POLL_INTERVAL):
+            self._check_thread()
+            if timeout is not None:
+                timeout -= _PUT_POLL_INTERVAL
+                if timeout <= 0:
+                    return False
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        with self._put_lock:
+            if self._closed:
+                return
+            self._closed = True
+            _live_writers.discard(self)
+            try:
+                self._put(_WRITER_STOP)
+            except RuntimeError:
+                return
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[Text, Union[int, float]]:
+        with self._lock:
+            flush_times = sorted(self._flush_times)
+            return {
+                "queue_depth": self._queue.qsize(),
+                "enqueued": self._enqueued,
+                "written": self._written,
+                "failed": self._failed,
+                "batches": self._batches,
+                "flush_p50": percentile(flush_times, 50) if flush_times else 0.0,
+                "flush_p95": percentile(flush_times, 95) if flush_times else 0.0,
+                "flush_max": flush_times[-1] if flush_times else 0.0,
+            }
+
+    def _check_thread(self) -> None:
+        if not self._thread.is_alive():
+            raise RuntimeError("Write-behind thread is not running")
+
+    def _put(
+        self, item: Any, block: bool = True, timeout: Optional[float] = None
+    ) -> None:
+        # Poll instead of blocking forever, so a dead worker surfaces as an
+        # error rather than a hang on a full queue.
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            self._check_thread()
+            try:
+                self._queue.put(item, block=False)
+                return
+            except queue.Full:
+                if not block:
+                    raise
+            wait = _PUT_POLL_INTERVAL
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    raise queue.Full
+            try:
+                self._queue.put(item, timeout=wait)
+                return
+            except queue.Full:
+                continue
+
+    def _run(self) -> None:
+        buffer: List["MongoBaseModel"] = []
+        deadline = 0.0
+        while True:
+            try:
+                if buffer:
+                    item = self._queue.get(
+                        timeout=max(deadline - time.monotonic(), 0.0)
+                    )
+                else:
+                    item = self._queue.get()
+            except queue.Empty:
+                item = None
+
+            if item is _WRITER_STOP or isinstance(item, FlushRequest):
+                self._write(buffer)
+                buffer = []
+                if item is _WRITER_STOP:
+                    return
+                item.done.set()
+                continue
+
+            if item is not None:
+                if not buffer:
+                    deadline = time.monotonic() + self.flush_interval
+                buffer.append(item)
+            if item is None or len(buffer) >= self.batch_size:
+                self._write(buffer)
+                buffer = []
+
+    def _write(self, instances: List["MongoBaseModel"]) -> None:
+        for namespace, _instances in group_by_collection(instances).items():
+            try:
+                self._write_batch(namespace[0], namespace[1], _instances)
+            except Exception:
+                logger.exception(
+                    f"Write-behind flush into {namespace[0]}.{namespace[1]} failed"
+                )
+
+    def _write_batch(
+        self, db_name: Text, col_name: Text, instances: List["MongoBaseModel"]
+    ) -> None:
+        start = time.perf_counter()
+        docs: List[Dict[Text, Any]] = []
+        written_indexes: List[int] = []
+        error: Optional[Exception] = None
+        try:
+            docs = [instance.model_dump() for instance in instances]
+            self.engine[db_name][col_name].insert_many(docs, ordered=self.ordered)
+            written_indexes = list(range(len(docs)))
+        except Exception as e:
+            error = e
+            if isinstance(e, BulkWriteError):
+                failed_indexes = sorted(
+                    write_error["index"] for write_error in e.details["writeErrors"]
+                )
+                if self.ordered:
+                    written_indexes = list(
+                        range(min(failed_indexes, default=len(docs)))
+                    )
+                else:
+                    failed_index_set = set(failed_indexes)
+                    written_indexes = [
+                        i for i in range(len(docs)) if i not in failed_index_set
+                    ]
+        elapsed = time.perf_counter() - start
+
+        for i in written_indexes:
+            _id = docs[i].get("_id")
+            if _id is not None:
+                instances[i]._id = str(_id)
+
+        failed = len(instances) - len(written_indexes)
+        with self._lock:
+            self._written += len(written_indexes)
+            self._failed += failed
+            self._batches += 1
+            self._flush_times.append(elapsed)
+
+        if has_listeners(AFTER_FLUSH):
+            event = ExecutionEvent(
+                operation="flush", database=db_name, collection=col_name
+            )
+            event.round_trip_time = elapsed
+            event.record_documents(docs[i] for i in written_indexes)
+            dispatch(AFTER_FLUSH, event)
+
+        if error is None:
+            return
+        written_index_set = set(written_indexes)
+        writer_error = WriterError(
+            error,
+            [
+                instance
+                for i, instance in enumerate(instances)
+                if i not in written_index_set
+            ],
+        )
+        if self.on_error is not None:
+            try:
+                self.on_error(writer_error)
+                return
+            except Exception:
+                logger.exception("Write-behind error handler failed")
+        logger.error(
+            f"Write-behind insert into {db_name}.{col_name} failed, "
+            + f"{failed} of {len(instances)} documents were not written: {error}"
+        )
@@ -0,0 +1,306 @@
+import asyncio
+import contextlib
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Text
+
+import pytest
+from pyassorted.datetime import aware_datetime_now
+from pyassorted.string import rand_str
+from pydantic import Field
+
+from mongotic.aggregate import func
+from mongotic.asyncio import async_sessionmaker
+from mongotic.exceptions import DeferredFieldError, NotFound
+from mongotic.model import MongoBaseModel
+from mongotic.relationship import Relationship
+
+pytest.importorskip("motor")
+mongomock = pytest.importorskip("mongomock")
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+test_company = f"test_{rand_str(10)}"
+test_count = 20
+
+mongomock.ignore_feature("session")
+
+
+class User(MongoBaseModel):
+    __databasename__ = "test"
+    __tablename__ = "user"
+
+    name: Text = Field(..., max_length=50)
+    email: Text = Field(...)
+    company: Optional[Text] = Field(None, max_length=50)
+    age: Optional[int] = Field(None, ge=0, le=200)
+    created_at: Optional[datetime] = Field(..., default_factory=aware_datetime_now)
+    updated_at: Optional[datetime] = Field(..., default_factory=aware_datetime_now)
+
+
+class Order(MongoBaseModel):
+    __databasename__ = "test"
+    __tablename__ = "order"
+    __relationships__ = {"user": Relationship(User, local_field="user_id")}
+
+    user_id: Text = Field(...)
+    company: Optional[Text] = Field(None, max_length=50)
+    amount: int = Field(..., ge=0)
+
+
+class AsyncMockClientSession(object):
+    def __init__(self):
+        self.in_transaction = False
+
+    @contextlib.asynccontextmanager
+    async def start_transaction(self) -> AsyncIterator["AsyncMockClientSession"]:
+        self.in_transaction = True
+        try:
+            yield self
+        finally:
+            self.in_transaction = False
+
+    async def end_session(self) -> None:
+        pass
+
+
+class AsyncMockEngine(mongomock_motor.AsyncMongoMockClient):
+    async def start_session(self) -> AsyncMockClientSession:
+        return AsyncMockClientSession()
+
+
+@pytest.fixture
+def async_engine() -> AsyncMockEngine:
+    return AsyncMockEngine()
+
+
+async def _add_users(engine: AsyncMockEngine) -> List[User]:
+    session = async_sessionmaker(bind=engine)()
+    users = [
+        User(
+            name=f"user_{i}",
+            email=f"user_{i}@example.com",
+            company=test_company,
+            age=i,
+        )
+        for i in range(test_count)
+    ]
+    for user in users:
+        session.add(user)
+    await session.commit()
+    return users
+
+
+async def _async_add_and_commit(engine: AsyncMockEngine):
+    session = async_sessionmaker(bind=engine)()
+    for i in range(test_count):
+        session.add(
+            User(
+                name=f"user_{i}",
+                email=f"user_{i}@example.com",
+                company=test_company,
+                age=i,
+            )
+        )
+    await session.flush()
+    await session.commit()
+
+    user = await session.query(User).filter(User.company == test_company).first()
+    assert user._id is not None
+    assert user._session is session
+    assert await session.get(User, user._id) is user
+    assert await session.query(User).count() == test_count
+
+
+def test_async_add_and_commit(async_engine: AsyncMockEngine):
+    asyncio.run(_async_add_and_commit(async_engine))
+
+
+async def _async_query(engine: AsyncMockEngine):
+    await _add_users(engine)
+    session = async_sessionmaker(bind=engine)()
+
+    users = await session.query(User).filter(User.company == test_company).all()
+    assert len(users) == 5
+
+    users = [
+        user
+        async for user in session.query(User)
+        .filter(User.company == test_company)
+        .limit(0)
+        .yield_per(8)
+    ]
+    assert len(users) == test_count
+
+    query = session.query(User).filter(User.company == test_company)
+    assert await query.count() == test_count
+    assert await query.exists()
+    assert not await session.query(User).filter(User.company == "missing").exists()
+    with pytest.raises(NotFound):
+        await session.query(User).filter(User.company == "missing").first()
+
+
+def test_async_query(async_engine: AsyncMockEngine):
+    asyncio.run(_async_query(async_engine))
+
+
+async def _async_group_by(engine: AsyncMockEngine):
+    await _add_users(engine)
+    session = async_sessionmaker(bind=engine)()
+
+    rows = (
+        await session.query(User)
+        .filter(User.company == test_company)
+        .group_by(User.company)
+        .agg(max_age=func.max(User.age))
+    )
+    assert rows == [{"company": test_company, "max_age": test_count - 1}]
+
+
+def test_async_group_by(async_engine: AsyncMockEngine):
+    asyncio.run(_async_group_by(async_engine))
+
+
+async def _async_deferred_fields(engine: AsyncMockEngine):
+    await _add_users(engine)
+    session = async_sessionmaker(bind=engine)()
+
+    user = (
+        await session.query(User)
+        .filter(User.company == test_company, User.age == 3)
+        .load_only(User.name)
+        .first()
+    )
+    with pytest.raises(DeferredFieldError):
+        user.email
+    await session.load_deferred_fields(user)
+    assert user.email == "user_3@example.com"
+
+
+def test_async_deferred_fields(async_engine: AsyncMockEngine):
+    asyncio.run(_async_deferred_fields(async_engine))
+
+
+async def _async_update(engine: AsyncMockEngine):
+    await _add_users(engine)
+    AsyncSession = async_sessionmaker(bind=engine)
+    session = AsyncSession()
+
+    user = (
+        await session.query(User)
+        .filter(User.company == test_company, User.age == 3)
+        .first()
+    )
+    user.age = 100
+    await session.commit()
+    user = (
+        await AsyncSession()
+        .query(User)
+        .filter(User.company == test_company, User.age == 100)
+        .first()
+    )
+    assert user.name == "user_3"
+
+    result = (
+        await user._session.query(User)
+        .filter(User.company == test_company, User.age == 100)
+        .update({User.name: "renamed"})
+    )
+    assert result.modified_count == 1
+    assert user.name == "renamed"
+
+
+def test_async_update(async_engine: AsyncMockEngine):
+    asyncio.run(_async_update(async_engine))
+
+
+async def _async_relationships(engine: AsyncMockEngine):
+    users = await _add_users(engine)
+    AsyncSession = async_sessionmaker(bind=engine)
+    session = AsyncSession()
+
+    for user in users[:3]:
+        session.add(Order(user_id=user._id, company=test_company, amount=1))
+    await session.commit()
+
+    orders = (
+        await AsyncSession()
+        .query(Order)
+        .filter(Order.company == test_company)
+        .selectinload("user")
+        .all()
+    )
+    assert len(orders) == 3
+    assert all(order.user._id == order.user_id for order in orders)
+
+    order = await session.query(Order).filter(Order.company == test_company).first()
+    with pytest.raises(DeferredFieldError):
+        order.user
+    assert (await session.load_relationship(order, "user"))._id == order.user_id
+    assert order.user._id == order.user_id
+
+
+def test_async_relationships(async_engine: AsyncMockEngine):
+    asyncio.run(_async_relationships(async_engine))
+
+
+async def _async_delete(engine: AsyncMockEngine):
+    users = await _add_users(engine)
+    session = async_sessionmaker(bind=engine)()
+
+    for user in users:
+        session.delete(user)
+    await session.commit(chunk_size=7)
+
+    with pytest.raises(NotFound):
+        await session.query(User).filter(User.company == test_company).first()
+
+
+def test_async_delete(async_engine: AsyncMockEngine):
+    asyncio.run(_async_delete(async_engine))
+
+
+async def _async_export(engine: AsyncMockEngine):
+    await _add_users(engine)
+    session = async_sessionmaker(bind=engine)()
+
+    fileobj = io.StringIO()
+    result = (
+        await session.query(User)
+        .filter(User.company == test_company)
+        .export(fileobj, fields=[User.name, User.age], chunk_size=8)
+    )
+    assert result.rows == test_count
+    rows = [json.loads(line) for line in fileobj.getvalue().splitlines()]
+    assert sorted(row["age"] for row in rows) == list(range(test_count))
+    assert set(rows[0]) == {"name", "age"}
+
+
+def test_async_export(async_engine: AsyncMockEngine):
+    asyncio.run(_async_export(async_engine))
+
+
+async def _async_merge(engine: AsyncMockEngine):
+    session = async_sessionmaker(bind=engine)()
+
+    users = [
+        User(name=f"merge_{i}", email=f"merge_{i}@example.com", company=test_company)
+        for i in range(3)
+    ]
+    result = await session.merge_all(users[:2], on=[User.email])
+    assert result.inserted_count == 2
+    assert all(user._id is not None for user in users[:2])
+
+    users[0].age = 30
+    result = await session.merge_all(users, on=[User.email])
+    assert result.inserted_count == 1
+    assert result.matched_count == 2
+    assert result.updated_count == 1
+    result = await session.merge(users[2], on=[User.email])
+    assert result.matched_count == 1
+
+    assert await session.query(User).filter(User.company == test_company).count() == 3
+
+
+def test_async_merge(async_engine: AsyncMockEngine):
+    asyncio.run(_async_merge(async_engine))
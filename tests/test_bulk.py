@@ -0,0 +1,127 @@
+import io
+import json
+import time
+from datetime import datetime
+from typing import List, Optional, Text
+
+import pytest
+from bson.objectid import ObjectId
+from pyassorted.datetime import aware_datetime_now
+from pyassorted.string import rand_str
+from pydantic import Field
+from pymongo import MongoClient
+
+from mongotic.bulk import bulk_load
+from mongotic.model import MongoBaseModel
+from mongotic.orm import sessionmaker
+
+test_company = f"test_{rand_str(10)}"
+test_count = 2000
+
+
+class User(MongoBaseModel):
+    __databasename__ = "test"
+    __tablename__ = "user"
+
+    name: Text = Field(..., max_length=50)
+    email: Text = Field(...)
+    company: Optional[Text] = Field(None, max_length=50)
+    age: Optional[int] = Field(None, ge=0, le=200)
+    created_at: Optional[datetime] = Field(..., default_factory=aware_datetime_now)
+    updated_at: Optional[datetime] = Field(..., default_factory=aware_datetime_now)
+
+
+def build_rows(count: int) -> List[dict]:
+    return [
+        {
+            "name": f"user_{i}",
+            "email": f"user_{i}@example.com",
+            "company": test_company,
+            "age": i % 100,
+        }
+        for i in range(count)
+    ]
+
+
+def test_bulk_load_ndjson(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    duplicate_id = ObjectId()
+    rows = build_rows(10)
+    rows[2]["age"] = 500
+    rows[4]["_id"] = str(duplicate_id)
+    rows[7]["_id"] = str(duplicate_id)
+    lines = [json.dumps(row) for row in rows]
+    lines.insert(5, "{not json")
+    lines.insert(6, "")
+
+    progress: List[int] = []
+    result = bulk_load(
+        mongo_engine,
+        User,
+        io.StringIO("\n".join(lines)),
+        batch_size=3,
+        workers=2,
+        progress=lambda result: progress.append(result.inserted),
+    )
+    assert result.inserted == 8
+    assert [error.row for error in result.errors] == [3, 6, 10]
+    assert result.errors[0].message.startswith("age:")
+    assert result.rows == 11
+    assert progress[-1] == 8
+
+    user = session.get(User, str(duplicate_id))
+    assert user is not None
+    assert user.name == "user_4"
+    assert session.query(User).filter(User.company == test_company).count() == 8
+
+    with pytest.raises(ValueError):
+        bulk_load(mongo_engine, User, [], format="xml")
+    with pytest.raises(ValueError):
+        bulk_load(mongo_engine, User, [], workers=0)
+
+
+def test_bulk_load_csv(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    fileobj = io.StringIO(
+        "name,email,company,age\n"
+        + f"csv_0,csv_0@example.com,{test_company},20\n"
+        + f"csv_1,csv_1@example.com,{test_company},\n"
+        + f"csv_2,csv_2@example.com,{test_company},abc\n"
+    )
+    result = bulk_load(mongo_engine, User, fileobj, format="csv")
+    assert result.inserted == 2
+    assert [error.row for error in result.errors] == [4]
+
+    user = session.query(User).filter_by(name="csv_1").first()
+    assert user.age is None
+    assert user.company == test_company
+
+
+def test_bulk_load_throughput(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    start = time.perf_counter()
+    for row in build_rows(test_count):
+        session.add(User(**row))
+    session.commit()
+    session_elapsed = time.perf_counter() - start
+
+    result = bulk_load(mongo_engine, User, build_rows(test_count), workers=4)
+    assert result.inserted == test_count
+    assert not result.errors
+    print(
+        f"Session add/commit: {test_count / session_elapsed:.0f} rows/s, "
+        + f"bulk_load: {result.rows_per_second:.0f} rows/s"
+    )
+
+
+def test_clean_documents(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    session.query(User).filter(User.company == test_company).delete()
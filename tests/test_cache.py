@@ -0,0 +1,102 @@
+import time
+from datetime import datetime
+from typing import Optional, Text
+
+import pytest
+from pyassorted.datetime import aware_datetime_now
+from pyassorted.string import rand_str
+from pydantic import Field
+from pymongo import MongoClient
+
+from mongotic.cache import LRUQueryCache, QueryCache
+from mongotic.model import MongoBaseModel
+from mongotic.orm import sessionmaker
+
+test_company = f"test_{rand_str(10)}"
+
+
+class User(MongoBaseModel):
+    __databasename__ = "test"
+    __tablename__ = "user"
+
+    name: Text = Field(..., max_length=50)
+    email: Text = Field(...)
+    company: Optional[Text] = Field(None, max_length=50)
+    age: Optional[int] = Field(None, ge=0, le=200)
+    created_at: Optional[datetime] = Field(..., default_factory=aware_datetime_now)
+    updated_at: Optional[datetime] = Field(..., default_factory=aware_datetime_now)
+
+
+def test_lru_query_cache_eviction():
+    namespace = ("test", "user")
+    cache = LRUQueryCache(maxsize=2)
+    cache.set(("a",), namespace, [{"value": 1}])
+    cache.set(("b",), namespace, [{"value": 2}])
+    assert cache.get(("a",)) == [{"value": 1}]
+    cache.set(("c",), namespace, [{"value": 3}])
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) == [{"value": 1}]
+    assert cache.stats()["evictions"] == 1
+
+    cache = LRUQueryCache(ttl=0.01)
+    cache.set(("a",), namespace, [{"value": 1}])
+    time.sleep(0.02)
+    assert cache.get(("a",)) is None
+
+    cache = LRUQueryCache(max_bytes=64)
+    cache.set(("a",), namespace, [{"value": "x" * 100}])
+    assert cache.get(("a",)) is None
+    assert cache.stats()["bytes"] == 0
+
+    cache = LRUQueryCache()
+    cache.set(("a",), namespace, [{"value": 1}])
+    cache.set(("b",), ("test", "other"), [{"value": 2}])
+    cache.invalidate(namespace)
+    assert cache.get(("a",)) is None
+    assert cache.get(("b",)) == [{"value": 2}]
+
+    with pytest.raises(TypeError):
+        QueryCache()
+
+
+def test_query_cache_invalidation(mongo_engine: "MongoClient"):
+    cache = LRUQueryCache(maxsize=16, ttl=60)
+    Session = sessionmaker(bind=mongo_engine, query_cache=cache)
+
+    session = Session()
+    session.add(
+        User(name="John Doe", email="johndoe@example.com", company=test_company)
+    )
+    session.commit()
+
+    users = Session().query(User).filter(User.company == test_company).all()
+    assert len(users) == 1
+    assert cache.stats()["misses"] == 1
+
+    users = Session().query(User).filter(User.company == test_company).all()
+    assert len(users) == 1
+    assert cache.stats()["hits"] == 1
+
+    users = (
+        Session().query(User).filter(User.company == test_company).cache(False).all()
+    )
+    assert len(users) == 1
+    assert cache.stats()["hits"] == 1
+
+    session = Session()
+    session.add(
+        User(name="Jane Doe", email="janedoe@example.com", company=test_company)
+    )
+    session.commit()
+    assert cache.stats()["invalidations"] == 1
+
+    users = Session().query(User).filter(User.company == test_company).all()
+    assert len(users) == 2
+
+    session = Session()
+    for user in session.query(User).filter(User.company == test_company).all():
+        session.delete(user)
+    session.commit()
+
+    users = Session().query(User).filter(User.company == test_company).all()
+    assert len(users) == 0
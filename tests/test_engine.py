@@ -0,0 +1,104 @@
+import datetime
+
+import pytest
+from pymongo import monitoring
+
+from mongotic import engine as engine_module
+from mongotic.engine import EngineMonitor, create_engine, engine_stats
+
+
+def test_engine_registry():
+    engine = create_engine("mongodb://LocalHost:27017/?maxPoolSize=5", connect=False)
+    try:
+        assert (
+            create_engine("mongodb://localhost/?maxpoolsize=5", connect=False) is engine
+        )
+        assert create_engine("localhost:27017", connect=False) is not engine
+        assert (
+            create_engine(
+                "mongodb://localhost/?maxPoolSize=5", connect=False, cache=False
+            )
+            is not engine
+        )
+        assert "localhost:27017" in engine_stats()
+    finally:
+        engine.close()
+
+    assert any(e is engine for e in engine_module.get_engines())
+    engine.close()
+    assert all(e is not engine for e in engine_module.get_engines())
+
+    reopened_engine = create_engine("mongodb://localhost/?maxPoolSize=5", connect=False)
+    assert reopened_engine is not engine
+    reopened_engine.close()
+
+
+def test_dispose_engines():
+    engine = create_engine("mongodb://localhost/?appName=dispose", connect=False)
+    create_engine("mongodb://localhost/?appName=dispose", connect=False)
+    engine_module.dispose_engines()
+    assert all(e is not engine for e in engine_module.get_engines())
+
+
+def test_engine_registry_after_fork(monkeypatch: pytest.MonkeyPatch):
+    engine = create_engine("mongodb://localhost/?appName=fork", connect=False)
+    monkeypatch.setattr(engine_module.os, "getpid", lambda: -1)
+
+    child_engine = create_engine("mongodb://localhost/?appName=fork", connect=False)
+    assert child_engine is not engine
+    assert all(e is not engine for e in engine_module.get_engines())
+    child_engine.close()
+    engine.close()
+
+
+def test_engine_after_fork_hook(monkeypatch: pytest.MonkeyPatch):
+    engine = create_engine("mongodb://localhost/?appName=forkhook", connect=False)
+    engine.monitor.connection_created(
+        monitoring.ConnectionCreatedEvent(("localhost", 27017), 1)
+    )
+    monkeypatch.setattr(engine_module.os, "getpid", lambda: -2)
+    engine_module._after_fork_child()
+
+    assert engine_stats(engine)["pools"] == {}
+    assert (
+        create_engine("mongodb://localhost/?appName=forkhook", connect=False) is engine
+    )
+    engine.close()
+    engine.close()
+    assert all(e is not engine for e in engine_module.get_engines())
+
+
+def test_engine_monitor():
+    monitor = EngineMonitor()
+    address = ("localhost", 27017)
+
+    monitor.connection_created(monitoring.ConnectionCreatedEvent(address, 1))
+    monitor.connection_created(monitoring.ConnectionCreatedEvent(address, 2))
+    for connection_id in (1, 2):
+        monitor.connection_check_out_started(
+            monitoring.ConnectionCheckOutStartedEvent(address)
+        )
+        monitor.connection_checked_out(
+            monitoring.ConnectionCheckedOutEvent(address, connection_id)
+        )
+    monitor.connection_checked_in(monitoring.ConnectionCheckedInEvent(address, 1))
+    monitor.succeeded(
+        monitoring.CommandSucceededEvent(
+            datetime.timedelta(milliseconds=5), {"ok": 1}, "find", 1, address, 1
+        )
+    )
+
+    stats = monitor.stats()
+    pool_stats = stats["pools"]["localhost:27017"]
+    assert pool_stats["size"] == 2
+    assert pool_stats["checked_out"] == 1
+    assert pool_stats["checkouts"] == 2
+    assert 0 <= pool_stats["wait_p50"] <= pool_stats["wait_max"]
+    assert stats["commands"]["count"] == 1
+    assert stats["commands"]["max"] == pytest.approx(0.005)
+
+    engine = create_engine("mongodb://localhost/?appName=monitor", connect=False)
+    try:
+        assert engine_stats(engine)["commands"]["count"] == 0
+    finally:
+        engine.close()
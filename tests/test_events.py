@@ -0,0 +1,147 @@
+import io
+import logging
+from datetime import datetime
+from typing import List, Optional, Text, Tuple
+
+import pytest
+from pyassorted.datetime import aware_datetime_now
+from pyassorted.string import rand_str
+from pydantic import Field
+from pymongo import MongoClient
+
+from mongotic import events
+from mongotic.events import (
+    ExecutionEvent,
+    QueryStatsCollector,
+    SlowQueryLogger,
+    percentile,
+)
+from mongotic.exceptions import NotFound
+from mongotic.model import MongoBaseModel
+from mongotic.orm import sessionmaker
+
+test_company = f"test_{rand_str(10)}"
+
+
+class User(MongoBaseModel):
+    __databasename__ = "test"
+    __tablename__ = "user"
+
+    name: Text = Field(..., max_length=50)
+    email: Text = Field(...)
+    company: Optional[Text] = Field(None, max_length=50)
+    age: Optional[int] = Field(None, ge=0, le=200)
+    created_at: Optional[datetime] = Field(..., default_factory=aware_datetime_now)
+    updated_at: Optional[datetime] = Field(..., default_factory=aware_datetime_now)
+
+
+def test_percentile():
+    samples = [float(i) for i in range(1, 101)]
+    assert percentile(samples, 50) == 50.0
+    assert percentile(samples, 95) == 95.0
+    assert percentile([1.0], 95) == 1.0
+    with pytest.raises(ValueError):
+        percentile([], 50)
+
+
+def test_execution_events(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    received: List[Tuple[Text, ExecutionEvent]] = []
+    listeners = {
+        event_name: (
+            lambda event, event_name=event_name: received.append((event_name, event))
+        )
+        for event_name in events.EVENT_NAMES
+    }
+    for event_name, listener in listeners.items():
+        events.listen(event_name, listener)
+    try:
+        for i in range(3):
+            session.add(
+                User(
+                    name=f"user_{i}",
+                    email=f"user_{i}@example.com",
+                    company=test_company,
+                    age=i,
+                )
+            )
+        session.commit()
+        assert [name for name, _ in received] == ["after_flush"]
+        flush_event = received[0][1]
+        assert flush_event.operation == "flush"
+        assert flush_event.collection == User.__tablename__
+        assert flush_event.doc_count == 3
+        assert flush_event.bytes > 0
+
+        received.clear()
+        users = session.query(User).filter(User.company == test_company).all()
+        assert len(users) == 3
+        assert [name for name, _ in received] == [
+            "before_execute",
+            "after_execute",
+            "after_hydrate",
+        ]
+        query_event = received[0][1]
+        assert query_event.operation == "find"
+        assert query_event.filter == {"company": {"$eq": test_company}}
+        assert query_event.doc_count == 3
+        assert query_event.bytes > 0
+        assert query_event.round_trip_time >= 0
+        assert query_event.hydration_time >= 0
+        assert query_event.query_shape == "test.user.find(company: ['$eq'])"
+
+        received.clear()
+        with pytest.raises(NotFound):
+            session.query(User).filter(User.company == rand_str(10)).first()
+        assert [name for name, _ in received] == ["before_execute", "after_execute"]
+        assert received[0][1].doc_count == 0
+
+        received.clear()
+        for user in users:
+            session.delete(user)
+        session.commit()
+        assert received[0][1].doc_count == 3
+    finally:
+        for event_name, listener in listeners.items():
+            events.remove(event_name, listener)
+
+    assert not events.has_listeners()
+    with pytest.raises(ValueError):
+        events.listen("unknown", print)
+
+
+def test_slow_query_logger_and_stats(mongo_engine: "MongoClient", caplog):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    slow_query_logger = SlowQueryLogger(threshold=0).attach()
+    collector = QueryStatsCollector().attach()
+    try:
+        with caplog.at_level(logging.WARNING, logger="mongotic"):
+            for _ in range(5):
+                session.query(User).filter(User.company == test_company).all()
+        session.query(User).filter(User.age > 10).all()
+        session.query(User).filter(User.company == test_company).count()
+        with pytest.raises(NotFound):
+            session.query(User).filter(User.company == rand_str(10)).first()
+        session.query(User).filter(User.company == rand_str(10)).update({User.age: 1})
+        session.query(User).filter(User.company == rand_str(10)).export(io.StringIO())
+    finally:
+        slow_query_logger.detach()
+        collector.detach()
+
+    assert any("Slow find on test.user" in r.message for r in caplog.records)
+
+    stats = collector.stats()
+    shape_stats = stats["test.user.find(company: ['$eq'])"]
+    assert shape_stats["count"] == 5
+    assert 0 <= shape_stats["p50"] <= shape_stats["p95"] <= shape_stats["max"]
+    assert stats["test.user.find(age: ['$gt'])"]["count"] == 1
+    for operation in ("aggregate", "find_one", "update_many", "export"):
+        assert stats[f"test.user.{operation}(company: ['$eq'])"]["count"] == 1
+    assert len(stats) == 6
+
+    collector.reset()
+    assert collector.stats() == {}
@@ -0,0 +1,105 @@
+import warnings
+from datetime import datetime
+from typing import Optional, Text
+
+import pytest
+from pyassorted.datetime import aware_datetime_now
+from pyassorted.string import rand_str
+from pydantic import Field
+from pymongo import DESCENDING, MongoClient
+
+from mongotic.exceptions import IndexOptionsWarning, NotFound, UnindexedQueryWarning
+from mongotic.index import Index, create_all, sync_indexes
+from mongotic.model import MongoBaseModel
+from mongotic.orm import sessionmaker
+
+test_company = f"test_{rand_str(10)}"
+
+
+class User(MongoBaseModel):
+    __databasename__ = "test"
+    __tablename__ = f"user_index_{rand_str(10)}"
+    __indexes__ = [Index("email", unique=True)]
+
+    name: Text = Field(..., max_length=50)
+    email: Text = Field(...)
+    company: Optional[Text] = Field(None, max_length=50)
+    age: Optional[int] = Field(None, ge=0, le=200)
+    created_at: Optional[datetime] = Field(..., default_factory=aware_datetime_now)
+    updated_at: Optional[datetime] = Field(..., default_factory=aware_datetime_now)
+
+
+User.__indexes__ = User.__indexes__ + [
+    Index(User.company, (User.age, DESCENDING)),
+    Index(User.created_at, expire_after_seconds=3600),
+    Index(User.name, partial_filter=User.age >= 18, name="adult_name"),
+]
+
+
+def test_index_definition():
+    index = Index(User.company, (User.age, DESCENDING))
+    assert index.key_spec(User) == [("company", 1), ("age", -1)]
+    assert index.options(User) == {"name": "company_1_age_-1"}
+
+    index = Index(User.name, partial_filter=User.age >= 18, name="adult_name")
+    assert index.options(User) == {
+        "name": "adult_name",
+        "partialFilterExpression": {"age": {"$gte": 18}},
+    }
+    assert Index("created_at", expire_after_seconds=60).options(User) == {
+        "name": "created_at_1",
+        "expireAfterSeconds": 60,
+    }
+
+    with pytest.raises(ValueError):
+        Index()
+    with pytest.raises(ValueError):
+        Index("unknown").key_spec(User)
+
+
+def test_sync_indexes(mongo_engine: "MongoClient"):
+    created = create_all(mongo_engine, models=[User])
+    assert sorted(created[User]) == [
+        "adult_name",
+        "company_1_age_-1",
+        "created_at_1",
+        "email_1",
+    ]
+
+    collection = mongo_engine[User.__databasename__][User.__tablename__]
+    index_info = collection.index_information()
+    assert index_info["email_1"]["unique"] is True
+    assert index_info["created_at_1"]["expireAfterSeconds"] == 3600
+
+    assert sync_indexes(mongo_engine, User) == []
+    assert create_all(mongo_engine)[User] == []
+
+    collection.drop_index("email_1")
+    assert sync_indexes(mongo_engine, User) == ["email_1"]
+
+    collection.drop_index("created_at_1")
+    collection.create_index("created_at", expireAfterSeconds=60)
+    with pytest.warns(IndexOptionsWarning) as record:
+        assert sync_indexes(mongo_engine, User) == []
+    assert record[0].filename == __file__
+
+
+def test_unindexed_query_warning(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", UnindexedQueryWarning)
+        session.query(User).filter(User.company == test_company).all()
+        session.query(User).filter_by(email=f"{test_company}@example.com").all()
+
+    with pytest.warns(UnindexedQueryWarning) as record:
+        session.query(User).filter(User.age > 18).all()
+    assert record[0].filename == __file__
+    with pytest.warns(UnindexedQueryWarning):
+        with pytest.raises(NotFound):
+            session.query(User).filter(User.age > 200).first()
+
+
+def test_clean_collection(mongo_engine: "MongoClient"):
+    mongo_engine[User.__databasename__].drop_collection(User.__tablename__)
@@ -0,0 +1,46 @@
+from datetime import datetime
+
+import bson
+import pytest
+from bson import Binary, Code, Decimal128, Int64, MaxKey, MinKey, Regex, Timestamp
+from bson.objectid import ObjectId
+from bson.raw_bson import RawBSONDocument
+
+from mongotic.lazy import LazyDocument, scan_elements
+
+
+def test_lazy_document():
+    doc = {
+        "_id": ObjectId(),
+        "double": 1.5,
+        "string": "héllo",
+        "document": {"a": [1, 2, {"b": None}]},
+        "array": [1, "x"],
+        "binary": Binary(b"\x00\x01", 5),
+        "bool": True,
+        "datetime": datetime(2020, 1, 1),
+        "null": None,
+        "regex": Regex("a.*b", "i"),
+        "code": Code("x = 1"),
+        "code_with_scope": Code("x = y", {"y": 1}),
+        "int32": 5,
+        "timestamp": Timestamp(1, 2),
+        "int64": Int64(2**40),
+        "decimal": Decimal128("1.5"),
+        "min_key": MinKey(),
+        "max_key": MaxKey(),
+    }
+    raw = bson.encode(doc)
+    assert list(scan_elements(raw)) == list(doc)
+
+    lazy_document = LazyDocument.from_document(RawBSONDocument(raw))
+    assert len(lazy_document) == len(doc)
+    assert "missing" not in lazy_document
+    for name, value in doc.items():
+        assert lazy_document[name] == value
+
+    assert LazyDocument.from_document({"a": 1})["a"] == 1
+    with pytest.raises(KeyError):
+        lazy_document["missing"]
+    with pytest.raises(ValueError):
+        scan_elements(raw[:-1])
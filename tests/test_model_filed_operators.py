@@ -1,12 +1,14 @@
+import time
 from datetime import datetime
 from typing import Optional, Text
 
+import pytest
 from pyassorted.datetime import aware_datetime_now
 from pyassorted.string import rand_str
 from pydantic import Field
 from pymongo import MongoClient
 
-from mongotic.model import MongoBaseModel
+from mongotic.model import ModelFieldOperation, MongoBaseModel
 from mongotic.orm import sessionmaker
 
 test_name = f"test_{rand_str(10)}"
@@ -144,6 +146,44 @@ def test_query_filter_operators(mongo_engine: "MongoClient"):
     assert len(users) > 0
 
 
+def test_field_handles():
+    class Employee(User):
+        title: Optional[Text] = None
+
+    assert User.email is User.email
+    assert Employee.email is not User.email
+    assert Employee.email.model_class is Employee
+    assert Employee.title.field_name == "title"
+    assert Employee.model_fields["name"].is_required()
+    with pytest.raises(AttributeError):
+        User.title
+
+    operation = User.age >= test_age
+    assert str(operation.operation) == ">="
+    with pytest.raises(AttributeError):
+        operation.extra = True
+
+    assert ModelFieldOperation.to_mongo_filter(
+        [User.age >= 1, User.age < 10, User.name.in_([test_name])]
+    ) == {"age": {"$gte": 1, "$lt": 10}, "name": {"$in": [test_name]}}
+
+
+def test_filter_building_overhead():
+    count = 20000
+    start = time.perf_counter()
+    for _ in range(count):
+        ModelFieldOperation.to_mongo_filter(
+            [
+                User.company == test_company,
+                User.age >= 18,
+                User.age < test_age,
+                User.name.in_([test_name]),
+            ]
+        )
+    elapsed = time.perf_counter() - start
+    print(f"Filter building: {elapsed / count * 1e6:.2f}us per filter")
+
+
 def test_clean_documents(mongo_engine: "MongoClient"):
     Session = sessionmaker(bind=mongo_engine)
     session = Session()
@@ -1,11 +1,16 @@
+import time
 from datetime import datetime
 from typing import Optional, Text
 
+import pytest
+from bson.objectid import ObjectId
 from pyassorted.datetime import aware_datetime_now
 from pyassorted.string import rand_str
 from pydantic import Field
 from pymongo import MongoClient
 
+from mongotic.exceptions import FlushError
+from mongotic.index import Index, sync_indexes
 from mongotic.model import MongoBaseModel
 from mongotic.orm import sessionmaker
 
@@ -75,6 +80,74 @@ def test_update_operation(mongo_engine: "MongoClient"):
     session.commit()
 
 
+def test_update_coalesced_operation(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    user = session.query(User).filter_by(company=test_company).first()
+    original_age = user.age
+
+    for i in range(5):
+        user.email = f"johndoe_{i}@example.com"
+    user.age = original_age + 1
+    user.age = original_age
+    assert len(session._update_instances) == 1
+
+    dirty_state = session._update_instances[id(user)]
+    assert dirty_state.changed_fields() == ["email"]
+    assert dirty_state.to_mongo_update() == {"$set": {"email": "johndoe_4@example.com"}}
+
+    session.commit()
+    assert len(session._update_instances) == 0
+
+    stored_user = Session().query(User).filter_by(company=test_company).first()
+    assert stored_user is not user
+    assert stored_user.email == "johndoe_4@example.com"
+    assert stored_user.age == original_age
+
+
+def test_identity_map(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    user = session.query(User).filter_by(company=test_company).first()
+    users = session.query(User).filter_by(company=test_company).all()
+    assert any(_user is user for _user in users)
+    assert session.get(User, user._id) is user
+
+    user.age = 31
+    same_user = session.query(User).filter_by(company=test_company).first()
+    assert same_user is user
+    assert same_user.age == 31
+
+    other_session = Session()
+    other_user = other_session.get(User, user._id)
+    assert other_user is not None
+    assert other_user is not user
+    assert other_user.email == user.email
+
+    assert session.get(User, "000000000000000000000000") is None
+
+    class UserSummary(MongoBaseModel):
+        __databasename__ = User.__databasename__
+        __tablename__ = User.__tablename__
+
+        name: Text = Field(..., max_length=50)
+
+    summary = session.get(UserSummary, user._id)
+    assert isinstance(summary, UserSummary)
+    assert summary.name == user.name
+    assert session.get(User, user._id) is user
+
+    session.query(User).filter_by(_id=ObjectId(user._id)).update({User.age: 32})
+    assert user.age == 32
+    session.query(UserSummary).filter_by(_id=ObjectId(user._id)).update(
+        {UserSummary.name: "renamed"}
+    )
+    assert summary.name == "renamed"
+    assert user.name == "renamed"
+
+
 def test_delete_operation(mongo_engine: "MongoClient"):
     Session = sessionmaker(bind=mongo_engine)
     session = Session()
@@ -84,3 +157,178 @@ def test_delete_operation(mongo_engine: "MongoClient"):
     session.delete(user)
 
     session.commit()
+
+
+def test_bulk_add_throughput(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine, batch_size=500, ordered=False)
+    session = Session()
+
+    bulk_company = f"test_{rand_str(10)}"
+    users = [
+        User(
+            name=f"bulk_{i}",
+            email=f"bulk_{i}@example.com",
+            company=bulk_company,
+            age=i % 100,
+        )
+        for i in range(2000)
+    ]
+    for user in users:
+        session.add(user)
+
+    start = time.perf_counter()
+    session.commit()
+    elapsed = time.perf_counter() - start
+    print(f"Inserted {len(users)} documents in {elapsed:.3f}s")
+    print(f"Throughput: {len(users) / elapsed:.0f} documents/s")
+
+    assert all(user._id is not None for user in users)
+    assert len({user._id for user in users}) == len(users)
+
+    for user in users:
+        session.delete(user)
+    session.commit()
+
+    users = session.query(User).filter_by(company=bulk_company).all()
+    assert len(users) == 0
+
+
+def test_autoflush(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine, autoflush_threshold=3)
+    session = Session()
+
+    autoflush_company = f"test_{rand_str(10)}"
+    users = [
+        User(
+            name=f"autoflush_{i}",
+            email=f"autoflush_{i}@example.com",
+            company=autoflush_company,
+        )
+        for i in range(7)
+    ]
+    for user in users:
+        session.add(user)
+    assert all(user._id is not None for user in users[:6])
+    assert users[6]._id is None
+    assert session.query(User).filter_by(company=autoflush_company).count() == 6
+
+    session.flush()
+    assert users[6]._id is not None
+
+    users[0].age = 40
+    session.commit()
+    assert Session().get(User, users[0]._id).age == 40
+
+    for i, user in enumerate(users[:3]):
+        user.age = 50 + i
+    assert not session._update_instances
+    assert [Session().get(User, user._id).age for user in users[:3]] == [50, 51, 52]
+
+    Session = sessionmaker(bind=mongo_engine, autoflush_bytes=1)
+    session = Session()
+    user = User(
+        name="autoflush_7", email="autoflush_7@example.com", company=autoflush_company
+    )
+    session.add(user)
+    assert user._id is not None
+    users.append(user)
+    user.age = 60
+    assert not session._update_instances
+    assert Session().get(User, user._id).age == 60
+
+    for user in users:
+        session.delete(user)
+    session.commit()
+    assert session.query(User).filter_by(company=autoflush_company).count() == 0
+
+    with pytest.raises(ValueError):
+        sessionmaker(bind=mongo_engine, autoflush_threshold=0)
+
+
+def test_chunked_commit(mongo_engine: "MongoClient"):
+    class UniqueUser(MongoBaseModel):
+        __databasename__ = "test"
+        __tablename__ = f"unique_user_{rand_str(10)}"
+        __indexes__ = [Index("email", unique=True)]
+
+        name: Text = Field(..., max_length=50)
+        email: Text = Field(...)
+
+    sync_indexes(mongo_engine, UniqueUser)
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    users = [
+        UniqueUser(name=f"chunk_{i}", email=f"chunk_{i}@example.com") for i in range(10)
+    ]
+    users[5].email = users[2].email
+    for user in users:
+        session.add(user)
+
+    with pytest.raises(FlushError) as exc_info:
+        session.commit(chunk_size=4)
+    assert exc_info.value.flushed == 5
+    assert exc_info.value.pending == 5
+    assert exc_info.value.failed == [users[5]]
+    assert all(user._id is not None for user in users[:5])
+    assert all(user._id is None for user in users[5:])
+
+    users[5].email = "chunk_5@example.com"
+    session.commit(chunk_size=4)
+    assert all(user._id is not None for user in users)
+    assert session.query(UniqueUser).limit(0).count() == 10
+
+    for user in users:
+        session.delete(user)
+    session.commit(chunk_size=3)
+    assert session.query(UniqueUser).limit(0).count() == 0
+
+    mongo_engine[UniqueUser.__databasename__].drop_collection(UniqueUser.__tablename__)
+
+
+def test_merge(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    merge_company = f"test_{rand_str(10)}"
+    users = [
+        User(name=f"merge_{i}", email=f"merge_{i}@example.com", company=merge_company)
+        for i in range(5)
+    ]
+    result = session.merge_all(users[:3], on=[User.email])
+    assert result.inserted_count == 3
+    assert result.matched_count == 0
+    assert all(user._id is not None for user in users[:3])
+    assert session.get(User, users[0]._id) is users[0]
+
+    synced = [
+        User(
+            name=f"merge_{i}",
+            email=f"merge_{i}@example.com",
+            company=merge_company,
+            age=i,
+        )
+        for i in range(5)
+    ]
+    result = session.merge_all(synced, on=[User.email])
+    assert result.inserted_count == 2
+    assert result.matched_count == 3
+    assert result.updated_count == 3
+    assert synced[0]._id is None
+    assert synced[4]._id is not None
+
+    result = session.merge(synced[1], on=["email"])
+    assert result.matched_count == 1
+    assert result.updated_count == 0
+
+    users = Session().query(User).filter_by(company=merge_company).limit(0).all()
+    assert sorted((user.email, user.age) for user in users) == [
+        (f"merge_{i}@example.com", i) for i in range(5)
+    ]
+
+    with pytest.raises(ValueError):
+        session.merge(synced[0], on=[])
+    with pytest.raises(ValueError):
+        session.merge(synced[0], on=["unknown"])
+
+    session.query(User).filter_by(company=merge_company).delete()
@@ -0,0 +1,645 @@
+import csv
+import io
+import json
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, List, Optional, Text
+
+import pytest
+from bson.objectid import ObjectId
+from pyassorted.datetime import aware_datetime_now
+from pyassorted.string import rand_str
+from pydantic import Field
+from pymongo import DESCENDING, MongoClient
+
+from mongotic.aggregate import func
+from mongotic.exceptions import DeferredFieldError
+from mongotic.model import MongoBaseModel, bindparam
+from mongotic.orm import Hydration, compile_query, sessionmaker
+
+test_company = f"test_{rand_str(10)}"
+test_count = 500
+
+
+class User(MongoBaseModel):
+    __databasename__ = "test"
+    __tablename__ = "user"
+
+    name: Text = Field(..., max_length=50)
+    email: Text = Field(...)
+    company: Optional[Text] = Field(None, max_length=50)
+    age: Optional[int] = Field(None, ge=0, le=200)
+    created_at: Optional[datetime] = Field(..., default_factory=aware_datetime_now)
+    updated_at: Optional[datetime] = Field(..., default_factory=aware_datetime_now)
+
+
+def test_init_documents(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    for i in range(test_count):
+        session.add(
+            User(
+                name=f"user_{i}",
+                email=f"user_{i}@example.com",
+                company=test_company,
+                age=i % 100,
+            )
+        )
+    session.commit()
+
+
+def test_iterate_queryset(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    query = session.query(User).filter(User.company == test_company).limit(10)
+    users = [user for user in query]
+    assert len(users) == 10
+    assert all(user._id is not None for user in users)
+    assert all(user._session is session for user in users)
+
+    users = list(
+        session.query(User).filter(User.company == test_company).limit(0).yield_per(50)
+    )
+    assert len(users) == test_count
+
+
+def test_yield_per_memory(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    tracemalloc.start()
+    users = session.query(User).filter(User.company == test_company).limit(0).all()
+    _, all_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(users) == test_count
+    del users
+
+    count = 0
+    tracemalloc.start()
+    query = session.query(User).filter(User.company == test_company)
+    for _ in query.limit(0).yield_per(50):
+        count += 1
+    _, yield_per_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert count == test_count
+
+    print(f"Peak memory of all(): {all_peak / 1024:.1f} KiB")
+    print(f"Peak memory of yield_per(50): {yield_per_peak / 1024:.1f} KiB")
+
+
+def test_load_only_fields(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    user = (
+        session.query(User)
+        .filter(User.company == test_company)
+        .load_only(User.name, User.email)
+        .first()
+    )
+    assert set(user.model_dump()) == {"name", "email"}
+
+    assert user.age is not None
+    assert set(user.model_dump()) == set(User.model_fields)
+
+
+def test_defer_fields(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    users = (
+        session.query(User)
+        .filter(User.company == test_company)
+        .defer(User.created_at, "updated_at")
+        .limit(10)
+        .all()
+    )
+    assert len(users) == 10
+    for user in users:
+        assert "created_at" not in user.model_dump()
+        assert "updated_at" not in user.model_dump()
+        assert user.company == test_company
+
+    user = users[0]
+    user._session = None
+    with pytest.raises(DeferredFieldError):
+        user.created_at
+
+    with pytest.raises(ValueError):
+        session.query(User).load_only(User.name).defer(User.email)
+
+
+def test_hydration_modes(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine, hydration=Hydration.TRUSTED)
+    session = Session()
+
+    user = session.query(User).filter(User.company == test_company).first()
+    assert user._id is not None
+    assert user._session is session
+    assert user.company == test_company
+
+    users = (
+        session.query(User)
+        .filter(User.company == test_company)
+        .hydration(Hydration.BATCH)
+        .limit(0)
+        .yield_per(64)
+        .all()
+    )
+    assert len(users) == test_count
+    assert all(user._id is not None for user in users)
+    assert all(user._session is session for user in users)
+
+    session = Session()
+    user = (
+        session.query(User)
+        .filter(User.company == test_company)
+        .load_only(User.name)
+        .trusted()
+        .first()
+    )
+    assert set(user.model_dump()) == {"name"}
+
+
+def test_lazy_hydration(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine, hydration=Hydration.LAZY)
+    session = Session()
+
+    user = (
+        session.query(User).filter(User.company == test_company, User.age == 7).first()
+    )
+    assert user._id is not None
+    assert "name" not in user.__dict__
+    assert user.name.startswith("user_")
+    assert "name" in user.__dict__
+    assert "email" not in user.__dict__
+    assert user.model_dump(include={"age"}) == {"age": 7}
+    assert "email" not in user.__dict__
+    assert set(user.model_dump()) == set(User.model_fields)
+    assert user._lazy_document is None
+
+    session = Session()
+    user = (
+        session.query(User)
+        .filter(User.company == test_company, User.age == 8)
+        .load_only(User.name)
+        .first()
+    )
+    assert user.name.startswith("user_")
+    assert user.email == f"{user.name}@example.com"
+
+    user.age = 8
+    user.company = test_company
+    assert session._update_instances[id(user)].changed_fields() == []
+    user.age = 9
+    assert session._update_instances[id(user)].changed_fields() == ["age"]
+    session.commit()
+    user.age = 8
+    session.commit()
+
+    users = (
+        session.query(User).filter(User.company == test_company).lazy().limit(0).all()
+    )
+    assert len(users) == test_count
+
+
+def test_hydration_throughput(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    for mode in (Hydration.VALIDATE, Hydration.BATCH, Hydration.TRUSTED):
+        query = (
+            session.query(User)
+            .filter(User.company == test_company)
+            .hydration(mode)
+            .limit(0)
+        )
+        start = time.perf_counter()
+        users = query.all()
+        elapsed = time.perf_counter() - start
+        assert len(users) == test_count
+        print(f"Hydration {mode.name}: {len(users) / elapsed:.0f} rows/s")
+
+    for mode in (Hydration.VALIDATE, Hydration.LAZY):
+        query = (
+            session.query(User)
+            .filter(User.company == test_company)
+            .hydration(mode)
+            .limit(0)
+        )
+        start = time.perf_counter()
+        ages = [(user.name, user.age) for user in query]
+        elapsed = time.perf_counter() - start
+        assert len(ages) == test_count
+        print(
+            f"Hydration {mode.name} reading 2 fields: {len(ages) / elapsed:.0f} rows/s"
+        )
+
+
+def test_compiled_query(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    compiled_query = compile_query(
+        User,
+        User.company == test_company,
+        User.email == bindparam("email"),
+        User.age.in_(bindparam("ages")),
+    )
+    assert compiled_query.params == {"email", "ages"}
+    assert compiled_query.compile_filter(email="user_1@example.com", ages=[1]) == {
+        "company": {"$eq": test_company},
+        "email": {"$eq": "user_1@example.com"},
+        "age": {"$in": [1]},
+    }
+
+    user = compiled_query.first(session, email="user_1@example.com", ages=[1, 2])
+    assert user.name == "user_1"
+
+    users = compiled_query.all(session, email="user_2@example.com", ages=[1])
+    assert len(users) == 0
+
+    users = (
+        compiled_query.query(session, email="user_2@example.com", ages=[2])
+        .filter(User.name == "user_2")
+        .all()
+    )
+    assert len(users) == 1
+
+    with pytest.raises(ValueError):
+        compiled_query.compile_filter(email="user_1@example.com")
+
+
+def test_compiled_query_overhead(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+    rounds = 10000
+
+    start = time.perf_counter()
+    for i in range(rounds):
+        session.query(User).filter(
+            User.company == test_company, User.email == f"user_{i}@example.com"
+        )._compile_filter()
+    dynamic_elapsed = time.perf_counter() - start
+
+    compiled_query = compile_query(
+        User, User.company == test_company, User.email == bindparam("email")
+    )
+    start = time.perf_counter()
+    for i in range(rounds):
+        compiled_query.query(session, email=f"user_{i}@example.com")._compile_filter()
+    compiled_elapsed = time.perf_counter() - start
+
+    print(f"Dynamic query building: {dynamic_elapsed / rounds * 1e6:.2f} us/query")
+    print(f"Compiled query building: {compiled_elapsed / rounds * 1e6:.2f} us/query")
+
+
+def test_order_by(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    query = session.query(User).filter(User.company == test_company)
+    users = query.order_by((User.age, DESCENDING), "name").limit(10).all()
+    assert [user.age for user in users] == [99] * 5 + [98] * 5
+    assert [user.name for user in users[:5]] == sorted(user.name for user in users[:5])
+
+    user = session.query(User).filter(User.company == test_company).order_by("-age")
+    assert user.first().age == 99
+
+    with pytest.raises(ValueError):
+        session.query(User).order_by("unknown")
+    with pytest.raises(ValueError):
+        session.query(User).order_by(User.age, "-age")
+
+
+def test_keyset_pagination(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    names = []
+    token = None
+    pages = 0
+    while True:
+        query = (
+            session.query(User)
+            .filter(User.company == test_company)
+            .order_by(User.age, "_id")
+            .limit(60)
+        )
+        if token is not None:
+            query = query.after(token)
+        page = query.page()
+        names.extend(user.name for user in page)
+        pages += 1
+        if not page.has_next:
+            break
+        token = page.next_token
+
+    assert pages == test_count // 60 + 1
+    assert len(names) == len(set(names)) == test_count
+
+    users = session.query(User).filter(User.company == test_company).limit(0).all()
+    expected = sorted(users, key=lambda user: (user.age, user._id))
+    assert names == [user.name for user in expected]
+
+    with pytest.raises(ValueError):
+        session.query(User).after("not a token")
+    with pytest.raises(ValueError):
+        session.query(User).order_by(User.name).after(token).all()
+
+
+def test_keyset_pagination_default_order(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    page_company = f"test_{rand_str(10)}"
+    ids = sorted(ObjectId() for _ in range(6))
+    mongo_engine[User.__databasename__][User.__tablename__].insert_many(
+        [
+            {
+                "_id": _id,
+                "name": f"page_{i}",
+                "email": f"page_{i}@example.com",
+                "company": page_company,
+            }
+            for i, _id in reversed(list(enumerate(ids)))
+        ]
+    )
+
+    names = []
+    token = None
+    while True:
+        query = session.query(User).filter(User.company == page_company).limit(3)
+        if token is not None:
+            query = query.after(token)
+        page = query.page()
+        names.extend(user.name for user in page)
+        if not page.has_next:
+            break
+        token = page.next_token
+    assert names == [f"page_{i}" for i in range(6)]
+
+    session.query(User).filter(User.company == page_company).delete()
+
+
+def test_keyset_pagination_cost(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    query = session.query(User).filter(User.company == test_company).order_by("_id")
+    token = query.limit(test_count - 50).page().next_token
+
+    start = time.perf_counter()
+    for _ in range(10):
+        offset_users = (
+            session.query(User)
+            .filter(User.company == test_company)
+            .order_by("_id")
+            .offset(test_count - 50)
+            .limit(50)
+            .all()
+        )
+    offset_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(10):
+        keyset_users = (
+            session.query(User)
+            .filter(User.company == test_company)
+            .order_by("_id")
+            .after(token)
+            .limit(50)
+            .all()
+        )
+    keyset_elapsed = time.perf_counter() - start
+
+    assert [user._id for user in keyset_users] == [user._id for user in offset_users]
+    print(
+        f"Deep page of 50 users: offset {offset_elapsed * 100:.2f} ms, "
+        + f"keyset {keyset_elapsed * 100:.2f} ms"
+    )
+
+
+def test_aggregations(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    query = session.query(User).filter(User.company == test_company)
+    assert query.count() == test_count
+    assert query.limit(10).count() == 10
+    assert (
+        session.query(User).filter(User.company == test_company, User.age < 10).count()
+        == 50
+    )
+    assert session.query(User).filter(User.company == test_company).exists()
+    assert not session.query(User).filter(User.company == rand_str(10)).exists()
+    assert session.query(User).filter(User.company == rand_str(10)).count() == 0
+
+    ages = session.query(User).filter(User.company == test_company).distinct(User.age)
+    assert ages == list(range(100))
+
+    rows = (
+        session.query(User)
+        .filter(User.company == test_company)
+        .group_by(User.company)
+        .agg(
+            users=func.count(),
+            total_age=func.sum(User.age),
+            avg_age=func.avg(User.age),
+            min_age=func.min(User.age),
+            max_age=func.max("age"),
+        )
+    )
+    assert rows == [
+        {
+            "company": test_company,
+            "users": test_count,
+            "total_age": sum(i % 100 for i in range(test_count)),
+            "avg_age": 49.5,
+            "min_age": 0,
+            "max_age": 99,
+        }
+    ]
+
+    rows = (
+        session.query(User)
+        .filter(User.company == test_company, User.age < 3)
+        .group_by(User.company, User.age)
+        .agg(users=func.count())
+    )
+    assert rows == [
+        {"company": test_company, "age": age, "users": test_count // 100}
+        for age in range(3)
+    ]
+
+    with pytest.raises(ValueError):
+        session.query(User).group_by(User.age).agg(age=func.count())
+
+
+def test_parallel_scan(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    query = session.query(User).filter(User.company == test_company)
+    partitions = query.partitions(4)
+    assert len(partitions) == 4
+    partition_names = [[user.name for user in partition] for partition in partitions]
+    assert sum(len(names) for names in partition_names) == test_count
+
+    partitions = (
+        session.query(User).filter(User.company == test_company).partitions(3, User.age)
+    )
+    partition_ages = [[user.age for user in partition] for partition in partitions]
+    assert all(ages == sorted(ages) for ages in partition_ages)
+    assert all(
+        max(ages) < min(next_ages)
+        for ages, next_ages in zip(partition_ages, partition_ages[1:])
+    )
+
+    start = time.perf_counter()
+    users = list(
+        session.query(User)
+        .filter(User.company == test_company)
+        .parallel_scan(workers=4)
+    )
+    parallel_elapsed = time.perf_counter() - start
+    assert len(users) == test_count
+    assert len({user.name for user in users}) == test_count
+
+    start = time.perf_counter()
+    users = session.query(User).filter(User.company == test_company).limit(0).all()
+    sequential_elapsed = time.perf_counter() - start
+    print(
+        f"Full scan of {test_count} users: sequential {sequential_elapsed * 1000:.2f} ms, "
+        + f"parallel {parallel_elapsed * 1000:.2f} ms"
+    )
+
+    scan = (
+        session.query(User)
+        .filter(User.company == test_company)
+        .parallel_scan(workers=2, prefetch=4)
+    )
+    assert next(scan)._id is not None
+    scan.close()
+
+    with pytest.raises(ValueError):
+        session.query(User).limit(10).partitions(2)
+    with pytest.raises(ValueError):
+        session.query(User).parallel_scan(workers=0)
+
+
+def test_export(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    fileobj = io.StringIO()
+    progress: List[int] = []
+    result = (
+        session.query(User)
+        .filter(User.company == test_company)
+        .export(
+            fileobj,
+            fields=["_id", User.name, User.age, User.created_at],
+            chunk_size=64,
+            progress=lambda result: progress.append(result.rows),
+        )
+    )
+    assert result.rows == test_count
+    assert progress[-1] == test_count
+    assert len(progress) == test_count // 64 + 1
+    rows = [json.loads(line) for line in fileobj.getvalue().splitlines()]
+    assert len(rows) == test_count
+    assert set(rows[0]) == {"_id", "name", "age", "created_at"}
+    assert isinstance(rows[0]["_id"], str)
+    assert datetime.fromisoformat(rows[0]["created_at"])
+    print(f"Export NDJSON: {result.rows_per_second:.0f} rows/s")
+
+    fileobj = io.StringIO()
+    result = (
+        session.query(User)
+        .filter(User.company == test_company)
+        .limit(10)
+        .export(fileobj, format="csv")
+    )
+    assert result.rows == 10
+    rows = list(csv.DictReader(io.StringIO(fileobj.getvalue())))
+    assert len(rows) == 10
+    assert list(rows[0]) == list(User.model_fields)
+    assert rows[0]["company"] == test_company
+
+    with pytest.raises(ValueError):
+        session.query(User).export(io.StringIO(), format="xml")
+
+
+def test_set_based_update_and_delete(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    user = (
+        session.query(User).filter(User.company == test_company, User.age == 95).first()
+    )
+    other_user = (
+        session.query(User).filter(User.company == test_company, User.age == 10).first()
+    )
+
+    result = (
+        session.query(User)
+        .filter(User.company == test_company, User.age >= 95)
+        .update({User.age: 94, "name": "renamed"})
+    )
+    assert result.matched_count == result.modified_count == test_count // 100 * 5
+    assert user.age == 94
+    assert user.name == "renamed"
+    assert other_user.age == 10
+    assert session._update_instances == {}
+    assert (
+        session.query(User).filter(User.company == test_company, User.age >= 95).count()
+        == 0
+    )
+
+    with session:
+        started = []
+        start_transaction = session.client_session.start_transaction
+
+        def _start_transaction(*args: Any, **kwargs: Any) -> Any:
+            started.append(True)
+            return start_transaction(*args, **kwargs)
+
+        session.client_session.start_transaction = _start_transaction
+        result = (
+            session.query(User)
+            .filter(User.company == test_company, User.age == 94)
+            .update({User.name: "renamed"})
+        )
+        assert result.matched_count == test_count // 100 * 6
+        assert started == [True]
+
+    with pytest.raises(ValueError):
+        session.query(User).filter(User.company == test_company).update({User.age: -1})
+    with pytest.raises(ValueError):
+        session.query(User).filter(User.company == test_company).limit(1).delete()
+
+    result = (
+        session.query(User)
+        .filter(User.company == test_company, User.age == 94)
+        .delete()
+    )
+    assert result.deleted_count == test_count // 100 * 6
+    assert session.get(User, user._id) is None
+    assert user._session is None
+    assert session.query(User).filter(User.company == test_company).count() == (
+        test_count - test_count // 100 * 6
+    )
+
+
+def test_clean_documents(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    users = session.query(User).filter_by(company=test_company).limit(0).all()
+    for user in users:
+        session.delete(user)
+    session.commit()
@@ -0,0 +1,228 @@
+import time
+from datetime import datetime
+from typing import List, Optional, Text
+
+import pytest
+from pyassorted.datetime import aware_datetime_now
+from pyassorted.string import rand_str
+from pydantic import Field
+from pymongo import MongoClient
+
+from mongotic import events
+from mongotic.events import ExecutionEvent
+from mongotic.model import MongoBaseModel
+from mongotic.orm import sessionmaker
+from mongotic.relationship import Relationship
+
+test_company = f"test_{rand_str(10)}"
+test_user_count = 20
+test_order_count = 3
+
+
+class User(MongoBaseModel):
+    __databasename__ = "test"
+    __tablename__ = "user"
+    __relationships__ = {
+        "orders": Relationship(
+            lambda: Order, local_field="_id", remote_field="user_id", many=True
+        )
+    }
+
+    name: Text = Field(..., max_length=50)
+    email: Text = Field(...)
+    company: Optional[Text] = Field(None, max_length=50)
+    age: Optional[int] = Field(None, ge=0, le=200)
+    created_at: Optional[datetime] = Field(..., default_factory=aware_datetime_now)
+    updated_at: Optional[datetime] = Field(..., default_factory=aware_datetime_now)
+
+
+class Order(MongoBaseModel):
+    __databasename__ = "test"
+    __tablename__ = "order"
+    __relationships__ = {"user": Relationship(User, local_field="user_id")}
+
+    user_id: Text = Field(...)
+    company: Optional[Text] = Field(None, max_length=50)
+    amount: int = Field(..., ge=0)
+
+
+def count_queries(func) -> int:
+    received: List[ExecutionEvent] = []
+    events.listen(events.BEFORE_EXECUTE, received.append)
+    try:
+        func()
+    finally:
+        events.remove(events.BEFORE_EXECUTE, received.append)
+    return len(received)
+
+
+def test_init_documents(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    users = [
+        User(name=f"user_{i}", email=f"user_{i}@example.com", company=test_company)
+        for i in range(test_user_count)
+    ]
+    for user in users:
+        session.add(user)
+    session.commit()
+
+    for user in users:
+        for i in range(test_order_count):
+            session.add(Order(user_id=user._id, company=test_company, amount=i))
+    session.commit()
+
+
+def test_selectinload(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    orders: List[Order] = []
+
+    def _load():
+        orders.extend(
+            session.query(Order)
+            .filter(Order.company == test_company)
+            .selectinload("user")
+            .limit(0)
+            .all()
+        )
+
+    assert count_queries(_load) == 2
+    assert len(orders) == test_user_count * test_order_count
+    assert count_queries(lambda: [order.user.name for order in orders]) == 0
+    assert all(order.user._id == order.user_id for order in orders)
+    assert session.get(User, orders[0].user_id) is orders[0].user
+
+    users: List[User] = []
+    assert (
+        count_queries(
+            lambda: users.extend(
+                session.query(User)
+                .filter(User.company == test_company)
+                .selectinload("orders")
+                .limit(0)
+                .yield_per(7)
+                .all()
+            )
+        )
+        == 4
+    )
+    assert all(len(user.orders) == test_order_count for user in users)
+    assert users[0].orders[0] in orders
+
+    page = (
+        Session()
+        .query(Order)
+        .filter(Order.company == test_company)
+        .selectinload("user")
+        .limit(10)
+        .page()
+    )
+    assert all(order.user.company == test_company for order in page)
+
+    with pytest.raises(ValueError):
+        session.query(Order).selectinload("unknown")
+
+
+def test_joinedload(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    orders: List[Order] = []
+    assert (
+        count_queries(
+            lambda: orders.extend(
+                session.query(Order)
+                .filter(Order.company == test_company)
+                .joinedload("user")
+                .limit(0)
+                .all()
+            )
+        )
+        == 1
+    )
+    assert len(orders) == test_user_count * test_order_count
+    assert all(order.user._id == order.user_id for order in orders)
+    users = {id(order.user) for order in orders}
+    assert len(users) == test_user_count
+
+    user = (
+        session.query(User)
+        .filter(User.company == test_company, User.name == "user_3")
+        .joinedload("orders")
+        .first()
+    )
+    assert sorted(order.amount for order in user.orders) == list(
+        range(test_order_count)
+    )
+    assert all(order.user is user for order in user.orders)
+
+    orphan_company = f"test_{rand_str(10)}"
+    session.add(Order(user_id="not an object id", company=orphan_company, amount=1))
+    session.commit()
+    orphan = (
+        Session()
+        .query(Order)
+        .filter(Order.company == orphan_company)
+        .joinedload("user")
+        .first()
+    )
+    assert orphan.user is None
+    session.query(Order).filter(Order.company == orphan_company).delete()
+
+
+def test_lazy_relationship(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    order = session.query(Order).filter(Order.company == test_company).first()
+    assert count_queries(lambda: order.user) == 1
+    assert count_queries(lambda: order.user) == 0
+    assert order.user.company == test_company
+
+
+def test_relationship_loading_cost(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+
+    session = Session()
+    start = time.perf_counter()
+    orders = session.query(Order).filter(Order.company == test_company).limit(0).all()
+    for order in orders:
+        order.user
+    lazy_elapsed = time.perf_counter() - start
+
+    session = Session()
+    start = time.perf_counter()
+    orders = (
+        session.query(Order)
+        .filter(Order.company == test_company)
+        .selectinload("user")
+        .limit(0)
+        .all()
+    )
+    selectin_elapsed = time.perf_counter() - start
+
+    session = Session()
+    start = time.perf_counter()
+    orders = (
+        session.query(Order)
+        .filter(Order.company == test_company)
+        .joinedload("user")
+        .limit(0)
+        .all()
+    )
+    joined_elapsed = time.perf_counter() - start
+    print(
+        f"Per-row lookups: {lazy_elapsed:.4f}s, selectinload: {selectin_elapsed:.4f}s, "
+        + f"joinedload: {joined_elapsed:.4f}s"
+    )
+
+
+def test_clean_documents(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    session.query(Order).filter(Order.company == test_company).delete()
+    session.query(User).filter(User.company == test_company).delete()
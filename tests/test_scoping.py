@@ -0,0 +1,131 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, List, Optional, Text
+
+import pytest
+from pyassorted.datetime import aware_datetime_now
+from pyassorted.string import rand_str
+from pydantic import Field
+from pymongo import MongoClient
+
+from mongotic.exceptions import SessionScopeError
+from mongotic.model import MongoBaseModel
+from mongotic.orm import sessionmaker
+from mongotic.scoping import SCOPE_CONTEXT, scoped_session
+
+test_company = f"test_{rand_str(10)}"
+test_workers = 4
+test_count = 25
+
+
+class User(MongoBaseModel):
+    __databasename__ = "test"
+    __tablename__ = "user"
+
+    name: Text = Field(..., max_length=50)
+    email: Text = Field(...)
+    company: Optional[Text] = Field(None, max_length=50)
+    age: Optional[int] = Field(None, ge=0, le=200)
+    created_at: Optional[datetime] = Field(..., default_factory=aware_datetime_now)
+    updated_at: Optional[datetime] = Field(..., default_factory=aware_datetime_now)
+
+
+def test_thread_scoped_sessions(mongo_engine: "MongoClient"):
+    Session = scoped_session(sessionmaker(bind=mongo_engine))
+    removed: List[Any] = []
+    Session.on_remove(removed.append)
+
+    assert Session() is Session()
+    sessions = set()
+    barrier = threading.Barrier(test_workers)
+
+    def _work(worker: int) -> None:
+        barrier.wait()
+        session = Session()
+        sessions.add(id(session))
+        try:
+            for i in range(test_count):
+                Session.add(
+                    User(
+                        name=f"scoped_{worker}_{i}",
+                        email=f"scoped_{worker}_{i}@example.com",
+                        company=test_company,
+                        age=worker,
+                    )
+                )
+            assert len(session._add_instances) == test_count
+            Session.commit()
+        finally:
+            Session.remove()
+
+    with ThreadPoolExecutor(max_workers=test_workers) as executor:
+        list(executor.map(_work, range(test_workers)))
+
+    assert len(sessions) == test_workers
+    assert len(removed) == test_workers
+    assert (
+        Session.query(User).filter(User.company == test_company).limit(0).count()
+        == test_workers * test_count
+    )
+
+    session = Session()
+    user = session.query(User).filter(User.company == test_company).first()
+    Session.remove()
+    assert not Session.has()
+    assert user._session is None
+    assert Session() is not session
+    user.age = 10
+    Session.remove()
+
+
+def test_cross_scope_update(mongo_engine: "MongoClient"):
+    Session = scoped_session(sessionmaker(bind=mongo_engine))
+    user = Session.query(User).filter(User.company == test_company).first()
+    errors: List[BaseException] = []
+
+    def _update() -> None:
+        try:
+            user.age = 100
+        except SessionScopeError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=_update)
+    thread.start()
+    thread.join()
+    assert len(errors) == 1
+    assert user.age != 100
+    assert not Session()._update_instances
+
+    user.age = 100
+    assert len(Session()._update_instances) == 1
+    Session.remove()
+
+
+def test_context_scoped_sessions(mongo_engine: "MongoClient"):
+    Session = scoped_session(sessionmaker(bind=mongo_engine), scope=SCOPE_CONTEXT)
+
+    async def _task() -> int:
+        session = Session()
+        await asyncio.sleep(0)
+        assert Session() is session
+        return id(session)
+
+    async def _main() -> List[int]:
+        return await asyncio.gather(*(_task() for _ in range(test_workers)))
+
+    assert len(set(asyncio.run(_main()))) == test_workers
+    assert contextvars.copy_context().run(Session) is not Session()
+    Session.remove()
+
+    with pytest.raises(ValueError):
+        scoped_session(sessionmaker(bind=mongo_engine), scope="unknown")
+
+
+def test_clean_documents(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    session.query(User).filter(User.company == test_company).delete()
@@ -0,0 +1,162 @@
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Text
+
+import pytest
+from bson.objectid import ObjectId
+from pyassorted.datetime import aware_datetime_now
+from pyassorted.string import rand_str
+from pydantic import Field
+from pymongo import MongoClient
+from pymongo.errors import BulkWriteError
+
+from mongotic.model import MongoBaseModel
+from mongotic.orm import sessionmaker
+from mongotic.writer import WriteBehindWriter, WriterError
+
+test_company = f"test_{rand_str(10)}"
+test_count = 2500
+
+
+class User(MongoBaseModel):
+    __databasename__ = "test"
+    __tablename__ = "user"
+
+    name: Text = Field(..., max_length=50)
+    email: Text = Field(...)
+    company: Optional[Text] = Field(None, max_length=50)
+    age: Optional[int] = Field(None, ge=0, le=200)
+    created_at: Optional[datetime] = Field(..., default_factory=aware_datetime_now)
+    updated_at: Optional[datetime] = Field(..., default_factory=aware_datetime_now)
+
+
+class BlockingCollection(object):
+    def __init__(self, error: Optional[Exception] = None):
+        self.error = error
+        self.released = threading.Event()
+        self.docs: List[Dict[Text, Any]] = []
+
+    def insert_many(self, docs: List[Dict[Text, Any]], *args: Any, **kwargs: Any):
+        self.released.wait()
+        if self.error is not None:
+            raise self.error
+        for doc in docs:
+            doc.setdefault("_id", ObjectId())
+        self.docs.extend(docs)
+
+
+def build_users(count: int) -> List[User]:
+    return [
+        User(name=f"user_{i}", email=f"user_{i}@example.com", company=test_company)
+        for i in range(count)
+    ]
+
+
+def test_write_behind_batches(mongo_engine: "MongoClient"):
+    users = build_users(test_count)
+    start = time.perf_counter()
+    with WriteBehindWriter(mongo_engine, batch_size=1000, flush_interval=60) as writer:
+        writer.add_all(users)
+        enqueue_elapsed = time.perf_counter() - start
+    elapsed = time.perf_counter() - start
+    print(
+        f"Enqueued {test_count} users in {enqueue_elapsed:.4f}s, "
+        + f"written in {elapsed:.4f}s"
+    )
+
+    stats = writer.stats()
+    assert stats["enqueued"] == test_count
+    assert stats["written"] == test_count
+    assert stats["failed"] == 0
+    assert stats["batches"] == 3
+    assert stats["queue_depth"] == 0
+    assert 0 < stats["flush_p50"] <= stats["flush_p95"] <= stats["flush_max"]
+    assert all(user._id is not None for user in users)
+
+    session = sessionmaker(bind=mongo_engine)()
+    assert session.query(User).filter(User.company == test_company).count() == (
+        test_count
+    )
+    with pytest.raises(ValueError):
+        writer.add(users[0])
+
+
+def test_write_behind_flush_interval(mongo_engine: "MongoClient"):
+    with WriteBehindWriter(
+        mongo_engine, batch_size=1000, flush_interval=0.05
+    ) as writer:
+        users = build_users(5)
+        writer.add_all(users)
+        deadline = time.monotonic() + 5
+        while writer.stats()["written"] < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert writer.stats()["written"] == 5
+        assert writer.stats()["batches"] == 1
+
+        writer.add(build_users(1)[0])
+        assert writer.flush(timeout=5)
+        assert writer.stats()["written"] == 6
+
+
+def test_write_behind_backpressure():
+    collection = BlockingCollection()
+    engine = {"test": {"user": collection}}
+    writer = WriteBehindWriter(engine, batch_size=1, max_queue_size=2)  # type: ignore
+    try:
+        users = build_users(4)
+        writer.add(users[0])
+        deadline = time.monotonic() + 5
+        while writer.stats()["queue_depth"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        writer.add_all(users[1:3], block=False)
+        with pytest.raises(queue.Full):
+            writer.add(users[3], block=False)
+        assert writer.stats()["queue_depth"] == 2
+    finally:
+        collection.released.set()
+        writer.close()
+    assert len(collection.docs) == 3
+    assert writer.stats()["written"] == 3
+
+
+def test_write_behind_errors():
+    collection = BlockingCollection(error=RuntimeError("Insert failed"))
+    collection.released.set()
+    errors: List[WriterError] = []
+    engine = {"test": {"user": collection}}
+    with WriteBehindWriter(engine, on_error=errors.append) as writer:  # type: ignore
+        writer.add_all(build_users(3))
+    assert writer.stats()["failed"] == 3
+    assert len(errors) == 1
+    assert len(errors[0].failed) == 3
+    assert str(errors[0].error) == "Insert failed"
+
+    collection = BlockingCollection(
+        error=BulkWriteError(
+            {
+                "writeErrors": [],
+                "writeConcernErrors": [{"code": 64, "errmsg": "waiting timed out"}],
+                "nInserted": 3,
+            }
+        )
+    )
+    collection.released.set()
+    errors.clear()
+    engine = {"test": {"user": collection}}
+    with WriteBehindWriter(
+        engine, ordered=True, on_error=errors.append  # type: ignore
+    ) as writer:
+        writer.add_all(build_users(3))
+        assert writer.flush(timeout=5)
+    assert writer.stats()["written"] == 3
+    assert len(errors) == 1
+    assert errors[0].failed == []
+
+
+def test_clean_documents(mongo_engine: "MongoClient"):
+    Session = sessionmaker(bind=mongo_engine)
+    session = Session()
+
+    session.query(User).filter(User.company == test_company).delete()